@@ -14,9 +14,7 @@ from .agents.base import BaseAgent, AgentStatus, AgentState, ExecutionContext
 from .agents.loader import AgentLoader
 from .agents.decorators import agent, tool, hook, streaming
 
-# MCP integration
-from .mcp.server import MCPServer
-from .mcp.client import MCPClient
+# MCP integration (MCPServer and MCPClient are imported on first access)
 from .mcp.protocol import MCPMessage, MCPRequest, MCPResponse, ToolDefinition
 
 # SDK
@@ -26,6 +24,17 @@ from .sdk.types import AgentConfig, ToolConfig, MCPServerConfig
 # Streaming
 from .streaming.events import StreamEvent, EventType
 
+
+def __getattr__(name: str):
+    """Import the MCP server and client on first access."""
+    if name in ("MCPServer", "MCPClient"):
+        from . import mcp
+        value = getattr(mcp, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Core
     "BaseAgent",
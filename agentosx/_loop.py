@@ -0,0 +1,34 @@
+"""
+Event Loop Helpers.
+
+Opt-in switch to ``uvloop`` for applications built on agentOSX. The policy is
+process-wide, so it is only changed when the application asks for it.
+"""
+
+import asyncio
+import os
+
+# Values of AGENTOSX_NO_UVLOOP that keep the default asyncio event loop
+_TRUE_VALUES = ("1", "true", "yes")
+
+
+def install_fast_event_loop() -> bool:
+    """
+    Use uvloop for event loops created from now on, when it is installed.
+    
+    High fan-out work (registry lookups, bulk installs, agentOS event
+    streams) is dominated by task scheduling and socket polling, which
+    uvloop does much faster. Call it before ``asyncio.run``. Setting
+    ``AGENTOSX_NO_UVLOOP=1`` disables it.
+    
+    Returns:
+        True if uvloop's event loop policy was installed
+    """
+    if os.environ.get("AGENTOSX_NO_UVLOOP", "").lower() in _TRUE_VALUES:
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
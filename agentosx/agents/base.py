@@ -11,11 +11,14 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
 
-from ..mcp.server import MCPServer
 from ..mcp.protocol import MCPCapabilities
 
+if TYPE_CHECKING:
+    # Imported in to_mcp_server so agents that never serve MCP skip it
+    from ..mcp.server import MCPServer
+
 logger = logging.getLogger(__name__)
 
 
@@ -187,6 +190,8 @@ class BaseAgent(ABC):
         if self.mcp_server:
             return self.mcp_server
         
+        from ..mcp.server import MCPServer
+        
         self.mcp_server = MCPServer(
             name=self.name,
             version=self.version,
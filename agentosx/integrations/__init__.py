@@ -2,10 +2,16 @@
 AgentOSX Integrations Package
 
 Third-party platform integrations for agentOSX.
+
+The integrations are fully asyncio driven and benefit from ``uvloop``. Call
+``install_fast_event_loop()`` before ``asyncio.run`` to use it when it is
+installed; importing this package never changes the event loop policy.
 """
 
 from typing import TYPE_CHECKING
 
+from .._loop import install_fast_event_loop
+
 if TYPE_CHECKING:
     from .agentos.client import AgentOSClient
     from .agentos.sync import StateSynchronizer
@@ -17,4 +23,5 @@ __all__ = [
     "StateSynchronizer",
     "DeploymentManager",
     "EventSubscriber",
+    "install_fast_event_loop",
 ]
@@ -8,11 +8,12 @@ synchronization, and real-time event streaming.
 from .client import AgentOSClient
 from .sync import StateSynchronizer
 from .deployment import DeploymentManager
-from .events import EventSubscriber
+from .events import EventSubscriber, fast
 
 __all__ = [
     "AgentOSClient",
     "StateSynchronizer",
     "DeploymentManager",
     "EventSubscriber",
+    "fast",
 ]
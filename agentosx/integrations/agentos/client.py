@@ -14,6 +14,8 @@ from urllib.parse import urljoin
 import httpx
 import socketio
 
+from agentosx.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,7 @@ class AgentOSClient:
     
     Provides methods to interact with agentOS Flask backend, including:
     - Command execution via POST /command
+    - Structured RPC calls via POST /rpc/{method}
     - Status checking via GET /debug/status
     - WebSocket connections for real-time events
     - Authentication handling (JWT/OAuth)
@@ -181,6 +184,36 @@ class AgentOSClient:
         )
         return response.json()
     
+    async def rpc(
+        self,
+        method: str,
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Call a structured RPC method on agentOS.
+        
+        Sends the payload as a JSON body to POST /rpc/{method} so the server
+        can dispatch it directly, without tokenizing a command string.
+        
+        Args:
+            method: RPC method name (e.g., "sync_memory")
+            payload: JSON-serializable request payload
+            
+        Returns:
+            Response dict with keys: status, message, data
+            
+        Example:
+            ```python
+            result = await client.rpc("sync_metadata", {"agent_id": "bot", "metadata": {}})
+            ```
+        """
+        response = await self._request_with_retry(
+            "POST",
+            f"/rpc/{method}",
+            content=dumps(payload),
+        )
+        return response.json()
+    
     async def get_system_status(self) -> Dict[str, Any]:
         """
         Get system diagnostics and status.
@@ -362,13 +395,13 @@ class AgentOSClient:
         
         @self.sio.on("execution_log")
         async def _on_execution_log(data):
-            logger.debug(f"Execution log: {data}")
+            logger.debug("Execution log: %s", data)
             if on_execution_log:
                 await on_execution_log(data)
         
         @self.sio.on("message")
         async def _on_message(data):
-            logger.debug(f"Message: {data}")
+            logger.debug("Message: %s", data)
             if on_message:
                 await on_message(data)
         
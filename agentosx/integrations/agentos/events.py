@@ -7,12 +7,35 @@ user triggers, and system events.
 
 import asyncio
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from .client import AgentOSClient
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for running synchronous event handlers
+_SYNC_HANDLER_WORKERS = 4
+
+
+def fast(handler: Callable) -> Callable:
+    """
+    Mark a synchronous event handler as cheap enough to run inline.
+    
+    Synchronous handlers normally run in a thread pool so they cannot block
+    the event loop. Handlers marked with this decorator skip the thread hop.
+    
+    Example:
+        ```python
+        @subscriber.on("message")
+        @fast
+        def count(data):
+            counter["messages"] += 1
+        ```
+    """
+    handler._agentos_fast = True
+    return handler
+
 
 class EventSubscriber:
     """
@@ -44,6 +67,9 @@ class EventSubscriber:
         ```
     """
     
+    # Events delivered to subscribe_to_agent handlers
+    AGENT_EVENTS = ("execution_log", "message", "progress")
+    
     def __init__(
         self,
         client: AgentOSClient,
@@ -59,13 +85,20 @@ class EventSubscriber:
         # Event handlers
         self._handlers: Dict[str, List[Callable]] = {}
         
-        # Event filters
+        # Event filters, plus one pre-composed predicate per event
         self._filters: Dict[str, List[Callable]] = {}
+        self._compiled_filters: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+        
+        # Per-agent handler wrappers, keyed by (agent_id, handler)
+        self._agent_subscriptions: Dict[Tuple[str, Callable], Dict[str, Callable]] = {}
         
         # Running state
         self._running = False
         self._event_task: Optional[asyncio.Task] = None
         
+        # Thread pool for synchronous handlers (created on first use)
+        self._sync_executor: Optional[ThreadPoolExecutor] = None
+        
         logger.info("Initialized EventSubscriber")
     
     def on(self, event: str) -> Callable:
@@ -102,11 +135,8 @@ class EventSubscriber:
             event: Event name
             handler: Async callable to handle event (receives data dict)
         """
-        if event not in self._handlers:
-            self._handlers[event] = []
-        
-        self._handlers[event].append(handler)
-        logger.info(f"Added handler for event: {event}")
+        self._handlers.setdefault(event, []).append(handler)
+        logger.info("Added handler for event: %s", event)
     
     def remove_handler(
         self,
@@ -120,9 +150,10 @@ class EventSubscriber:
             event: Event name
             handler: Handler to remove
         """
-        if event in self._handlers:
-            self._handlers[event].remove(handler)
-            logger.info(f"Removed handler for event: {event}")
+        handlers = self._handlers.get(event)
+        if handlers is not None:
+            handlers.remove(handler)
+            logger.info("Removed handler for event: %s", event)
     
     def add_filter(
         self,
@@ -147,11 +178,34 @@ class EventSubscriber:
             )
             ```
         """
-        if event not in self._filters:
-            self._filters[event] = []
+        filters = self._filters.setdefault(event, [])
+        filters.append(filter_func)
+        self._compiled_filters[event] = self._compile_filters(tuple(filters))
+        logger.info("Added filter for event: %s", event)
+    
+    @staticmethod
+    def _compile_filters(
+        filters: Tuple[Callable[[Dict[str, Any]], bool], ...],
+    ) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Compose filters into a single short-circuiting predicate.
+        
+        Args:
+            filters: Filter functions for one event
+            
+        Returns:
+            Predicate that is True only if every filter accepts the event
+        """
+        if len(filters) == 1:
+            return filters[0]
+        
+        def compiled(data: Dict[str, Any]) -> bool:
+            for filter_func in filters:
+                if not filter_func(data):
+                    return False
+            return True
         
-        self._filters[event].append(filter_func)
-        logger.info(f"Added filter for event: {event}")
+        return compiled
     
     async def _dispatch_event(
         self,
@@ -166,21 +220,61 @@ class EventSubscriber:
             data: Event data
         """
         # Apply filters
-        if event in self._filters:
-            for filter_func in self._filters[event]:
-                if not filter_func(data):
-                    return  # Event filtered out
+        event_filter = self._compiled_filters.get(event)
+        if event_filter is not None and not event_filter(data):
+            return  # Event filtered out
         
         # Dispatch to handlers
-        if event in self._handlers:
-            for handler in self._handlers[event]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(data)
-                    else:
-                        handler(data)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event}: {e}")
+        handlers = self._handlers.get(event)
+        if not handlers:
+            return
+        
+        for handler in handlers:
+            try:
+                await self._call_handler(event, handler, data)
+            except Exception as e:
+                logger.error("Error in event handler for %s: %s", event, e)
+    
+    async def _call_handler(
+        self,
+        event: str,
+        handler: Callable,
+        data: Dict[str, Any],
+    ) -> None:
+        """
+        Invoke a single event handler.
+        
+        Async handlers are awaited. Synchronous handlers are submitted to a
+        thread pool without waiting, unless marked with ``@fast``.
+        
+        Args:
+            event: Event name (used for error logging)
+            handler: Event handler
+            data: Event data
+        """
+        if asyncio.iscoroutinefunction(handler):
+            await handler(data)
+        elif getattr(handler, "_agentos_fast", False):
+            handler(data)
+        else:
+            if self._sync_executor is None:
+                self._sync_executor = ThreadPoolExecutor(
+                    max_workers=_SYNC_HANDLER_WORKERS,
+                    thread_name_prefix="agentos-events",
+                )
+            future = self._sync_executor.submit(handler, data)
+            future.add_done_callback(
+                lambda f: self._log_handler_error(event, f)
+            )
+    
+    @staticmethod
+    def _log_handler_error(event: str, future: Future) -> None:
+        """Log an exception raised by a handler running in the thread pool."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Error in event handler for %s: %s", event, error, exc_info=error)
     
     async def start(self) -> None:
         """
@@ -229,6 +323,11 @@ class EventSubscriber:
         # Disconnect WebSocket
         await self.client.disconnect_websocket()
         
+        # Release handler threads
+        if self._sync_executor is not None:
+            self._sync_executor.shutdown(wait=False)
+            self._sync_executor = None
+        
         logger.info("Stopped event subscription")
     
     async def _on_connect(self) -> None:
@@ -258,7 +357,7 @@ class EventSubscriber:
                     await self._dispatch_event(event_type, message)
                 
             except Exception as e:
-                logger.error(f"Error in event loop: {e}")
+                logger.error("Error in event loop: %s", e)
             
             # Wait before next poll
             await asyncio.sleep(1)
@@ -279,15 +378,46 @@ class EventSubscriber:
             agent_id: Agent ID
             handler: Event handler
         """
-        def agent_filter(data: Dict[str, Any]) -> bool:
-            return data.get("agent") == agent_id or data.get("agent_id") == agent_id
+        key = (agent_id, handler)
+        if key in self._agent_subscriptions:
+            return
         
-        # Add filter for each event type
-        for event in ["execution_log", "message", "progress"]:
-            self.add_filter(event, agent_filter)
-            self.add_handler(event, handler)
+        # Filter per handler rather than per event, so subscriptions to
+        # different agents don't reject each other's events. One wrapper
+        # per event, so handler errors are logged under the event's name
+        def make_agent_handler(event: str) -> Callable:
+            async def agent_handler(data: Dict[str, Any]) -> None:
+                if data.get("agent") == agent_id or data.get("agent_id") == agent_id:
+                    await self._call_handler(event, handler, data)
+            return agent_handler
+        
+        agent_handlers = {event: make_agent_handler(event) for event in self.AGENT_EVENTS}
+        self._agent_subscriptions[key] = agent_handlers
+        for event, agent_handler in agent_handlers.items():
+            self.add_handler(event, agent_handler)
+        
+        logger.info("Subscribed to agent: %s", agent_id)
+    
+    async def unsubscribe_from_agent(
+        self,
+        agent_id: str,
+        handler: Callable,
+    ) -> None:
+        """
+        Remove a subscription made with subscribe_to_agent.
+        
+        Args:
+            agent_id: Agent ID
+            handler: Event handler passed to subscribe_to_agent
+        """
+        agent_handlers = self._agent_subscriptions.pop((agent_id, handler), None)
+        if agent_handlers is None:
+            return
+        
+        for event, agent_handler in agent_handlers.items():
+            self.remove_handler(event, agent_handler)
         
-        logger.info(f"Subscribed to agent: {agent_id}")
+        logger.info("Unsubscribed from agent: %s", agent_id)
     
     async def subscribe_to_user_triggers(
         self,
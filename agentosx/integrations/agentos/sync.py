@@ -10,16 +10,51 @@ Provides bidirectional synchronization between agentOSX and agentOS:
 
 import asyncio
 import hashlib
-import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
 
 from agentosx.agents.state import AgentState
+from agentosx.serialization import dumps
 from .client import AgentOSClient
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of bulk sync requests in flight at once
+_SYNC_CONCURRENCY = 4
+
+# Payloads above this size are hashed with BLAKE3's multithreaded mode
+_BLAKE3_THREADED_MIN_BYTES = 1 << 20
+
+
+def _timestamp_ns(value: Any) -> int:
+    """
+    Normalize a payload timestamp to integer nanoseconds since the epoch.
+    
+    Payloads carry ``time.time_ns()`` integers; ISO 8601 strings from older
+    peers (naive values are treated as UTC) are still accepted.
+    
+    Args:
+        value: Timestamp as int nanoseconds or ISO 8601 string
+        
+    Returns:
+        Nanoseconds since the epoch
+    """
+    if isinstance(value, str):
+        ts = datetime.fromisoformat(value)
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return int(ts.timestamp() * 1_000_000_000)
+    return int(value)
+
 
 class SyncConflictError(Exception):
     """Raised when a synchronization conflict cannot be resolved."""
@@ -32,6 +67,7 @@ class StateSynchronizer:
     
     Handles:
     - Memory synchronization (working memory + episodic memory)
+    - Delta sync of working memory (only changed keys between full snapshots)
     - Agent metadata updates (configuration, status)
     - Execution trace streaming
     - Conflict resolution (last-write-wins with versioning)
@@ -58,6 +94,7 @@ class StateSynchronizer:
         client: AgentOSClient,
         conflict_resolution: str = "last_write_wins",
         batch_size: int = 10,
+        full_sync_interval: int = 10,
     ):
         """
         Initialize state synchronizer.
@@ -67,16 +104,48 @@ class StateSynchronizer:
             conflict_resolution: Strategy for conflict resolution 
                                  ("last_write_wins", "manual", "merge")
             batch_size: Number of operations to batch together
+            full_sync_interval: Send a full memory snapshot every N pushes;
+                                pushes in between only send changed keys
         """
         self.client = client
         self.conflict_resolution = conflict_resolution
         self.batch_size = batch_size
+        self.full_sync_interval = full_sync_interval
         
         self._sync_task: Optional[asyncio.Task] = None
+        self._sync_workers: List[asyncio.Task] = []
         self._running = False
         self._agent_versions: Dict[str, int] = {}  # Track versions for conflict detection
         
-        logger.info(f"Initialized StateSynchronizer with {conflict_resolution} conflict resolution")
+        # Per-key memory hashes for delta sync
+        self._last_memory_hashes: Dict[str, Dict[str, str]] = {}
+        self._pending_memory_hashes: Dict[str, Dict[str, str]] = {}
+        self._pushes_since_full: Dict[str, int] = {}
+        
+        logger.info("Initialized StateSynchronizer with %s conflict resolution", conflict_resolution)
+    
+    def _hash_bytes(self, data: bytes) -> str:
+        """
+        Hash serialized data for change detection.
+        
+        Uses BLAKE3 (128-bit digest) when the optional ``blake3`` package is
+        installed, since only hash equality matters here, and falls back to
+        SHA256 otherwise.
+        
+        Args:
+            data: Serialized bytes
+            
+        Returns:
+            Hex digest of data
+        """
+        if BLAKE3_AVAILABLE:
+            max_threads = (
+                blake3.blake3.AUTO
+                if len(data) >= _BLAKE3_THREADED_MIN_BYTES
+                else 1
+            )
+            return blake3.blake3(data, max_threads=max_threads).hexdigest(16)
+        return hashlib.sha256(data).hexdigest()
     
     def _compute_state_hash(self, state: Dict[str, Any]) -> str:
         """
@@ -86,27 +155,66 @@ class StateSynchronizer:
             state: State dict
             
         Returns:
-            SHA256 hash of state
+            Hex digest of state
         """
-        state_json = json.dumps(state, sort_keys=True)
-        return hashlib.sha256(state_json.encode()).hexdigest()
+        return self._hash_bytes(dumps(state, sort_keys=True))
     
-    async def push_agent_state(
+    def _build_memory_payload(
+        self,
+        agent_id: str,
+        working_memory: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Build the working-memory section of a state payload.
+        
+        Sends only changed and removed keys when the last synced snapshot is
+        known, and a full snapshot on the first push, after a failed push, or
+        every ``full_sync_interval`` pushes so the remote copy self-heals.
+        
+        Args:
+            agent_id: ID of agent
+            working_memory: Working memory dict
+            
+        Returns:
+            Memory payload dict in "full" or "delta" mode
+        """
+        hashes = {
+            key: self._hash_bytes(dumps(value, sort_keys=True))
+            for key, value in working_memory.items()
+        }
+        self._pending_memory_hashes[agent_id] = hashes
+        
+        last = self._last_memory_hashes.get(agent_id)
+        pushes = self._pushes_since_full.get(agent_id, 0)
+        
+        if last is None or pushes >= self.full_sync_interval:
+            return {"mode": "full", "working": working_memory, "episodic": []}
+        
+        return {
+            "mode": "delta",
+            "set": {
+                key: working_memory[key]
+                for key, digest in hashes.items()
+                if last.get(key) != digest
+            },
+            "del": [key for key in last if key not in hashes],
+            "episodic": [],
+        }
+    
+    def _build_state_payload(
         self,
         agent_state: AgentState,
         force: bool = False,
     ) -> Dict[str, Any]:
         """
-        Push agent state to agentOS.
-        
-        Syncs agent memory, metadata, and execution history to agentOS platform.
+        Build the sync payload for an agent state.
         
         Args:
             agent_state: AgentState object to sync
-            force: Force push even if versions conflict
+            force: Skip the version conflict check
             
         Returns:
-            Sync response dict with status
+            State payload dict
             
         Raises:
             SyncConflictError: If version conflict detected and force=False
@@ -121,36 +229,127 @@ class StateSynchronizer:
                 f"local={agent_state.version}, remote={current_version}"
             )
         
-        # Prepare state payload
-        payload = {
+        return {
             "agent_id": agent_id,
             "version": agent_state.version + 1,  # Increment version
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "metadata": {
                 "name": agent_state.agent_id,
                 "config": agent_state.config,
                 "status": "active",
             },
-            "memory": {
-                "working": agent_state.working_memory,
-                "episodic": [],  # Episodic memory (if available)
-            },
+            "memory": self._build_memory_payload(agent_id, agent_state.working_memory),
             "execution_history": [],  # Recent executions
         }
+    
+    def _record_push_result(
+        self,
+        payload: Dict[str, Any],
+        response: Dict[str, Any],
+    ) -> None:
+        """
+        Update local version tracking from a push response.
         
-        # Push to agentOS via command
-        command = f"agentosx sync {json.dumps(payload)}"
-        response = await self.client.execute_command(command)
+        Args:
+            payload: State payload that was pushed
+            response: Server response for that payload
+        """
+        agent_id = payload["agent_id"]
+        hashes = self._pending_memory_hashes.pop(agent_id, None)
         
         if response.get("status") == "success":
             # Update local version
             self._agent_versions[agent_id] = payload["version"]
-            logger.info(f"Pushed state for agent {agent_id} (version {payload['version']})")
+            
+            # Remember what the remote now holds for the next delta
+            if hashes is not None:
+                self._last_memory_hashes[agent_id] = hashes
+                if payload["memory"]["mode"] == "full":
+                    self._pushes_since_full[agent_id] = 1
+                else:
+                    self._pushes_since_full[agent_id] = self._pushes_since_full.get(agent_id, 0) + 1
+            
+            logger.info("Pushed state for agent %s (version %s)", agent_id, payload["version"])
         else:
-            logger.error(f"Failed to push state for agent {agent_id}: {response}")
+            # Remote copy may have diverged; resend a full snapshot next time
+            self._last_memory_hashes.pop(agent_id, None)
+            logger.error("Failed to push state for agent %s: %s", agent_id, response)
+    
+    async def push_agent_state(
+        self,
+        agent_state: AgentState,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Push agent state to agentOS.
+        
+        Syncs agent memory, metadata, and execution history to agentOS platform.
+        
+        Args:
+            agent_state: AgentState object to sync
+            force: Force push even if versions conflict
+            
+        Returns:
+            Sync response dict with status
+            
+        Raises:
+            SyncConflictError: If version conflict detected and force=False
+        """
+        payload = self._build_state_payload(agent_state, force=force)
+        
+        # Push to agentOS via structured RPC
+        response = await self.client.rpc("sync", payload)
+        self._record_push_result(payload, response)
         
         return response
     
+    async def bulk_push(
+        self,
+        agent_states: Sequence[AgentState],
+        force: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Push several agent states in a single bulk RPC.
+        
+        States that fail the local conflict check are reported as errors
+        and left out of the request.
+        
+        Args:
+            agent_states: List of AgentState objects to sync
+            force: Force push even if versions conflict
+            
+        Returns:
+            List of sync response dicts, one per state and in the same order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(agent_states)
+        payloads: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        
+        for index, state in enumerate(agent_states):
+            try:
+                payloads.append(self._build_state_payload(state, force=force))
+                positions.append(index)
+            except SyncConflictError as e:
+                logger.error("Failed to sync agent %s: %s", state.agent_id, e)
+                results[index] = {"status": "error", "error": str(e)}
+        
+        if payloads:
+            response = await self.client.rpc("bulk_sync", {"batch": payloads})
+            server_results = response.get("results") or []
+            
+            for i, (index, payload) in enumerate(zip(positions, payloads)):
+                if i < len(server_results):
+                    result = server_results[i]
+                else:
+                    result = {
+                        "status": "error",
+                        "error": response.get("message", "Missing result in bulk response"),
+                    }
+                self._record_push_result(payload, result)
+                results[index] = result
+        
+        return results  # type: ignore[return-value]
+    
     async def pull_agent_state(
         self,
         agent_id: str,
@@ -177,10 +376,10 @@ class StateSynchronizer:
             if "version" in state:
                 self._agent_versions[agent_id] = state["version"]
             
-            logger.info(f"Pulled state for agent {agent_id}")
+            logger.info("Pulled state for agent %s", agent_id)
             return state
         else:
-            logger.warning(f"Failed to pull state for agent {agent_id}: {response}")
+            logger.warning("Failed to pull state for agent %s: %s", agent_id, response)
             return None
     
     async def sync_memory(
@@ -206,13 +405,12 @@ class StateSynchronizer:
             "agent_id": agent_id,
             "working_memory": working_memory,
             "episodic_memory": episodic_memory or [],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
         }
         
-        command = f"agentosx sync_memory {json.dumps(payload)}"
-        response = await self.client.execute_command(command)
+        response = await self.client.rpc("sync_memory", payload)
         
-        logger.info(f"Synced memory for agent {agent_id}")
+        logger.info("Synced memory for agent %s", agent_id)
         return response
     
     async def stream_execution_trace(
@@ -235,14 +433,14 @@ class StateSynchronizer:
         payload = {
             "agent_id": agent_id,
             "execution_id": execution.get("id"),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "trace": execution,
         }
         
-        command = f"agentosx stream_trace {json.dumps(payload)}"
-        response = await self.client.execute_command(command)
+        response = await self.client.rpc("stream_trace", payload)
         
-        logger.debug(f"Streamed execution trace for agent {agent_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Streamed execution trace for agent %s", agent_id)
         return response
     
     async def sync_agent_metadata(
@@ -265,13 +463,12 @@ class StateSynchronizer:
         payload = {
             "agent_id": agent_id,
             "metadata": metadata,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
         }
         
-        command = f"agentosx sync_metadata {json.dumps(payload)}"
-        response = await self.client.execute_command(command)
+        response = await self.client.rpc("sync_metadata", payload)
         
-        logger.info(f"Synced metadata for agent {agent_id}")
+        logger.info("Synced metadata for agent %s", agent_id)
         return response
     
     async def resolve_conflict(
@@ -298,20 +495,20 @@ class StateSynchronizer:
         """
         if self.conflict_resolution == "last_write_wins":
             # Compare timestamps
-            local_ts = datetime.fromisoformat(local_state.get("timestamp", "1970-01-01"))
-            remote_ts = datetime.fromisoformat(remote_state.get("timestamp", "1970-01-01"))
+            local_ts = _timestamp_ns(local_state.get("timestamp", 0))
+            remote_ts = _timestamp_ns(remote_state.get("timestamp", 0))
             
             if local_ts >= remote_ts:
-                logger.info(f"Conflict resolved (last_write_wins): using local state")
+                logger.info("Conflict resolved (last_write_wins): using local state")
                 return local_state
             else:
-                logger.info(f"Conflict resolved (last_write_wins): using remote state")
+                logger.info("Conflict resolved (last_write_wins): using remote state")
                 return remote_state
         
         elif self.conflict_resolution == "merge":
             # Merge states (simple field-level merge)
             merged = {**remote_state, **local_state}
-            logger.info(f"Conflict resolved (merge): merged states")
+            logger.info("Conflict resolved (merge): merged states")
             return merged
         
         else:  # manual
@@ -326,32 +523,44 @@ class StateSynchronizer:
         """
         Batch sync multiple agents.
         
-        Efficiently syncs multiple agents in a single operation.
+        Efficiently syncs multiple agents, sending each batch of
+        ``batch_size`` states as a single bulk RPC. Batches run concurrently
+        and each one is handled as soon as it completes, so failures are
+        logged without waiting for the slowest batch.
         
         Args:
             agent_states: List of AgentState objects
             
         Returns:
-            List of sync response dicts
+            List of sync response dicts, in the same order as agent_states
         """
-        results = []
+        batches = [
+            agent_states[i:i + self.batch_size]
+            for i in range(0, len(agent_states), self.batch_size)
+        ]
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in batches]
+        semaphore = asyncio.Semaphore(_SYNC_CONCURRENCY)
+        
+        async def _push_batch(index: int):
+            async with semaphore:
+                try:
+                    return index, await self.bulk_push(batches[index])
+                except Exception as e:
+                    return index, e
         
-        # Process in batches
-        for i in range(0, len(agent_states), self.batch_size):
-            batch = agent_states[i:i + self.batch_size]
-            
-            # Sync batch concurrently
-            tasks = [self.push_agent_state(state) for state in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for state, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Failed to sync agent {state.agent_id}: {result}")
-                    results.append({"status": "error", "error": str(result)})
-                else:
-                    results.append(result)
+        for future in asyncio.as_completed([_push_batch(i) for i in range(len(batches))]):
+            index, outcome = await future
+            if isinstance(outcome, Exception):
+                logger.error("Failed to sync batch of %s agents: %s", len(batches[index]), outcome)
+                outcome = [
+                    {"status": "error", "error": str(outcome), "agent_id": state.agent_id}
+                    for state in batches[index]
+                ]
+            batch_results[index] = outcome
         
-        logger.info(f"Batch synced {len(agent_states)} agents")
+        results = [result for batch in batch_results for result in batch]
+        
+        logger.info("Batch synced %s agents", len(agent_states))
         return results
     
     async def start_continuous_sync(
@@ -362,7 +571,9 @@ class StateSynchronizer:
         """
         Start continuous background synchronization.
         
-        Periodically syncs agent states to agentOS.
+        Periodically syncs agent states to agentOS. The set of agents is
+        split into batches once, up front; each cycle feeds those batches to
+        a fixed pool of long-lived workers.
         
         Args:
             agent_states: List of AgentState objects to sync
@@ -374,17 +585,42 @@ class StateSynchronizer:
         
         self._running = True
         
+        batches = [
+            tuple(agent_states[i:i + self.batch_size])
+            for i in range(0, len(agent_states), self.batch_size)
+        ]
+        queue: asyncio.Queue = asyncio.Queue()
+        self._sync_workers = [
+            asyncio.create_task(self._sync_worker(queue))
+            for _ in range(min(_SYNC_CONCURRENCY, len(batches)))
+        ]
+        
         async def _sync_loop():
             while self._running:
-                try:
-                    await self.batch_sync_agents(agent_states)
-                except Exception as e:
-                    logger.error(f"Error in continuous sync: {e}")
+                for batch in batches:
+                    queue.put_nowait(batch)
+                await queue.join()
                 
                 await asyncio.sleep(interval)
         
         self._sync_task = asyncio.create_task(_sync_loop())
-        logger.info(f"Started continuous sync (interval={interval}s)")
+        logger.info("Started continuous sync (interval=%ss)", interval)
+    
+    async def _sync_worker(self, queue: asyncio.Queue) -> None:
+        """
+        Push batches from the continuous sync queue until cancelled.
+        
+        Args:
+            queue: Queue of agent state batches
+        """
+        while True:
+            batch = await queue.get()
+            try:
+                await self.bulk_push(batch)
+            except Exception as e:
+                logger.error("Error in continuous sync: %s", e)
+            finally:
+                queue.task_done()
     
     async def stop_continuous_sync(self) -> None:
         """Stop continuous synchronization."""
@@ -393,11 +629,13 @@ class StateSynchronizer:
         
         self._running = False
         
-        if self._sync_task:
-            self._sync_task.cancel()
-            try:
-                await self._sync_task
-            except asyncio.CancelledError:
-                pass
+        for task in [self._sync_task, *self._sync_workers]:
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sync_workers = []
         
         logger.info("Stopped continuous sync")
@@ -5,14 +5,18 @@ Provides infrastructure for publishing, discovering, and installing agents
 from the agentOS marketplace.
 """
 
-from .registry import RegistryClient
+from .registry import RegistryClient, get_default_registry, install_fast_event_loop
 from .publisher import AgentPublisher
 from .installer import AgentInstaller
 from .versioning import VersionManager
+from .http import close_shared_clients
 
 __all__ = [
     "RegistryClient",
+    "get_default_registry",
+    "install_fast_event_loop",
     "AgentPublisher",
     "AgentInstaller",
     "VersionManager",
+    "close_shared_clients",
 ]
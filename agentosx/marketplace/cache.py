@@ -0,0 +1,226 @@
+"""
+Registry Disk Cache
+
+Persists registry responses in a small SQLite database so that separate
+processes (e.g. one-shot CLI commands) can reuse them, and revalidate stale
+entries with ``If-None-Match``/``If-Modified-Since`` instead of refetching.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from ..serialization import dumps_str
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persistent registry cache
+DEFAULT_CACHE_DIR = Path.home() / ".agentosx" / "cache"
+
+# Seconds to wait for another process holding the database lock
+DB_TIMEOUT = 5.0
+
+
+@dataclass
+class CacheEntry:
+    """A persisted registry response."""
+    
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be used without revalidation."""
+        return self.expires_at > time.time()
+    
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class RegistryDiskCache:
+    """
+    SQLite store for registry responses, shared between processes.
+    
+    Entries hold the raw response body plus its validators; expiry uses wall
+    clock time so it survives restarts. Cache errors are logged and treated
+    as misses, never raised; if the database cannot be opened at all (e.g.
+    an unwritable cache directory), the cache disables itself.
+    
+    Calls block on disk I/O and on other processes' locks (up to
+    ``DB_TIMEOUT``), so async callers should run them in a thread pool; the
+    connection may be used from any thread.
+    
+    Example:
+        ```python
+        cache = RegistryDiskCache(Path("~/.agentosx/cache").expanduser())
+        entry = cache.get("https://marketplace.agentos.dev", ("agent", "twitter_bot"))
+        ```
+    """
+    
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize disk cache.
+        
+        Args:
+            cache_dir: Directory for the cache database
+        """
+        self.path = Path(cache_dir) / "registry.sqlite3"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        # Serializes use of the connection across thread pool workers
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use (None if the cache is disabled)."""
+        if self._conn is None and not self._disabled:
+            conn = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self.path,
+                    timeout=DB_TIMEOUT,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        registry TEXT NOT NULL,
+                        agent_id TEXT,
+                        etag TEXT,
+                        last_modified TEXT,
+                        expires_at REAL NOT NULL,
+                        body BLOB NOT NULL
+                    )
+                    """
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Registry disk cache disabled ({self.path}): {e}")
+                self._disabled = True
+                if conn is not None:
+                    conn.close()
+                return None
+            self._conn = conn
+        return self._conn
+    
+    def _execute(self, sql: str, params: Tuple[Any, ...], fetch: bool = False) -> Optional[tuple]:
+        """
+        Run a statement, logging failures instead of raising.
+        
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+            fetch: Return the first result row
+            
+        Returns:
+            First row if fetch is set, otherwise None (also None if the
+            statement failed or the cache is disabled)
+        """
+        with self._lock:
+            try:
+                conn = self._connect()
+                if conn is None:
+                    return None
+                cursor = conn.execute(sql, params)
+                return cursor.fetchone() if fetch else None
+            except (sqlite3.Error, OSError) as e:
+                action = "read" if fetch else "write"
+                logger.warning(f"Registry disk cache {action} failed: {e}")
+                return None
+    
+    @staticmethod
+    def _key(registry: str, key: Tuple[Any, ...]) -> str:
+        """Serialize a registry cache key."""
+        return dumps_str([registry, *key])
+    
+    def get(self, registry: str, key: Tuple[Any, ...]) -> Optional[CacheEntry]:
+        """
+        Look up a persisted response.
+        
+        Args:
+            registry: Registry URL
+            key: Registry cache key
+            
+        Returns:
+            Cache entry (possibly stale) or None
+        """
+        row = self._execute(
+            "SELECT body, expires_at, etag, last_modified FROM responses WHERE key = ?",
+            (self._key(registry, key),),
+            fetch=True,
+        )
+        return CacheEntry(*row) if row else None
+    
+    def set(self, registry: str, key: Tuple[Any, ...], entry: CacheEntry) -> None:
+        """
+        Persist a response.
+        
+        Args:
+            registry: Registry URL
+            key: Registry cache key; key[1] is the agent ID (or None)
+            entry: Response to store
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._key(registry, key),
+                registry,
+                key[1] if len(key) > 1 else None,
+                entry.etag,
+                entry.last_modified,
+                entry.expires_at,
+                entry.body,
+            ),
+        )
+    
+    def touch(self, registry: str, key: Tuple[Any, ...], expires_at: float) -> None:
+        """
+        Extend a revalidated entry's expiry.
+        
+        Args:
+            registry: Registry URL
+            key: Registry cache key
+            expires_at: New expiry (epoch seconds)
+        """
+        self._execute(
+            "UPDATE responses SET expires_at = ? WHERE key = ?",
+            (expires_at, self._key(registry, key)),
+        )
+    
+    def delete(self, registry: str, agent_id: Optional[str] = None) -> None:
+        """
+        Drop persisted responses.
+        
+        Args:
+            registry: Registry URL
+            agent_id: Only drop entries for this agent (default: drop all)
+        """
+        if agent_id is None:
+            self._execute("DELETE FROM responses WHERE registry = ?", (registry,))
+        else:
+            self._execute(
+                "DELETE FROM responses WHERE registry = ? AND agent_id = ?",
+                (registry, agent_id),
+            )
+    
+    def close(self) -> None:
+        """Close the database (it is reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,233 @@
+"""
+Package Checksums
+
+Streaming file hashing shared by the installer and publisher, and the
+checksum formats published by the registry (SHA256, optionally BLAKE3).
+"""
+
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Read size for streaming hashes
+CHUNK_SIZE = 1 << 20
+
+
+def _open_sequential(path: Union[str, Path]) -> BinaryIO:
+    """
+    Open a file for a single sequential read.
+
+    On Linux the kernel is told to read ahead aggressively.
+
+    Args:
+        path: File path
+
+    Returns:
+        Binary file object
+    """
+    f = open(path, "rb")
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def hash_file(
+    path: Union[str, Path],
+    *algorithms: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict[str, str]:
+    """
+    Compute one or more digests of a file in a single streaming pass.
+
+    Args:
+        path: File path
+        *algorithms: hashlib algorithm names (default: sha256)
+        chunk_size: Read size in bytes
+
+    Returns:
+        Dict mapping algorithm name to hex digest
+    """
+    hashers = {name: hashlib.new(name) for name in algorithms or ("sha256",)}
+
+    with _open_sequential(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
+class HashingWriter(io.RawIOBase):
+    """
+    Write-through file wrapper that hashes bytes as they are written.
+
+    Lets a producer (e.g. ``tarfile`` in stream mode) compute checksums of
+    its output without reading the file back.
+
+    Example:
+        ```python
+        with open(path, "wb") as f:
+            writer = HashingWriter(f, "sha256", "md5")
+            with tarfile.open(fileobj=writer, mode="w|gz") as tar:
+                tar.add(src)
+        checksums = writer.hexdigests()
+        ```
+    """
+
+    def __init__(self, raw: BinaryIO, *algorithms: str):
+        """
+        Initialize writer.
+
+        Args:
+            raw: Underlying binary file (not closed by this wrapper)
+            *algorithms: Hash algorithm names (default: sha256)
+        """
+        super().__init__()
+        self._raw = raw
+        self._hashers = {name: new_hasher(name) for name in algorithms or ("sha256",)}
+
+    def writable(self) -> bool:
+        """Writer is writable."""
+        return True
+
+    def write(self, b) -> int:
+        """
+        Hash and write bytes.
+
+        Args:
+            b: Bytes-like object
+
+        Returns:
+            Number of bytes written
+        """
+        for hasher in self._hashers.values():
+            hasher.update(b)
+        self._raw.write(b)
+        return len(b)
+
+    def hexdigests(self) -> Dict[str, str]:
+        """
+        Get digests of everything written so far.
+
+        Returns:
+            Dict mapping algorithm name to hex digest
+        """
+        return {name: hasher.hexdigest() for name, hasher in self._hashers.items()}
+
+
+def sha256_file(
+    path: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+) -> str:
+    """
+    Compute the SHA256 digest of a file without loading it into memory.
+
+    On Python 3.11+ this uses hashlib.file_digest, which runs the read loop
+    inside hashlib with OpenSSL's EVP SHA256 (SHA-NI accelerated on x86 with
+    OpenSSL 1.1.1+). Older Pythons fall back to the chunked loop.
+
+    Args:
+        path: File path
+        chunk_size: Read size in bytes (fallback path only)
+
+    Returns:
+        Hex digest
+    """
+    if hasattr(hashlib, "file_digest"):
+        with _open_sequential(path) as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    return hash_file(path, "sha256", chunk_size=chunk_size)["sha256"]
+
+
+def parse_checksum(checksum: Any) -> Optional[Tuple[str, str]]:
+    """
+    Normalize a checksum published by the registry.
+
+    A plain string is a SHA256 hex digest; a dict names its algorithm, e.g.
+    ``{"algo": "blake3", "hex": "..."}``.
+
+    Args:
+        checksum: Checksum string or dict (or None)
+
+    Returns:
+        (algorithm, hex digest) tuple, or None if no checksum was given
+
+    Raises:
+        ValueError: If the checksum is malformed
+    """
+    if not checksum:
+        return None
+    if isinstance(checksum, str):
+        return "sha256", checksum.lower()
+    if isinstance(checksum, dict) and checksum.get("hex"):
+        return checksum.get("algo", "sha256").lower(), checksum["hex"].lower()
+    raise ValueError(f"Invalid checksum: {checksum!r}")
+
+
+def new_hasher(algorithm: str) -> Any:
+    """
+    Create an incremental hasher.
+
+    BLAKE3 hashers use all cores for large updates.
+
+    Args:
+        algorithm: "blake3" or a hashlib algorithm name
+
+    Returns:
+        Hasher with ``update`` and ``hexdigest`` methods
+
+    Raises:
+        ValueError: If the algorithm is unknown or blake3 is not installed
+    """
+    if algorithm == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise ValueError(
+                "blake3 checksums require the blake3 package "
+                "(pip install agentosx[speedups])"
+            )
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new(algorithm)
+
+
+def file_checksum(path: Union[str, Path], algorithm: str = "sha256") -> str:
+    """
+    Compute a file digest with the given algorithm.
+
+    BLAKE3 memory-maps the file (blake3 0.3.1+) and hashes it on all cores.
+
+    Args:
+        path: File path
+        algorithm: "blake3" or a hashlib algorithm name
+
+    Returns:
+        Hex digest
+
+    Raises:
+        ValueError: If the algorithm is unknown or blake3 is not installed
+    """
+    if algorithm == "sha256":
+        return sha256_file(path)
+
+    hasher = new_hasher(algorithm)
+    if hasattr(hasher, "update_mmap"):
+        hasher.update_mmap(path)
+        return hasher.hexdigest()
+
+    with _open_sequential(path) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -0,0 +1,123 @@
+"""
+Marketplace HTTP Client
+
+Builds the connection-pooled ``httpx.AsyncClient`` used to talk to the
+marketplace registry, and a process-wide shared instance of it so the
+registry client, installer and publisher reuse one pool (and one set of
+TLS sessions) per registry.
+"""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Connection pool limits shared by marketplace clients. With HTTP/2 each
+# connection multiplexes many requests, so these mostly matter for HTTP/1.1
+POOL_LIMITS = httpx.Limits(
+    max_connections=128,
+    max_keepalive_connections=64,
+    keepalive_expiry=30.0,
+)
+
+# Seconds allowed to establish a connection (separate from the read timeout)
+CONNECT_TIMEOUT = 5.0
+
+# Only advertise encodings httpx can decode here
+ACCEPT_ENCODING = "gzip, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+# Retries for failed connection attempts (requests themselves are not replayed)
+CONNECT_RETRIES = 3
+
+# (registry_url, timeout) -> (event loop the client was created on, client)
+_shared_clients: Dict[
+    Tuple[str, float], Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]
+] = {}
+
+
+def create_client(timeout: float = 60.0) -> httpx.AsyncClient:
+    """
+    Create an HTTP client tuned for marketplace traffic.
+
+    HTTP/2 is enabled when the ``h2`` package is installed
+    (``pip install httpx[http2]``, a core dependency), so concurrent metadata
+    and download requests can share a few multiplexed connections. Brotli
+    responses are requested when the ``brotli`` package is installed.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        Async HTTP client
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=POOL_LIMITS,
+        retries=CONNECT_RETRIES,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Get the running event loop, or None outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_client(registry_url: str, timeout: float = 60.0) -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client for a registry.
+
+    Clients are not closed by the objects that use them; call
+    ``close_shared_clients`` on shutdown. A new client is created if the
+    previous one was closed or belongs to a different event loop, since
+    pooled connections cannot move between loops.
+
+    Args:
+        registry_url: Marketplace registry URL
+        timeout: Request timeout in seconds
+
+    Returns:
+        Shared async HTTP client
+    """
+    key = (registry_url.rstrip("/"), timeout)
+    loop = _running_loop()
+
+    entry = _shared_clients.get(key)
+    if entry is not None:
+        client_loop, client = entry
+        if not client.is_closed and (client_loop is None or client_loop is loop):
+            if client_loop is None and loop is not None:
+                _shared_clients[key] = (loop, client)
+            return client
+
+    client = create_client(timeout)
+    _shared_clients[key] = (loop, client)
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the shared HTTP clients owned by the running event loop."""
+    loop = _running_loop()
+    for key, (client_loop, client) in list(_shared_clients.items()):
+        if client_loop is None or client_loop is loop:
+            del _shared_clients[key]
+            await client.aclose()
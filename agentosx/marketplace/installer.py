@@ -4,21 +4,37 @@ Agent Installer
 Downloads and installs agents from the marketplace.
 """
 
-import hashlib
-import json
+import asyncio
 import logging
+import os
 import shutil
+import sys
 import tarfile
 import tempfile
+import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import httpx
 
+from ..serialization import dumps, loads
+from .checksums import file_checksum, new_hasher, parse_checksum
+from .fileops import move_tree, run_blocking
+from .http import get_shared_client
 from .registry import RegistryClient
+from .streams import STREAM_CHUNK_SIZE, ChunkPipe
 
 logger = logging.getLogger(__name__)
 
+# Largest single file accepted from a package
+MAX_MEMBER_SIZE = 500 * 1024 * 1024
+
+# Copy buffer used when extracting package members
+EXTRACT_BUFFER_SIZE = 64 * 1024
+
+# tarfile's "data" extraction filter (Python 3.12+ and security backports)
+DATA_FILTER = getattr(tarfile, "data_filter", None)
+
 
 class InstallError(Exception):
     """Raised when installation fails."""
@@ -51,6 +67,9 @@ class AgentInstaller:
             "autoblog",
             install_dependencies=True,
         )
+        
+        # Install several agents (and their agent dependencies) concurrently
+        results = await installer.install_many(["autoblog", "twitter_bot"])
         ```
     """
     
@@ -59,6 +78,7 @@ class AgentInstaller:
         agents_dir: Path,
         registry_url: str = "https://marketplace.agentos.dev",
         timeout: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize agent installer.
@@ -67,15 +87,18 @@ class AgentInstaller:
             agents_dir: Directory to install agents to
             registry_url: Marketplace registry URL
             timeout: Download timeout in seconds
+            client: HTTP client to use (defaults to the shared client for
+                    this registry; never closed by close())
         """
         self.agents_dir = Path(agents_dir)
         self.agents_dir.mkdir(parents=True, exist_ok=True)
         
-        self.registry = RegistryClient(registry_url, timeout)
-        self.http_client = httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        self.http_client = client or get_shared_client(registry_url, timeout)
+        self.registry = RegistryClient(registry_url, timeout, client=self.http_client)
         
         # Track installed agents
         self._installed = self._load_installed_agents()
+        self._dirty = False
         
         logger.info(f"Initialized AgentInstaller (agents_dir={agents_dir})")
     
@@ -88,27 +111,35 @@ class AgentInstaller:
         await self.close()
     
     async def close(self):
-        """Close connections."""
+        """Release registry resources (the shared HTTP client stays open)."""
         await self.registry.close()
-        await self.http_client.aclose()
     
     def _load_installed_agents(self) -> Dict[str, Dict[str, Any]]:
         """Load installed agents registry."""
         registry_file = self.agents_dir / ".installed.json"
         if registry_file.exists():
             try:
-                with open(registry_file, "r") as f:
-                    return json.load(f)
+                return loads(registry_file.read_bytes())
             except Exception as e:
                 logger.error(f"Failed to load installed agents registry: {e}")
         return {}
     
     def _save_installed_agents(self) -> None:
-        """Save installed agents registry."""
+        """
+        Save installed agents registry if it has changed.
+        
+        The file is replaced atomically, so a crash mid-write never leaves a
+        truncated registry behind.
+        """
+        if not self._dirty:
+            return
+        
         registry_file = self.agents_dir / ".installed.json"
+        tmp_file = registry_file.with_suffix(".json.tmp")
         try:
-            with open(registry_file, "w") as f:
-                json.dump(self._installed, f, indent=2)
+            tmp_file.write_bytes(dumps(self._installed, indent=True))
+            os.replace(tmp_file, registry_file)
+            self._dirty = False
         except Exception as e:
             logger.error(f"Failed to save installed agents registry: {e}")
     
@@ -116,6 +147,7 @@ class AgentInstaller:
         self,
         agent_id: str,
         version: Optional[str] = None,
+        download_url: Optional[str] = None,
     ) -> Path:
         """
         Download agent package from registry.
@@ -123,6 +155,7 @@ class AgentInstaller:
         Args:
             agent_id: Agent ID
             version: Specific version (optional, defaults to latest)
+            download_url: Already-resolved package URL (skips the registry lookup)
             
         Returns:
             Path to downloaded package
@@ -131,56 +164,87 @@ class AgentInstaller:
             InstallError: If download fails
         """
         # Get download URL
-        download_url = await self.registry.get_download_url(agent_id, version)
+        if not download_url:
+            download_url = await self.registry.get_download_url(agent_id, version)
         if not download_url:
             raise InstallError(f"Failed to get download URL for {agent_id}")
         
         # Download package
         logger.info(f"Downloading {agent_id} from {download_url}")
         
+        package_path = None
         try:
-            response = await self.http_client.get(download_url)
-            response.raise_for_status()
-            
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(
-                mode="wb", delete=False, suffix=".tar.gz"
-            ) as f:
-                f.write(response.content)
-                package_path = Path(f.name)
+            async with self.http_client.stream("GET", download_url) as response:
+                response.raise_for_status()
+                
+                # Stream to a temp file, pre-sized when the length is known
+                with tempfile.NamedTemporaryFile(
+                    mode="wb", delete=False, suffix=".tar.gz"
+                ) as f:
+                    package_path = Path(f.name)
+                    self._preallocate(f, response.headers.get("Content-Length"))
+                    async for chunk in response.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+                    # Drop any preallocated tail (e.g. a compressed Content-Length)
+                    f.truncate()
             
             logger.info(f"Downloaded {agent_id} to {package_path}")
             return package_path
         
         except Exception as e:
+            if package_path is not None:
+                package_path.unlink()
             raise InstallError(f"Failed to download {agent_id}: {e}")
     
+    @staticmethod
+    def _preallocate(f, content_length: Optional[str]) -> None:
+        """Reserve disk space for a download so it is laid out contiguously."""
+        if not content_length or not hasattr(os, "posix_fallocate"):
+            return
+        try:
+            os.posix_fallocate(f.fileno(), 0, int(content_length))
+        except (OSError, ValueError):
+            pass
+    
     async def verify_package(
         self,
         package_path: Path,
-        expected_checksum: Optional[str] = None,
+        expected_checksum: Optional[Union[str, Dict[str, str]]] = None,
     ) -> bool:
         """
         Verify package integrity with checksums.
         
         Args:
             package_path: Path to package file
-            expected_checksum: Expected SHA256 checksum (optional)
+            expected_checksum: Expected checksum (optional): a SHA256 hex
+                               digest, or a dict like
+                               ``{"algo": "blake3", "hex": "..."}``
             
         Returns:
             True if package is valid
+            
+        Raises:
+            InstallError: If the checksum is malformed or its algorithm is
+                          unavailable
         """
-        if not expected_checksum:
+        try:
+            checksum = parse_checksum(expected_checksum)
+        except ValueError as e:
+            raise InstallError(str(e))
+        
+        if not checksum:
             logger.warning("No checksum provided, skipping verification")
             return True
         
-        # Compute SHA256 checksum
-        with open(package_path, "rb") as f:
-            sha256_hash = hashlib.sha256(f.read()).hexdigest()
+        algorithm, expected = checksum
+        try:
+            actual = await run_blocking(file_checksum, package_path, algorithm)
+        except ValueError as e:
+            raise InstallError(str(e))
         
-        if sha256_hash != expected_checksum:
+        if actual != expected:
             logger.error(
-                f"Checksum mismatch: expected {expected_checksum}, got {sha256_hash}"
+                f"Checksum mismatch ({algorithm}): expected {expected}, got {actual}"
             )
             return False
         
@@ -205,20 +269,209 @@ class AgentInstaller:
         extract_dir = Path(extract_dir)
         extract_dir.mkdir(parents=True, exist_ok=True)
         
-        # Extract tar.gz
+        # Extract tar.gz off the event loop
+        await run_blocking(self._extract_file, package_path, extract_dir)
+        
+        agent_dir = self._locate_agent_dir(extract_dir)
+        logger.info(f"Extracted package to {agent_dir}")
+        return agent_dir
+    
+    async def download_and_extract(
+        self,
+        agent_id: str,
+        version: Optional[str],
+        extract_dir: Path,
+        expected_checksum: Optional[Union[str, Dict[str, str]]] = None,
+        download_url: Optional[str] = None,
+    ) -> Path:
+        """
+        Download, verify and extract an agent package in one streaming pass.
+        
+        Response chunks are hashed on the event loop and piped to a worker
+        thread that extracts them with ``tarfile`` in stream mode, so the
+        package is never written to disk as an archive and download, hashing
+        and extraction overlap. The checksum is checked once the stream ends;
+        on mismatch the caller must discard ``extract_dir``.
+        
+        Args:
+            agent_id: Agent ID
+            version: Specific version (optional, defaults to latest)
+            extract_dir: Directory to extract to
+            expected_checksum: Expected checksum (optional), in any form
+                               accepted by ``verify_package``
+            download_url: Already-resolved package URL (skips the registry lookup)
+            
+        Returns:
+            Path to extracted agent directory
+            
+        Raises:
+            InstallError: If download, extraction or verification fails
+        """
+        if not download_url:
+            download_url = await self.registry.get_download_url(agent_id, version)
+        if not download_url:
+            raise InstallError(f"Failed to get download URL for {agent_id}")
+        
+        try:
+            checksum = parse_checksum(expected_checksum)
+            hasher = new_hasher(checksum[0] if checksum else "sha256")
+        except ValueError as e:
+            raise InstallError(str(e))
+        
+        extract_dir = Path(extract_dir)
+        extract_dir.mkdir(parents=True, exist_ok=True)
+        
+        logger.info(f"Downloading {agent_id} from {download_url}")
+        
+        pipe = ChunkPipe()
+        loop = asyncio.get_running_loop()
+        extraction = loop.run_in_executor(None, self._extract_stream, pipe, extract_dir)
+        
+        try:
+            async with self.http_client.stream("GET", download_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    await pipe.put(chunk)
+            
+            await pipe.finish()
+            await extraction
+        
+        except Exception as e:
+            # Stop the extractor and report its error if it failed first
+            await pipe.finish(e)
+            error = e
+            try:
+                await extraction
+            except Exception as extract_error:
+                if isinstance(e, BrokenPipeError):
+                    error = extract_error
+            raise InstallError(f"Failed to download and extract {agent_id}: {error}")
+        
+        except BaseException:
+            # Cancelled: release the extractor thread before propagating
+            pipe.abort(InstallError(f"Download of {agent_id} was cancelled"))
+            try:
+                await extraction
+            except Exception:
+                pass
+            raise
+        
+        if not checksum:
+            logger.warning("No checksum provided, skipping verification")
+        elif hasher.hexdigest() != checksum[1]:
+            logger.error(
+                f"Checksum mismatch ({checksum[0]}): expected {checksum[1]}, "
+                f"got {hasher.hexdigest()}"
+            )
+            raise InstallError("Package verification failed")
+        else:
+            logger.info("Package checksum verified")
+        
+        agent_dir = self._locate_agent_dir(extract_dir)
+        logger.info(f"Extracted package to {agent_dir}")
+        return agent_dir
+    
+    def _extract_file(self, package_path: Path, extract_dir: Path) -> None:
+        """Extract a package archive from disk (runs in a worker thread)."""
         with tarfile.open(package_path, "r:gz") as tar:
-            tar.extractall(extract_dir)
+            self._extract_archive(tar, extract_dir)
+    
+    def _extract_stream(
+        self,
+        pipe: ChunkPipe,
+        extract_dir: Path,
+    ) -> None:
+        """
+        Extract a streamed tar.gz package (runs in a worker thread).
         
+        After the archive ends, the rest of the stream (gzip trailer, record
+        padding) is read and discarded, so the producer can hand every byte
+        through the pipe and its checksum covers the whole body.
+        
+        Args:
+            pipe: Pipe delivering the package bytes
+            extract_dir: Directory to extract to
+        """
+        try:
+            with tarfile.open(fileobj=pipe, mode="r|gz") as tar:
+                self._extract_archive(tar, extract_dir)
+            while pipe.read(EXTRACT_BUFFER_SIZE):
+                pass
+        finally:
+            pipe.close()
+    
+    def _extract_archive(
+        self,
+        tar: tarfile.TarFile,
+        extract_dir: Path,
+    ) -> None:
+        """
+        Extract all members of an open archive.
+        
+        Members are written one at a time through a fixed-size copy buffer,
+        so memory use stays bounded regardless of member size. Regular files
+        and directories are extracted; other member types are skipped.
+        
+        Each member is checked before any of its bytes are written: with
+        tarfile's ``data`` filter where available (Python 3.12+ and security
+        backports), and always with a lexical path check. Links are never
+        extracted, so paths do not need to be resolved on disk.
+        
+        Args:
+            tar: Open tar archive (random access or stream mode)
+            extract_dir: Directory to extract to
+            
+        Raises:
+            InstallError: If a member escapes extract_dir, is rejected by the
+                          data filter, or is too large
+        """
+        root = os.path.realpath(extract_dir)
+        
+        for member in tar:
+            if DATA_FILTER is not None:
+                try:
+                    DATA_FILTER(member, root)
+                except tarfile.TarError as e:
+                    raise InstallError(f"Unsafe member in package: {member.name}: {e}")
+            
+            target_path = os.path.normpath(os.path.join(root, member.name))
+            if target_path != root and not target_path.startswith(root + os.sep):
+                raise InstallError(f"Unsafe path in package: {member.name}")
+            target = Path(target_path)
+            
+            if member.isdir():
+                target.mkdir(parents=True, exist_ok=True)
+            elif member.isfile():
+                if member.size > MAX_MEMBER_SIZE:
+                    raise InstallError(
+                        f"Package member too large: {member.name} ({member.size} bytes)"
+                    )
+                target.parent.mkdir(parents=True, exist_ok=True)
+                source = tar.extractfile(member)
+                with source, open(target, "wb") as out:
+                    shutil.copyfileobj(source, out, EXTRACT_BUFFER_SIZE)
+                os.chmod(target, (member.mode & 0o755) | 0o600)
+            else:
+                logger.warning(f"Skipping unsupported package member: {member.name}")
+    
+    def _locate_agent_dir(self, extract_dir: Path) -> Path:
+        """
+        Find the agent directory inside an extracted package.
+        
+        Args:
+            extract_dir: Directory the package was extracted to
+            
+        Returns:
+            Path to agent directory
+        """
         # Find agent directory (should be single top-level directory)
         extracted_items = list(extract_dir.iterdir())
         if len(extracted_items) == 1 and extracted_items[0].is_dir():
-            agent_dir = extracted_items[0]
-        else:
-            # If multiple items, assume extract_dir is the agent directory
-            agent_dir = extract_dir
+            return extracted_items[0]
         
-        logger.info(f"Extracted package to {agent_dir}")
-        return agent_dir
+        # If multiple items, assume extract_dir is the agent directory
+        return extract_dir
     
     async def install_dependencies(
         self,
@@ -238,16 +491,45 @@ class AgentInstaller:
             logger.info("No requirements.txt found, skipping dependencies")
             return True
         
-        logger.info(f"Installing dependencies from {requirements_file}")
+        return await self.install_requirements([requirements_file])
+    
+    async def install_requirements(
+        self,
+        requirements_files: List[Path],
+    ) -> bool:
+        """
+        Install several requirements files with a single resolver run.
+        
+        Uses ``uv pip`` when uv is on PATH and ``python -m pip`` for the
+        running interpreter otherwise. Shared requirements are resolved once.
         
-        try:
-            import subprocess
+        Args:
+            requirements_files: requirements.txt files to install
             
-            subprocess.run(
-                ["pip", "install", "-r", str(requirements_file)],
-                check=True,
-                capture_output=True,
+        Returns:
+            True if dependencies installed successfully
+        """
+        if not requirements_files:
+            return True
+        
+        command = self._pip_install_command()
+        for requirements_file in requirements_files:
+            command += ["-r", str(requirements_file)]
+        
+        logger.info(f"Installing dependencies from {len(requirements_files)} requirements file(s)")
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise InstallError(
+                    f"{command[0]} exited with {process.returncode}: "
+                    f"{stderr.decode(errors='replace').strip()}"
+                )
             logger.info("Dependencies installed successfully")
             return True
         
@@ -255,12 +537,21 @@ class AgentInstaller:
             logger.error(f"Failed to install dependencies: {e}")
             return False
     
+    @staticmethod
+    def _pip_install_command() -> List[str]:
+        """Get the package install command for the running interpreter."""
+        uv = shutil.which("uv")
+        if uv:
+            return [uv, "pip", "install", "--python", sys.executable]
+        return [sys.executable, "-m", "pip", "install"]
+    
     async def install_agent(
         self,
         agent_id: str,
         version: Optional[str] = None,
         install_dependencies: bool = True,
         force: bool = False,
+        flush: bool = True,
     ) -> Dict[str, Any]:
         """
         Install agent from marketplace.
@@ -272,6 +563,8 @@ class AgentInstaller:
             version: Specific version (optional, defaults to latest)
             install_dependencies: Install requirements.txt dependencies
             force: Force reinstall if already installed
+            flush: Save the installed agents registry immediately (bulk
+                   callers can pass False and save once at the end)
             
         Returns:
             Installation result dict
@@ -298,42 +591,49 @@ class AgentInstaller:
         if not version:
             version = agent_meta.get("version", "latest")
         
+        # Reuse the download URL from the metadata when it is for this version
+        download_url = None
+        if version == agent_meta.get("version"):
+            download_url = agent_meta.get("download_url")
+        
+        # Extract next to the final location so installing is a rename
+        staging_dir = self.agents_dir / f".staging_{agent_id}_{uuid.uuid4().hex}"
+        target_dir = self.agents_dir / agent_id
+        
         try:
-            # Step 1: Download package
-            package_path = await self.download_package(agent_id, version)
-            
-            # Step 2: Verify package
-            expected_checksum = agent_meta.get("checksum")
-            if not await self.verify_package(package_path, expected_checksum):
-                raise InstallError("Package verification failed")
+            # Steps 1-3: Download, verify and extract package in one pass
+            agent_dir = await self.download_and_extract(
+                agent_id,
+                version,
+                staging_dir,
+                expected_checksum=agent_meta.get("checksum"),
+                download_url=download_url,
+            )
             
-            # Step 3: Extract package
-            with tempfile.TemporaryDirectory() as temp_dir:
-                agent_dir = await self.extract_package(package_path, Path(temp_dir))
-                
-                # Step 4: Install dependencies
-                if install_dependencies:
-                    if not await self.install_dependencies(agent_dir):
-                        logger.warning("Failed to install dependencies, continuing anyway")
-                
-                # Step 5: Copy to agents directory
-                target_dir = self.agents_dir / agent_id
-                if target_dir.exists():
-                    shutil.rmtree(target_dir)
-                
-                shutil.copytree(agent_dir, target_dir)
+            # Step 4: Install dependencies
+            if install_dependencies:
+                if not await self.install_dependencies(agent_dir):
+                    logger.warning("Failed to install dependencies, continuing anyway")
             
-            # Clean up downloaded package
-            package_path.unlink()
+            # Step 5: Move into the agents directory
+            await run_blocking(move_tree, agent_dir, target_dir)
             
             # Step 6: Record installation
             self._installed[agent_id] = {
                 "agent_id": agent_id,
                 "version": version,
+                "checksum": (
+                    agent_meta.get("checksum")
+                    if version == agent_meta.get("version")
+                    else None
+                ),
                 "installed_at": str(Path.cwd()),
                 "metadata": agent_meta,
             }
-            self._save_installed_agents()
+            self._dirty = True
+            if flush:
+                self._save_installed_agents()
+            self.registry.invalidate(agent_id)
             
             logger.info(f"Successfully installed {agent_id} v{version}")
             return {
@@ -346,16 +646,162 @@ class AgentInstaller:
         except Exception as e:
             logger.error(f"Installation failed: {e}")
             raise InstallError(f"Installation failed: {e}")
+        
+        finally:
+            if staging_dir.exists():
+                await run_blocking(shutil.rmtree, staging_dir, ignore_errors=True)
+    
+    async def install_many(
+        self,
+        agent_ids: List[str],
+        install_dependencies: bool = True,
+        force: bool = False,
+        max_concurrency: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Install several agents and their marketplace dependencies.
+        
+        Metadata for the whole dependency closure is fetched concurrently,
+        then agents are installed level by level in dependency order, with
+        each level installed concurrently. ``max_concurrency`` bounds the
+        number of registry requests and installs in flight. Python
+        requirements of all installed agents are installed together at the
+        end.
+        
+        Marketplace dependencies are read from the ``dependencies`` list in
+        the agent metadata (agent IDs, or dicts with an ``agent_id`` key).
+        Dependencies that are already installed are not reinstalled.
+        
+        Args:
+            agent_ids: Agent IDs to install
+            install_dependencies: Install requirements.txt dependencies
+            force: Force reinstall of the requested agents
+            max_concurrency: Maximum concurrent registry requests/installs
+            
+        Returns:
+            List of result dicts (one per agent, in installation order);
+            failed agents have status "error"
+            
+        Raises:
+            InstallError: If an agent is not found or dependencies are circular
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        requested = list(dict.fromkeys(agent_ids))
+        
+        # Resolve metadata for the dependency closure, one level per round
+        metadata: Dict[str, Dict[str, Any]] = {}
+        pending = requested
+        while pending:
+            fetched = list(zip(pending, await self.registry.get_agents(pending, max_concurrency)))
+            pending = []
+            for agent_id, agent_meta in fetched:
+                if not agent_meta:
+                    raise InstallError(f"Agent not found: {agent_id}")
+                metadata[agent_id] = agent_meta
+                for dep in self._agent_dependencies(agent_meta):
+                    if dep not in metadata and dep not in pending:
+                        pending.append(dep)
+        
+        # Skip dependencies that are already installed
+        remaining = {
+            agent_id: set(self._agent_dependencies(agent_meta))
+            for agent_id, agent_meta in metadata.items()
+            if agent_id in requested or agent_id not in self._installed
+        }
+        
+        async def _install(agent_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.install_agent(
+                    agent_id,
+                    install_dependencies=False,
+                    force=force and agent_id in requested,
+                    flush=False,
+                )
+        
+        results: List[Dict[str, Any]] = []
+        failed = set()
+        
+        # Save the installed agents registry once for the whole batch
+        try:
+            while remaining:
+                ready = [
+                    agent_id for agent_id, deps in remaining.items()
+                    if not deps & remaining.keys()
+                ]
+                if not ready:
+                    raise InstallError(f"Circular dependency between: {sorted(remaining)}")
+                
+                to_install = []
+                for agent_id in ready:
+                    del remaining[agent_id]
+                    broken = self._agent_dependencies(metadata[agent_id]) & failed
+                    if broken:
+                        failed.add(agent_id)
+                        results.append({
+                            "status": "error",
+                            "agent_id": agent_id,
+                            "error": f"Dependency failed to install: {sorted(broken)}",
+                        })
+                    else:
+                        to_install.append(agent_id)
+                
+                level_results = await asyncio.gather(
+                    *(_install(agent_id) for agent_id in to_install),
+                    return_exceptions=True,
+                )
+                for agent_id, result in zip(to_install, level_results):
+                    if isinstance(result, Exception):
+                        failed.add(agent_id)
+                        results.append({"status": "error", "agent_id": agent_id, "error": str(result)})
+                    else:
+                        results.append(result)
+        
+        finally:
+            self._save_installed_agents()
+        
+        # Resolve requirements for the whole batch at once
+        if install_dependencies:
+            requirements_files = [
+                Path(result["path"]) / "requirements.txt"
+                for result in results
+                if result["status"] == "success"
+            ]
+            requirements_files = [path for path in requirements_files if path.exists()]
+            if not await self.install_requirements(requirements_files):
+                logger.warning("Failed to install dependencies, continuing anyway")
+        
+        return results
+    
+    @staticmethod
+    def _agent_dependencies(agent_meta: Dict[str, Any]) -> set:
+        """
+        Get the marketplace agent IDs an agent depends on.
+        
+        Args:
+            agent_meta: Agent metadata dict
+            
+        Returns:
+            Set of agent IDs
+        """
+        deps = set()
+        for dep in agent_meta.get("dependencies") or []:
+            if isinstance(dep, dict):
+                dep = dep.get("agent_id")
+            if dep:
+                deps.add(dep)
+        return deps
     
     async def uninstall_agent(
         self,
         agent_id: str,
+        flush: bool = True,
     ) -> Dict[str, Any]:
         """
         Uninstall agent.
         
         Args:
             agent_id: Agent ID to uninstall
+            flush: Save the installed agents registry immediately
             
         Returns:
             Uninstallation result dict
@@ -368,11 +814,14 @@ class AgentInstaller:
         # Remove agent directory
         agent_dir = self.agents_dir / agent_id
         if agent_dir.exists():
-            shutil.rmtree(agent_dir)
+            await run_blocking(shutil.rmtree, agent_dir)
         
         # Remove from installed registry
         del self._installed[agent_id]
-        self._save_installed_agents()
+        self._dirty = True
+        if flush:
+            self._save_installed_agents()
+        self.registry.invalidate(agent_id)
         
         logger.info(f"Successfully uninstalled {agent_id}")
         return {
@@ -402,13 +851,55 @@ class AgentInstaller:
             version: Target version (optional, defaults to latest)
             
         Returns:
-            Update result dict
+            Update result dict (status "up-to-date" if the target version is
+            already installed and unchanged in the registry)
         """
         if agent_id not in self._installed:
             raise InstallError(f"Agent not installed: {agent_id}")
         
-        current_version = self._installed[agent_id]["version"]
+        installed = self._installed[agent_id]
+        current_version = installed["version"]
+        
+        # Skip the download when the installed copy already matches the target
+        agent_meta = await self.registry.get_agent(agent_id)
+        if agent_meta:
+            target_version = version or agent_meta.get("version")
+            if (
+                target_version == current_version
+                and (self.agents_dir / agent_id).is_dir()
+                and not self._republished(installed, agent_meta)
+            ):
+                logger.info(f"{agent_id} is up to date (version {current_version})")
+                return {
+                    "status": "up-to-date",
+                    "agent_id": agent_id,
+                    "version": current_version,
+                    "path": str(self.agents_dir / agent_id),
+                }
+        
         logger.info(f"Updating {agent_id} from {current_version} to {version or 'latest'}")
         
         # Install new version (force=True to overwrite)
         return await self.install_agent(agent_id, version, force=True)
+    
+    @staticmethod
+    def _republished(installed: Dict[str, Any], agent_meta: Dict[str, Any]) -> bool:
+        """
+        Check whether the registry's copy of an installed version has changed.
+        
+        Args:
+            installed: Installed agent record
+            agent_meta: Current registry metadata
+            
+        Returns:
+            True if the registry publishes a different checksum for the
+            installed version
+        """
+        if agent_meta.get("version") != installed["version"]:
+            return False
+        
+        stored = installed.get("checksum")
+        if stored is None and installed.get("metadata", {}).get("version") == installed["version"]:
+            stored = installed["metadata"].get("checksum")
+        
+        return stored != agent_meta.get("checksum")
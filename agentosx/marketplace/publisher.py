@@ -4,24 +4,139 @@ Agent Publisher
 Handles validation and publishing of agents to the marketplace.
 """
 
+import ast
+import asyncio
 import hashlib
 import json
 import logging
+import os
+import re
 import tarfile
+import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 import yaml
 
+from .checksums import HashingWriter
+from .fileops import run_blocking
+from .http import get_shared_client
+from .streams import ChunkSink
+
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Hardcoded secrets (api_key/token literals, or any password literal),
+# used when agent code cannot be parsed
+SECRET_PATTERN = re.compile(
+    r'(?:api_key|token)\s*=\s*["\'][\w-]{20,}["\']'
+    r'|password\s*=\s*["\'][\w-]+["\']',
+    re.IGNORECASE,
+)
+
 
 class PublishError(Exception):
     """Raised when publishing fails."""
     pass
 
 
+class _SecurityVisitor(ast.NodeVisitor):
+    """Single-pass AST scan of agent code for risky patterns."""
+    
+    _SECRET_VALUE = re.compile(r"[\w-]+")
+    
+    def __init__(self):
+        # (line number, assigned name) of each hardcoded secret
+        self.secrets: List[Tuple[int, str]] = []
+        self.dynamic_exec = False
+        self.subprocess = False
+    
+    @classmethod
+    def scan(cls, code: str) -> "_SecurityVisitor":
+        """
+        Scan agent source code.
+        
+        Code that does not parse falls back to a plain text scan.
+        
+        Args:
+            code: Python source
+            
+        Returns:
+            Visitor with the scan results
+        """
+        visitor = cls()
+        try:
+            visitor.visit(ast.parse(code))
+        except SyntaxError:
+            visitor.secrets = cls._scan_secrets_text(code)
+            visitor.dynamic_exec = "eval(" in code or "exec(" in code
+            visitor.subprocess = "subprocess" in code
+        return visitor
+    
+    @staticmethod
+    def _scan_secrets_text(code: str) -> List[Tuple[int, str]]:
+        """Find every secret pattern match in one pass, with line numbers."""
+        secrets = []
+        line, offset = 1, 0
+        for match in SECRET_PATTERN.finditer(code):
+            line += code.count("\n", offset, match.start())
+            offset = match.start()
+            secrets.append((line, match.group().split("=")[0].strip()))
+        return secrets
+    
+    def _check_secret(self, name: Optional[str], value: Optional[ast.AST]) -> None:
+        """Record a string literal assigned to a secret-looking name."""
+        if not name or not isinstance(value, ast.Constant) or not isinstance(value.value, str):
+            return
+        lowered = name.lower()
+        if lowered.endswith(("api_key", "token")):
+            min_length = 20
+        elif lowered.endswith("password"):
+            min_length = 1
+        else:
+            return
+        if len(value.value) >= min_length and self._SECRET_VALUE.fullmatch(value.value):
+            self.secrets.append((value.lineno, name))
+    
+    @staticmethod
+    def _target_name(target: ast.AST) -> Optional[str]:
+        """Get the name bound by an assignment target."""
+        if isinstance(target, ast.Name):
+            return target.id
+        if isinstance(target, ast.Attribute):
+            return target.attr
+        return None
+    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            self._check_secret(self._target_name(target), node.value)
+        self.generic_visit(node)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._check_secret(self._target_name(node.target), node.value)
+        self.generic_visit(node)
+    
+    def visit_keyword(self, node: ast.keyword) -> None:
+        self._check_secret(node.arg, node.value)
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name) and node.func.id in ("eval", "exec"):
+            self.dynamic_exec = True
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        if any(alias.name.split(".")[0] == "subprocess" for alias in node.names):
+            self.subprocess = True
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and node.module.split(".")[0] == "subprocess":
+            self.subprocess = True
+
+
 class AgentPublisher:
     """
     Publisher for agentOS marketplace.
@@ -54,6 +169,7 @@ class AgentPublisher:
         registry_url: str = "https://marketplace.agentos.dev",
         api_key: Optional[str] = None,
         timeout: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize agent publisher.
@@ -62,10 +178,15 @@ class AgentPublisher:
             registry_url: Marketplace registry URL
             api_key: API key for authentication
             timeout: Request timeout in seconds
+            client: HTTP client to use (defaults to the shared client for
+                    this registry; never closed by close())
         """
         self.registry_url = registry_url.rstrip("/")
         self.api_key = api_key
-        self.http_client = httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        self.http_client = client or get_shared_client(self.registry_url, timeout)
+        
+        # path -> (mtime_ns, size, parsed agent.yaml)
+        self._yaml_cache: Dict[Path, Tuple[int, int, Any]] = {}
         
         logger.info(f"Initialized AgentPublisher for {registry_url}")
     
@@ -78,8 +199,30 @@ class AgentPublisher:
         await self.close()
     
     async def close(self):
-        """Close HTTP client."""
-        await self.http_client.aclose()
+        """Nothing to release (the shared HTTP client stays open)."""
+    
+    def _load_yaml_cached(self, path: Path) -> Any:
+        """
+        Parse a YAML file, reusing the result while the file is unchanged.
+        
+        Callers must not mutate the returned object.
+        
+        Args:
+            path: YAML file path
+            
+        Returns:
+            Parsed YAML document
+        """
+        path = Path(path)
+        stat = path.stat()
+        cached = self._yaml_cache.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        
+        with open(path, "r") as f:
+            data = yaml.load(f, Loader=YAML_LOADER)
+        self._yaml_cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+        return data
     
     def _get_headers(self) -> Dict[str, str]:
         """Get HTTP headers with authentication."""
@@ -107,19 +250,23 @@ class AgentPublisher:
         errors = []
         warnings = []
         
+        # List the directory once instead of stat-ing each file
+        try:
+            with os.scandir(agent_dir) as it:
+                entries = {entry.name for entry in it}
+        except OSError:
+            entries = set()
+        
         # Check required files
         required_files = ["agent.py", "agent.yaml"]
         for file in required_files:
-            file_path = agent_dir / file
-            if not file_path.exists():
+            if file not in entries:
                 errors.append(f"Missing required file: {file}")
         
         # Check agent.yaml structure
-        agent_yaml = agent_dir / "agent.yaml"
-        if agent_yaml.exists():
+        if "agent.yaml" in entries:
             try:
-                with open(agent_yaml, "r") as f:
-                    config = yaml.safe_load(f)
+                config = self._load_yaml_cached(agent_dir / "agent.yaml")
                 
                 # Validate required fields
                 required_fields = ["name", "version", "description"]
@@ -131,13 +278,11 @@ class AgentPublisher:
                 errors.append(f"Invalid agent.yaml: {e}")
         
         # Check for README
-        readme_path = agent_dir / "README.md"
-        if not readme_path.exists():
+        if "README.md" not in entries:
             warnings.append("Missing README.md (recommended)")
         
         # Check for LICENSE
-        license_path = agent_dir / "LICENSE"
-        if not license_path.exists():
+        if "LICENSE" not in entries:
             warnings.append("Missing LICENSE file (recommended)")
         
         is_valid = len(errors) == 0
@@ -233,30 +378,21 @@ class AgentPublisher:
             with open(agent_py, "r") as f:
                 code = f.read()
             
-            # Check for hardcoded secrets
-            import re
+            # Check secrets, eval/exec and subprocess in one pass over the AST
+            scan = _SecurityVisitor.scan(code)
             
-            secret_patterns = [
-                r'api_key\s*=\s*["\'][\w-]{20,}["\']',
-                r'password\s*=\s*["\'][\w-]+["\']',
-                r'token\s*=\s*["\'][\w-]{20,}["\']',
-            ]
-            
-            for pattern in secret_patterns:
-                if re.search(pattern, code, re.IGNORECASE):
-                    issues.append(
-                        "Possible hardcoded secret detected. Use environment variables."
-                    )
-                    break
+            for line, name in scan.secrets:
+                issues.append(
+                    f"Possible hardcoded secret detected ({name}, line {line}). "
+                    "Use environment variables."
+                )
             
-            # Check for eval/exec usage
-            if "eval(" in code or "exec(" in code:
+            if scan.dynamic_exec:
                 warnings.append(
                     "Usage of eval() or exec() detected. This may be a security risk."
                 )
             
-            # Check for subprocess calls
-            if "subprocess" in code:
+            if scan.subprocess:
                 warnings.append(
                     "Subprocess usage detected. Ensure proper input validation."
                 )
@@ -289,9 +425,7 @@ class AgentPublisher:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Load metadata
-        agent_yaml = agent_dir / "agent.yaml"
-        with open(agent_yaml, "r") as f:
-            metadata = yaml.safe_load(f)
+        metadata = self._load_yaml_cached(agent_dir / "agent.yaml")
         
         agent_id = metadata.get("name", "agent")
         version = metadata.get("version", "1.0.0")
@@ -300,21 +434,11 @@ class AgentPublisher:
         package_name = f"{agent_id}-{version}.tar.gz"
         package_path = output_dir / package_name
         
-        with tarfile.open(package_path, "w:gz") as tar:
-            tar.add(agent_dir, arcname=agent_id)
-        
-        # Compute checksums
-        checksums = {}
-        
-        # SHA256 checksum
-        with open(package_path, "rb") as f:
-            sha256_hash = hashlib.sha256(f.read()).hexdigest()
-            checksums["sha256"] = sha256_hash
-        
-        # MD5 checksum (for backward compatibility)
-        with open(package_path, "rb") as f:
-            md5_hash = hashlib.md5(f.read()).hexdigest()
-            checksums["md5"] = md5_hash
+        # Checksums are computed while the archive is written (MD5 kept for
+        # backward compatibility)
+        checksums = await run_blocking(
+            self._write_archive, agent_dir, package_path, agent_id
+        )
         
         # Save checksums
         checksums_path = output_dir / f"{package_name}.checksums.json"
@@ -324,6 +448,74 @@ class AgentPublisher:
         logger.info(f"Created package: {package_path}")
         return package_path
     
+    @staticmethod
+    def _write_archive(
+        agent_dir: Path,
+        package_path: Path,
+        arcname: str,
+    ) -> Dict[str, str]:
+        """Write the package archive and return its checksums (runs in a worker thread)."""
+        with open(package_path, "wb") as f:
+            writer = HashingWriter(f, "sha256", "md5")
+            with tarfile.open(fileobj=writer, mode="w|gz") as tar:
+                tar.add(agent_dir, arcname=arcname)
+        return writer.hexdigests()
+    
+    @staticmethod
+    def _stream_archive(agent_dir: Path, sink: ChunkSink, arcname: str) -> None:
+        """Write the package archive into a sink (runs in a worker thread)."""
+        try:
+            with tarfile.open(fileobj=sink, mode="w|gz") as tar:
+                tar.add(agent_dir, arcname=arcname)
+        except Exception as e:
+            sink.fail(e)
+        else:
+            sink.close()
+    
+    @staticmethod
+    async def _multipart_upload(
+        boundary: str,
+        metadata: Dict[str, Any],
+        package_name: str,
+        sink: ChunkSink,
+    ) -> AsyncIterator[bytes]:
+        """
+        Generate a multipart/form-data publish request body.
+        
+        The package is streamed from the sink and its SHA256 checksum is sent
+        as a trailing ``checksum`` field once the archive is complete.
+        
+        Args:
+            boundary: Multipart boundary
+            metadata: Agent metadata
+            package_name: Package file name
+            sink: Sink the package archive is written to
+            
+        Yields:
+            Request body chunks
+        """
+        delimiter = f"--{boundary}\r\n".encode()
+        
+        yield delimiter
+        yield b'Content-Disposition: form-data; name="metadata"\r\n\r\n'
+        yield json.dumps(metadata).encode() + b"\r\n"
+        
+        yield delimiter
+        yield (
+            f'Content-Disposition: form-data; name="package"; filename="{package_name}"\r\n'
+            "Content-Type: application/gzip\r\n\r\n"
+        ).encode()
+        checksum = hashlib.sha256()
+        async for chunk in sink:
+            checksum.update(chunk)
+            yield chunk
+        yield b"\r\n"
+        
+        yield delimiter
+        yield b'Content-Disposition: form-data; name="checksum"\r\n\r\n'
+        yield checksum.hexdigest().encode() + b"\r\n"
+        yield f"--{boundary}--\r\n".encode()
+    
     async def publish_agent(
         self,
         agent_dir: Path,
@@ -357,10 +549,8 @@ class AgentPublisher:
                 f"Agent structure validation failed: {structure_result['errors']}"
             )
         
-        # Step 2: Load and validate metadata
-        agent_yaml = agent_dir / "agent.yaml"
-        with open(agent_yaml, "r") as f:
-            metadata = yaml.safe_load(f)
+        # Step 2: Load and validate metadata (parsed during step 1)
+        metadata = dict(self._load_yaml_cached(agent_dir / "agent.yaml"))
         
         if version:
             metadata["version"] = version
@@ -398,27 +588,31 @@ class AgentPublisher:
                 },
             }
         
-        # Step 4: Create package
-        import tempfile
+        # Steps 4-5: Package and upload in one stream, hashing as bytes go out
+        agent_id = metadata["name"]
+        package_name = f"{agent_id}-{metadata['version']}.tar.gz"
+        boundary = uuid.uuid4().hex
+        sink = ChunkSink()
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            package_path = await self.create_package(agent_dir, Path(temp_dir))
-            
-            # Step 5: Upload to registry
-            with open(package_path, "rb") as f:
-                files = {"package": f}
-                data = {"metadata": json.dumps(metadata)}
-                
-                response = await self.http_client.post(
-                    f"{self.registry_url}/api/agents/publish",
-                    files=files,
-                    data=data,
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                    if self.api_key
-                    else {},
-                )
-                response.raise_for_status()
-                result = response.json()
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        
+        loop = asyncio.get_running_loop()
+        producer = loop.run_in_executor(
+            None, self._stream_archive, agent_dir, sink, agent_id
+        )
+        try:
+            response = await self.http_client.post(
+                f"{self.registry_url}/api/agents/publish",
+                content=self._multipart_upload(boundary, metadata, package_name, sink),
+                headers=headers,
+            )
+            response.raise_for_status()
+            result = response.json()
+        finally:
+            sink.abort()
+            await producer
         
         logger.info(f"Successfully published {metadata['name']} v{metadata['version']}")
         return result
@@ -4,13 +4,112 @@ Marketplace Registry Client
 Provides search and discovery of agents in the agentOS marketplace.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
 import httpx
 
+from .._loop import install_fast_event_loop
+from ..serialization import loads
+from .cache import DEFAULT_CACHE_DIR, CacheEntry, RegistryDiskCache
+from .fileops import run_blocking
+from .http import get_shared_client
+
 logger = logging.getLogger(__name__)
 
+# Seconds that each kind of registry response is reused for, unless the
+# registry sends Cache-Control max-age or a "ttl" field
+CACHE_TTLS: Dict[str, float] = {
+    "agent": 300.0,
+    "download_url": 60.0,
+    "featured": 60.0,
+    "categories": 3600.0,
+    "versions": 300.0,
+    "compat": 600.0,
+    "search": 30.0,
+}
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# Kinds of registry response persisted across processes (with a disk cache)
+PERSISTED_KINDS = frozenset({"agent", "versions", "categories"})
+
+DEFAULT_REGISTRY_URL = "https://marketplace.agentos.dev"
+
+# Requests in flight for bulk lookups against one registry host
+DEFAULT_CONCURRENCY = 32
+
+# Results per page and pages fetched ahead by search_iter
+SEARCH_PAGE_SIZE = 100
+SEARCH_PREFETCH = 2
+
+# Retries for rate-limited, unavailable or unreachable registry requests
+MAX_RETRIES = 3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF = 0.5
+MAX_RETRY_DELAY = 30.0
+
+
+def _endpoint(message: str, fallback: Callable[[Exception], Any] = lambda e: None):
+    """
+    Turn registry failures of a public method into a logged fallback value.
+    
+    A 404 is logged as a warning, anything else as an error.
+    
+    Args:
+        message: Log message prefix (e.g. "Failed to get agent")
+        fallback: Builds the return value from the exception
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                    logger.warning(f"{message}: not found ({e.request.url})")
+                else:
+                    logger.error(f"{message}: {e}")
+                return fallback(e)
+        return wrapper
+    return decorator
+
+
+# registry_url -> process-wide RegistryClient
+_default_registries: Dict[str, "RegistryClient"] = {}
+
+
+def get_default_registry(registry_url: str = DEFAULT_REGISTRY_URL) -> "RegistryClient":
+    """
+    Get the process-wide registry client for a marketplace.
+    
+    Reusing one client keeps its response cache (and the shared connection
+    pool) warm across operations, instead of starting cold for every
+    command. Agent metadata, version lists and categories are also
+    persisted under ``DEFAULT_CACHE_DIR`` for later processes.
+    
+    Args:
+        registry_url: Marketplace registry URL
+        
+    Returns:
+        Shared registry client (do not close it; see
+        ``marketplace.close_shared_clients`` for shutdown)
+    """
+    key = registry_url.rstrip("/")
+    registry = _default_registries.get(key)
+    if registry is None:
+        registry = _default_registries[key] = RegistryClient(
+            key, cache_dir=DEFAULT_CACHE_DIR
+        )
+    return registry
+
 
 class RegistryClient:
     """
@@ -21,7 +120,11 @@ class RegistryClient:
     
     Example:
         ```python
-        registry = RegistryClient("https://marketplace.agentos.dev")
+        # Optional: uvloop speeds up high fan-out lookups (before asyncio.run)
+        install_fast_event_loop()
+        
+        # Prefer the shared client so the cache and connections are reused
+        registry = get_default_registry()
         
         # Search for agents
         results = await registry.search(query="twitter", category="social")
@@ -29,15 +132,24 @@ class RegistryClient:
         # Get agent details
         agent = await registry.get_agent("twitter_bot")
         
-        # List featured agents
-        featured = await registry.get_featured_agents()
+        # Get several agents concurrently
+        agents = await registry.get_agents(["twitter_bot", "autoblog"])
+        
+        # Or batch any calls with asyncio.gather
+        featured, categories = await asyncio.gather(
+            registry.get_featured_agents(),
+            registry.get_categories(),
+        )
         ```
     """
     
     def __init__(
         self,
-        registry_url: str = "https://marketplace.agentos.dev",
+        registry_url: str = DEFAULT_REGISTRY_URL,
         timeout: float = 30.0,
+        cache_ttl: Optional[float] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache_dir: Optional[Path] = None,
     ):
         """
         Initialize registry client.
@@ -45,9 +157,39 @@ class RegistryClient:
         Args:
             registry_url: Marketplace registry URL
             timeout: Request timeout in seconds
+            cache_ttl: Seconds to cache every read endpoint (default: per
+                       endpoint, see CACHE_TTLS; 0 disables caching)
+            client: HTTP client to use (defaults to the shared client for
+                    this registry; never closed by close())
+            cache_dir: Directory for a persistent response cache shared
+                       between processes (default: in-memory only)
         """
         self.registry_url = registry_url.rstrip("/")
-        self.http_client = httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        self.http_client = client or get_shared_client(self.registry_url, timeout)
+        
+        # Endpoint URLs, bound once per client
+        self._search_url = f"{self.registry_url}/api/agents/search"
+        self._featured_url = f"{self.registry_url}/api/agents/featured"
+        self._categories_url = f"{self.registry_url}/api/categories"
+        self._agent_url = (self.registry_url + "/api/agents/{}").format
+        self._versions_url = (self.registry_url + "/api/agents/{}/versions").format
+        self._compat_url = (self.registry_url + "/api/agents/{}/compatibility").format
+        self._download_url = (self.registry_url + "/api/agents/{}/download").format
+        
+        # (kind, agent_id, ...) -> (expires_at, value)
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+        # One in-flight fetch per key; concurrent misses wait for it
+        self._locks: Dict[Tuple[Any, ...], asyncio.Lock] = {}
+        # Stale entries are revalidated with If-None-Match/If-Modified-Since
+        self._disk = (
+            RegistryDiskCache(cache_dir)
+            if cache_dir is not None and cache_ttl != 0
+            else None
+        )
+        
+        # Monotonic time before which the registry asked us to hold off
+        self._rate_limited_until = 0.0
         
         logger.info(f"Initialized RegistryClient for {registry_url}")
     
@@ -60,9 +202,238 @@ class RegistryClient:
         await self.close()
     
     async def close(self):
-        """Close HTTP client."""
-        await self.http_client.aclose()
+        """
+        Release cached responses (persisted ones are kept).
+        
+        The HTTP client is shared and stays open; see
+        ``marketplace.http.close_shared_clients``.
+        """
+        self._cache.clear()
+        if self._disk is not None:
+            self._disk.close()
+    
+    def _cache_get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """Return a cached value, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        return entry[1]
+    
+    def _cache_set(self, key: Tuple[Any, ...], value: Any, ttl: float) -> None:
+        """Cache a value for ttl seconds."""
+        if ttl > 0:
+            self._cache[key] = (time.monotonic() + ttl, value)
+    
+    def _response_ttl(self, kind: str, response: httpx.Response, data: Any) -> float:
+        """
+        Work out how long a registry response may be reused.
+        
+        An explicit cache_ttl wins; otherwise the registry's Cache-Control
+        header or a "ttl" field in the body, then the CACHE_TTLS default.
+        """
+        if self.cache_ttl is not None:
+            return self.cache_ttl
+        
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0.0
+        match = _MAX_AGE.search(cache_control)
+        if match:
+            return float(match.group(1))
+        
+        if isinstance(data, dict) and isinstance(data.get("ttl"), (int, float)):
+            return float(data["ttl"])
+        
+        return CACHE_TTLS.get(kind, 0.0)
+    
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a registry request, retrying transient failures.
+        
+        Rate-limited (429), unavailable (5xx) and unreachable requests are
+        retried up to MAX_RETRIES times with jittered exponential backoff,
+        honoring Retry-After. When X-RateLimit-Remaining reaches 0, later
+        requests wait for X-RateLimit-Reset instead of provoking a 429.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx.AsyncClient.request
+            
+        Returns:
+            Successful response
+            
+        Raises:
+            httpx.HTTPError: If the request fails for good
+        """
+        attempt = 0
+        while True:
+            wait = self._rate_limited_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            try:
+                response = await self.http_client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == MAX_RETRIES:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+            
+            self._track_rate_limit(response)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                # 304 answers a conditional GET: the cached copy is current
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            
+            delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+            logger.warning(
+                f"Registry returned {response.status_code} for {url}, "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the delay before a retry (Retry-After seconds, or backoff)."""
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+        delay = RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, 0.25)
+        return min(delay, MAX_RETRY_DELAY)
+    
+    def _track_rate_limit(self, response: httpx.Response) -> None:
+        """Hold off further requests when the registry's quota is used up."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining != "0" or reset is None:
+            return
+        try:
+            reset_at = float(reset)
+        except ValueError:
+            return
+        # Either an epoch timestamp or seconds until the window resets
+        wait = reset_at - time.time() if reset_at > 1e9 else reset_at
+        if wait > 0:
+            self._rate_limited_until = time.monotonic() + min(wait, MAX_RETRY_DELAY)
+    
+    async def _cached_get(
+        self,
+        key: Tuple[Any, ...],
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        GET a JSON document, serving it from the cache while fresh.
+        
+        Concurrent misses for the same key share a single request. With a
+        disk cache, PERSISTED_KINDS are also served from disk while fresh,
+        and revalidated with the stored ETag/Last-Modified once stale (a
+        304 reuses the stored body).
+        
+        Args:
+            key: Cache key; key[0] is the endpoint kind, key[1] the agent ID
+                 (or None)
+            url: Request URL
+            params: Query parameters
+            
+        Returns:
+            Decoded JSON response (parsed with orjson when installed)
+            
+        Raises:
+            httpx.HTTPError: If the request fails (failures are not cached)
+        """
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                cached = self._cache_get(key)
+                if cached is not None:
+                    return cached
+                
+                persist = self._disk is not None and key[0] in PERSISTED_KINDS
+                entry = (
+                    await run_blocking(self._disk.get, self.registry_url, key)
+                    if persist else None
+                )
+                if entry is not None and entry.fresh:
+                    data = loads(entry.body)
+                    self._cache_set(key, data, entry.expires_at - time.time())
+                    return data
+                
+                response = await self._request(
+                    "GET",
+                    url,
+                    params=params,
+                    headers=entry.validators() if entry is not None else None,
+                )
+                if response.status_code == 304 and entry is not None:
+                    data = loads(entry.body)
+                    ttl = self._response_ttl(key[0], response, data)
+                    await run_blocking(
+                        self._disk.touch, self.registry_url, key, time.time() + ttl
+                    )
+                else:
+                    data = loads(response.content)
+                    ttl = self._response_ttl(key[0], response, data)
+                    if persist:
+                        await run_blocking(self._persist, key, response, ttl)
+                
+                self._cache_set(key, data, ttl)
+                return data
+            finally:
+                # Waiters already hold the lock; later callers hit the cache
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+    
+    def _persist(self, key: Tuple[Any, ...], response: httpx.Response, ttl: float) -> None:
+        """
+        Store a response in the disk cache if it can be reused or revalidated.
+        
+        Blocks on the database; run it in a thread pool from async code.
+        """
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if ttl > 0 or etag or last_modified:
+            self._disk.set(
+                self.registry_url,
+                key,
+                CacheEntry(response.content, time.time() + ttl, etag, last_modified),
+            )
+    
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """
+        Drop cached registry responses, including persisted ones.
+        
+        Deleting persisted entries briefly blocks on the disk cache.
+        
+        Args:
+            agent_id: Only drop entries for this agent (default: drop all)
+        """
+        if self._disk is not None:
+            self._disk.delete(self.registry_url, agent_id)
+        
+        if agent_id is None:
+            self._cache.clear()
+            return
+        
+        for key in [key for key in self._cache if key[1] == agent_id]:
+            del self._cache[key]
     
+    @_endpoint("Search failed", lambda e: [])
     async def search(
         self,
         query: Optional[str] = None,
@@ -75,6 +446,9 @@ class RegistryClient:
         """
         Search marketplace for agents.
         
+        Successful responses are cached (see ``CACHE_TTLS``); use
+        ``search_iter`` to walk every result.
+        
         Args:
             query: Search query string
             category: Filter by category
@@ -95,33 +469,106 @@ class RegistryClient:
             )
             ```
         """
-        params = {
-            "limit": limit,
-            "offset": offset,
-        }
+        params = self._search_params(query, category, tags, author)
+        return await self._search_page({**params, "limit": limit, "offset": offset})
+    
+    async def search_iter(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        author: Optional[str] = None,
+        page_size: int = SEARCH_PAGE_SIZE,
+        prefetch: int = SEARCH_PREFETCH,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all agents matching search criteria.
+        
+        Pages are requested ahead of the consumer, so the next pages are
+        usually in flight (or done) while the current one is processed.
+        Pages are cached like ``search`` results. If a page fails, the
+        error is logged and iteration stops.
+        
+        Args:
+            query: Search query string
+            category: Filter by category
+            tags: Filter by tags
+            author: Filter by author
+            page_size: Results per request
+            prefetch: Pages requested ahead of the current one
+            
+        Yields:
+            Agent dicts matching search criteria
+            
+        Example:
+            ```python
+            async for agent in registry.search_iter(category="social"):
+                print(agent["name"])
+            ```
+        """
+        params = self._search_params(query, category, tags, author)
+        pending: Deque["asyncio.Future[List[Dict[str, Any]]]"] = deque()
+        next_offset = 0
         
-        if query:
-            params["q"] = query
-        if category:
-            params["category"] = category
-        if tags:
-            params["tags"] = ",".join(tags)
-        if author:
-            params["author"] = author
+        def schedule() -> None:
+            nonlocal next_offset
+            page_params = {**params, "limit": page_size, "offset": next_offset}
+            pending.append(asyncio.ensure_future(self._search_page(page_params)))
+            next_offset += page_size
         
         try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/search",
-                params=params,
+            for _ in range(prefetch + 1):
+                schedule()
+            
+            while True:
+                try:
+                    agents = await pending.popleft()
+                except Exception as e:
+                    logger.error(f"Search failed: {e}")
+                    return
+                
+                last_page = len(agents) < page_size
+                if not last_page:
+                    schedule()
+                
+                for agent in agents:
+                    yield agent
+                
+                if last_page:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    @staticmethod
+    def _search_params(
+        query: Optional[str],
+        category: Optional[str],
+        tags: Optional[List[str]],
+        author: Optional[str],
+    ) -> Dict[str, Any]:
+        """Build search filter params, leaving out empty filters."""
+        return {
+            name: value
+            for name, value in (
+                ("q", query),
+                ("category", category),
+                ("tags", ",".join(tags) if tags else None),
+                ("author", author),
             )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("agents", [])
-        
-        except Exception as e:
-            logger.error(f"Search failed: {e}")
-            return []
+            if value
+        }
     
+    async def _search_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch one page of search results (cached; errors propagate)."""
+        data = await self._cached_get(
+            ("search", None, *sorted(params.items())),
+            self._search_url,
+            params=params,
+        )
+        return data.get("agents", [])
+    
+    @_endpoint("Failed to get agent")
     async def get_agent(
         self,
         agent_id: str,
@@ -129,6 +576,8 @@ class RegistryClient:
         """
         Get detailed information about an agent.
         
+        Successful responses are cached (see ``CACHE_TTLS``).
+        
         Args:
             agent_id: Agent ID
             
@@ -142,25 +591,37 @@ class RegistryClient:
             print(f"Author: {agent['author']}")
             ```
         """
-        try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/{agent_id}",
-            )
-            response.raise_for_status()
-            return response.json()
-        
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.warning(f"Agent not found: {agent_id}")
-                return None
-            else:
-                logger.error(f"Failed to get agent: {e}")
-                return None
-        
-        except Exception as e:
-            logger.error(f"Failed to get agent: {e}")
-            return None
+        return await self._cached_get(
+            ("agent", agent_id),
+            self._agent_url(agent_id),
+        )
     
+    async def get_agents(
+        self,
+        agent_ids: Sequence[str],
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get details for several agents concurrently.
+        
+        Duplicate IDs are fetched once (via the cache).
+        
+        Args:
+            agent_ids: Agent IDs
+            max_concurrency: Maximum requests in flight
+            
+        Returns:
+            Agent metadata dicts (None where not found), in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _get(agent_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_agent(agent_id)
+        
+        return list(await asyncio.gather(*(_get(agent_id) for agent_id in agent_ids)))
+    
+    @_endpoint("Failed to get agent versions", lambda e: [])
     async def get_agent_versions(
         self,
         agent_id: str,
@@ -168,24 +629,21 @@ class RegistryClient:
         """
         Get all available versions of an agent.
         
+        Successful responses are cached (see ``CACHE_TTLS``).
+        
         Args:
             agent_id: Agent ID
             
         Returns:
             List of version dicts with version, release_date, changelog
         """
-        try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/{agent_id}/versions",
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("versions", [])
-        
-        except Exception as e:
-            logger.error(f"Failed to get agent versions: {e}")
-            return []
+        data = await self._cached_get(
+            ("versions", agent_id),
+            self._versions_url(agent_id),
+        )
+        return data.get("versions", [])
     
+    @_endpoint("Failed to get featured agents", lambda e: [])
     async def get_featured_agents(
         self,
         limit: int = 10,
@@ -193,44 +651,41 @@ class RegistryClient:
         """
         Get featured/trending agents.
         
+        Successful responses are cached (see ``CACHE_TTLS``).
+        
         Args:
             limit: Maximum number of agents to return
             
         Returns:
             List of featured agent dicts
         """
-        try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/featured",
-                params={"limit": limit},
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("agents", [])
-        
-        except Exception as e:
-            logger.error(f"Failed to get featured agents: {e}")
-            return []
+        data = await self._cached_get(
+            ("featured", None, limit),
+            self._featured_url,
+            params={"limit": limit},
+        )
+        return data.get("agents", [])
     
+    @_endpoint("Failed to get categories", lambda e: [])
     async def get_categories(self) -> List[Dict[str, str]]:
         """
         Get all available agent categories.
         
+        Successful responses are cached (see ``CACHE_TTLS``).
+        
         Returns:
             List of category dicts with name and description
         """
-        try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/categories",
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("categories", [])
-        
-        except Exception as e:
-            logger.error(f"Failed to get categories: {e}")
-            return []
+        data = await self._cached_get(
+            ("categories", None),
+            self._categories_url,
+        )
+        return data.get("categories", [])
     
+    @_endpoint(
+        "Failed to check compatibility",
+        lambda e: {"compatible": False, "error": str(e)},
+    )
     async def check_compatibility(
         self,
         agent_id: str,
@@ -239,6 +694,10 @@ class RegistryClient:
         """
         Check if agent is compatible with agentOSX version.
         
+        Successful responses are cached (see ``CACHE_TTLS``). An
+        incompatible result drops the agent's persisted metadata, which may
+        be what pointed at the incompatible release.
+        
         Args:
             agent_id: Agent ID
             agentosx_version: AgentOSX version string
@@ -246,18 +705,41 @@ class RegistryClient:
         Returns:
             Compatibility dict with compatible (bool) and required_version
         """
-        try:
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/{agent_id}/compatibility",
-                params={"agentosx_version": agentosx_version},
-            )
-            response.raise_for_status()
-            return response.json()
+        data = await self._cached_get(
+            ("compat", agent_id, agentosx_version),
+            self._compat_url(agent_id),
+            params={"agentosx_version": agentosx_version},
+        )
+        if self._disk is not None and not data.get("compatible", True):
+            await run_blocking(self._disk.delete, self.registry_url, agent_id)
+        return data
+    
+    async def check_compatibility_many(
+        self,
+        agent_ids: Sequence[str],
+        agentosx_version: str,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Check several agents' compatibility concurrently.
         
-        except Exception as e:
-            logger.error(f"Failed to check compatibility: {e}")
-            return {"compatible": False, "error": str(e)}
+        Args:
+            agent_ids: Agent IDs
+            agentosx_version: AgentOSX version string
+            max_concurrency: Maximum requests in flight
+            
+        Returns:
+            Compatibility dicts, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _check(agent_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check_compatibility(agent_id, agentosx_version)
+        
+        return list(await asyncio.gather(*(_check(agent_id) for agent_id in agent_ids)))
     
+    @_endpoint("Failed to get download URL")
     async def get_download_url(
         self,
         agent_id: str,
@@ -266,6 +748,8 @@ class RegistryClient:
         """
         Get download URL for agent package.
         
+        Successful responses are cached (see ``CACHE_TTLS``).
+        
         Args:
             agent_id: Agent ID
             version: Specific version (optional, defaults to latest)
@@ -273,19 +757,9 @@ class RegistryClient:
         Returns:
             Download URL or None
         """
-        try:
-            params = {}
-            if version:
-                params["version"] = version
-            
-            response = await self.http_client.get(
-                f"{self.registry_url}/api/agents/{agent_id}/download",
-                params=params,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("download_url")
-        
-        except Exception as e:
-            logger.error(f"Failed to get download URL: {e}")
-            return None
+        data = await self._cached_get(
+            ("download_url", agent_id, version),
+            self._download_url(agent_id),
+            params={"version": version} if version else None,
+        )
+        return data.get("download_url")
@@ -0,0 +1,282 @@
+"""
+Streaming Pipes
+
+Bridges between asyncio byte streams and blocking file objects, so archive
+work can run in a worker thread while bytes are still arriving or leaving.
+"""
+
+import asyncio
+import io
+import queue
+from typing import Optional
+
+# Size of each chunk pulled from an HTTP response
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Chunks buffered between producer and consumer before the producer waits
+PIPE_MAX_CHUNKS = 16
+
+_EOF = object()
+
+
+class ChunkPipe(io.RawIOBase):
+    """
+    Read-only file object fed with chunks from an asyncio producer.
+
+    The event loop side calls ``put`` and ``finish``; a worker thread reads
+    it like a regular binary file (e.g. ``tarfile.open(fileobj=pipe,
+    mode="r|gz")``) and closes it when done. The internal queue is bounded,
+    so a slow consumer applies backpressure to the producer.
+
+    Example:
+        ```python
+        pipe = ChunkPipe()
+        loop = asyncio.get_running_loop()
+        consumer = loop.run_in_executor(None, consume, pipe)
+
+        async for chunk in response.aiter_bytes():
+            await pipe.put(chunk)
+        await pipe.finish()
+        await consumer
+        ```
+    """
+
+    def __init__(self, max_chunks: int = PIPE_MAX_CHUNKS):
+        """
+        Initialize pipe.
+
+        Args:
+            max_chunks: Maximum number of chunks buffered in the pipe
+        """
+        super().__init__()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        """Pipe is readable."""
+        return True
+
+    def readinto(self, b) -> int:
+        """
+        Read bytes into a pre-allocated buffer, blocking until data arrives.
+
+        Args:
+            b: Writable buffer
+
+        Returns:
+            Number of bytes read (0 at end of stream)
+        """
+        while not self._buffer:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is _EOF:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            else:
+                self._buffer = memoryview(item)
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        """Close the reader side and unblock a producer waiting on a full pipe."""
+        super().close()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    async def put(self, chunk: bytes) -> None:
+        """
+        Hand a chunk to the reader, waiting if the pipe is full.
+
+        Args:
+            chunk: Bytes to append to the stream
+
+        Raises:
+            BrokenPipeError: If the reader has already closed the pipe
+        """
+        await self._put(chunk)
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        """
+        Signal the end of the stream to the reader.
+
+        Args:
+            error: Exception to raise in the reader instead of a clean EOF
+        """
+        await self._put(_EOF if error is None else error)
+
+    def abort(self, error: Optional[BaseException] = None) -> None:
+        """
+        End the stream without waiting, dropping queued chunks if full.
+
+        Safe to call from cancellation handlers: it never blocks, so a
+        reader waiting for data is released even if the producer is gone.
+
+        Args:
+            error: Exception to raise in the reader instead of a clean EOF
+        """
+        item = _EOF if error is None else error
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    async def _put(self, item) -> None:
+        """Put an item on the queue without blocking the event loop."""
+        if self.closed:
+            if item is _EOF or isinstance(item, BaseException):
+                return
+            raise BrokenPipeError("Reader closed the pipe")
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._queue.put, item)
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Write-only file object drained as chunks by an asyncio consumer.
+
+    The mirror image of ``ChunkPipe``: a worker thread writes to it like a
+    regular binary file (e.g. ``tarfile.open(fileobj=sink, mode="w|gz")``)
+    and closes it when done, while the event loop iterates it with
+    ``async for``. Small writes are coalesced into ``chunk_size`` chunks and
+    the bounded queue makes a slow consumer apply backpressure to the writer.
+
+    Example:
+        ```python
+        sink = ChunkSink()
+        loop = asyncio.get_running_loop()
+        producer = loop.run_in_executor(None, produce, sink)
+
+        async for chunk in sink:
+            await upload(chunk)
+        await producer
+        ```
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        max_chunks: int = PIPE_MAX_CHUNKS,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            chunk_size: Size of chunks handed to the consumer
+            max_chunks: Maximum number of chunks buffered in the sink
+        """
+        super().__init__()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self._pending = bytearray()
+        self._chunk_size = chunk_size
+        self._aborted = False
+
+    def writable(self) -> bool:
+        """Sink is writable."""
+        return True
+
+    def write(self, b) -> int:
+        """
+        Buffer bytes, handing full chunks to the consumer.
+
+        Args:
+            b: Bytes-like object
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            BrokenPipeError: If the consumer has aborted
+        """
+        if self._aborted:
+            raise BrokenPipeError("Consumer aborted the stream")
+        self._pending += b
+        if len(self._pending) >= self._chunk_size:
+            self._queue.put(bytes(self._pending))
+            self._pending.clear()
+        return len(b)
+
+    def close(self) -> None:
+        """Flush buffered bytes and signal the end of the stream."""
+        if self.closed:
+            return
+        super().close()
+        if self._aborted:
+            return
+        if self._pending:
+            self._queue.put(bytes(self._pending))
+            self._pending.clear()
+        self._queue.put(_EOF)
+
+    def fail(self, error: BaseException) -> None:
+        """
+        End the stream with an error raised in the consumer.
+
+        Args:
+            error: Exception to raise from the async iterator
+        """
+        super().close()
+        if not self._aborted:
+            self._queue.put(error)
+
+    def abort(self) -> None:
+        """
+        Stop consuming, unblocking a writer waiting on a full sink and a
+        reader thread left waiting by a cancelled ``__anext__``.
+        """
+        self._aborted = True
+        while True:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._queue.put_nowait(_EOF)
+                return
+            except queue.Full:
+                continue
+
+    def __aiter__(self):
+        """Iterate over written chunks."""
+        return self
+
+    async def __anext__(self) -> bytes:
+        """
+        Wait for the next chunk without blocking the event loop.
+
+        Returns:
+            Next chunk of written bytes
+
+        Raises:
+            StopAsyncIteration: At end of stream
+        """
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            loop = asyncio.get_running_loop()
+            item = await loop.run_in_executor(None, self._queue.get)
+        if item is _EOF:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
@@ -4,11 +4,24 @@ Version Management
 Provides semantic versioning support for agent marketplace.
 """
 
+import functools
 import logging
-from typing import List, Optional, Tuple
+import operator
+import re
+from typing import Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Distinct version strings whose parse results/instances are kept
+VERSION_CACHE_SIZE = 65536
+
+# [v]MAJOR.MINOR.PATCH[-PRE_RELEASE][+BUILD]
+_SEMVER = re.compile(
+    r"v?(\d+)\.(\d+)\.(\d+)"
+    r"(?:-([0-9A-Za-z.-]+))?"
+    r"(?:\+([0-9A-Za-z.-]+))?\Z"
+)
+
 
 class Version:
     """
@@ -18,16 +31,21 @@ class Version:
     - MAJOR.MINOR.PATCH format
     - Optional pre-release and build metadata
     
+    Parsing is memoized per version string. ``Version.get`` additionally
+    returns a shared instance per string, so treat instances as immutable.
+    
     Example:
         ```python
         v1 = Version("1.2.3")
-        v2 = Version("1.2.4")
+        v2 = Version.get("1.2.4")
         
         assert v2 > v1
         assert v1.is_compatible_with(v2)
         ```
     """
     
+    __slots__ = ("original", "major", "minor", "patch", "pre_release", "build", "_key")
+    
     def __init__(self, version_str: str):
         """
         Initialize version from string.
@@ -37,39 +55,41 @@ class Version:
         """
         self.original = version_str
         self.major, self.minor, self.patch, self.pre_release, self.build = (
-            self._parse(version_str)
+            _parse_cached(version_str)
+        )
+        # Precedence key: pre-releases sort before the release, then by
+        # their integer-coded identifiers
+        self._key = (
+            self.major,
+            self.minor,
+            self.patch,
+            0 if self.pre_release else 1,
+            _prerelease_key(self.pre_release),
         )
     
+    @classmethod
+    @functools.lru_cache(maxsize=VERSION_CACHE_SIZE)
+    def get(cls, version_str: str) -> "Version":
+        """
+        Get a shared, cached Version for a string.
+        
+        Args:
+            version_str: Version string
+            
+        Returns:
+            Version object (the same instance for repeated strings)
+        """
+        return cls(version_str)
+    
     @staticmethod
     def _parse(version_str: str) -> Tuple[int, int, int, str, str]:
         """Parse version string into components."""
-        # Remove 'v' prefix if present
-        if version_str.startswith("v"):
-            version_str = version_str[1:]
-        
-        # Split by '+' for build metadata
-        parts = version_str.split("+")
-        version_part = parts[0]
-        build = parts[1] if len(parts) > 1 else ""
-        
-        # Split by '-' for pre-release
-        parts = version_part.split("-")
-        core_version = parts[0]
-        pre_release = parts[1] if len(parts) > 1 else ""
-        
-        # Parse major.minor.patch
-        version_numbers = core_version.split(".")
-        if len(version_numbers) != 3:
+        match = _SEMVER.match(version_str)
+        if match is None:
             raise ValueError(f"Invalid version format: {version_str}. Expected: X.Y.Z")
         
-        try:
-            major = int(version_numbers[0])
-            minor = int(version_numbers[1])
-            patch = int(version_numbers[2])
-        except ValueError:
-            raise ValueError(f"Invalid version format: {version_str}. Expected integers")
-        
-        return major, minor, patch, pre_release, build
+        major, minor, patch, pre_release, build = match.groups()
+        return int(major), int(minor), int(patch), pre_release or "", build or ""
     
     def __str__(self) -> str:
         """String representation."""
@@ -84,53 +104,56 @@ class Version:
         """Debug representation."""
         return f"Version('{self}')"
     
+    @staticmethod
+    def _coerce(other) -> Optional["Version"]:
+        """Convert a comparison operand to a Version, or None if unsupported."""
+        if isinstance(other, Version):
+            return other
+        if isinstance(other, str):
+            try:
+                return Version.get(other)
+            except ValueError:
+                return None
+        return None
+    
     def __eq__(self, other) -> bool:
-        """Equality comparison."""
-        if not isinstance(other, Version):
-            other = Version(str(other))
-        return (
-            self.major == other.major
-            and self.minor == other.minor
-            and self.patch == other.patch
-            and self.pre_release == other.pre_release
-        )
+        """Equality comparison (build metadata is ignored)."""
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._key == other._key
+    
+    def __hash__(self) -> int:
+        """Hash consistent with equality."""
+        return hash(self._key)
     
     def __lt__(self, other) -> bool:
         """Less than comparison."""
-        if not isinstance(other, Version):
-            other = Version(str(other))
-        
-        # Compare major.minor.patch
-        if self.major != other.major:
-            return self.major < other.major
-        if self.minor != other.minor:
-            return self.minor < other.minor
-        if self.patch != other.patch:
-            return self.patch < other.patch
-        
-        # Pre-release versions have lower precedence
-        if self.pre_release and not other.pre_release:
-            return True
-        if not self.pre_release and other.pre_release:
-            return False
-        
-        # Compare pre-release versions lexicographically
-        if self.pre_release and other.pre_release:
-            return self.pre_release < other.pre_release
-        
-        return False
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._key < other._key
     
     def __le__(self, other) -> bool:
         """Less than or equal comparison."""
-        return self < other or self == other
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._key <= other._key
     
     def __gt__(self, other) -> bool:
         """Greater than comparison."""
-        return not self <= other
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._key > other._key
     
     def __ge__(self, other) -> bool:
         """Greater than or equal comparison."""
-        return not self < other
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._key >= other._key
     
     def is_compatible_with(self, other: "Version") -> bool:
         """
@@ -164,6 +187,33 @@ class Version:
         return Version(f"{self.major}.{self.minor}.{self.patch + 1}")
 
 
+@functools.lru_cache(maxsize=VERSION_CACHE_SIZE)
+def _parse_cached(version_str: str) -> Tuple[int, int, int, str, str]:
+    """Parse a version string once per process."""
+    return Version._parse(version_str)
+
+
+@functools.lru_cache(maxsize=VERSION_CACHE_SIZE)
+def _prerelease_key(pre_release: str) -> Tuple[Tuple[int, Any], ...]:
+    """
+    Encode pre-release identifiers for precedence comparison.
+    
+    Per semver, numeric identifiers compare numerically and sort before
+    alphanumeric ones, and a longer list of identifiers sorts after its
+    prefix (e.g. rc.2 < rc.10 < rc.10.1 < rc.beta).
+    """
+    if not pre_release:
+        return ()
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part)
+        for part in pre_release.split(".")
+    )
+
+
+# Sort key that orders Versions without calling __lt__
+SORT_KEY = operator.attrgetter("_key")
+
+
 class VersionManager:
     """
     Manages version resolution and compatibility checking.
@@ -194,7 +244,7 @@ class VersionManager:
         Returns:
             Version object
         """
-        return Version(version_str)
+        return Version.get(version_str)
     
     @staticmethod
     def find_latest(versions: List[str]) -> Optional[str]:
@@ -210,8 +260,7 @@ class VersionManager:
         if not versions:
             return None
         
-        version_objs = [Version(v) for v in versions]
-        latest = max(version_objs)
+        latest = max(map(Version.get, versions), key=SORT_KEY)
         return str(latest)
     
     @staticmethod
@@ -232,16 +281,24 @@ class VersionManager:
         if not versions:
             return None
         
-        base = Version(base_version)
-        compatible_versions = [
-            Version(v) for v in versions if base.is_compatible_with(Version(v))
-        ]
+        base = Version.get(base_version)
         
-        if not compatible_versions:
-            return None
+        # Cheap string prefilter so incompatible versions are never parsed
+        if base.major > 0:
+            prefix = f"{base.major}."
+        else:
+            prefix = f"0.{base.minor}."
+        candidates = (
+            v for v in versions
+            if v.startswith(prefix) or v.startswith("v" + prefix)
+        )
         
-        latest = max(compatible_versions)
-        return str(latest)
+        latest = max(
+            (v for v in map(Version.get, candidates) if base.is_compatible_with(v)),
+            key=SORT_KEY,
+            default=None,
+        )
+        return str(latest) if latest is not None else None
     
     @staticmethod
     def is_compatible(version1: str, version2: str) -> bool:
@@ -255,8 +312,8 @@ class VersionManager:
         Returns:
             True if compatible
         """
-        v1 = Version(version1)
-        v2 = Version(version2)
+        v1 = Version.get(version1)
+        v2 = Version.get(version2)
         return v1.is_compatible_with(v2)
     
     @staticmethod
@@ -271,9 +328,8 @@ class VersionManager:
         Returns:
             Sorted list of version strings
         """
-        version_objs = [Version(v) for v in versions]
-        sorted_objs = sorted(version_objs, reverse=reverse)
-        return [str(v) for v in sorted_objs]
+        sorted_objs = sorted(map(Version.get, versions), key=SORT_KEY, reverse=reverse)
+        return list(map(str, sorted_objs))
     
     @staticmethod
     def get_upgrade_path(
@@ -295,19 +351,23 @@ class VersionManager:
         Returns:
             List of versions in upgrade path (including target)
         """
-        from_ver = Version(from_version)
-        to_ver = Version(to_version)
+        from_ver = Version.get(from_version)
+        to_ver = Version.get(to_version)
         
         if from_ver >= to_ver:
             return []  # Already at or beyond target version
         
-        # Get all versions between from and to
-        all_versions = [Version(v) for v in available_versions]
-        intermediate = [
-            v for v in all_versions if from_ver < v <= to_ver
-        ]
-        
-        # Sort in ascending order
-        intermediate.sort()
+        # Only parse versions whose major is in range, then keep those
+        # between from and to (compared by key, without dunder dispatch)
+        majors = range(from_ver.major, to_ver.major + 1)
+        from_key, to_key = from_ver._key, to_ver._key
+        candidates = (
+            v for v in available_versions
+            if int(v.lstrip("v").partition(".")[0]) in majors
+        )
+        intermediate = sorted(
+            (v for v in map(Version.get, candidates) if from_key < v._key <= to_key),
+            key=SORT_KEY,
+        )
         
         return [str(v) for v in intermediate]
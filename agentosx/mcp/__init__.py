@@ -3,19 +3,55 @@ MCP (Model Context Protocol) Integration Layer.
 
 Provides both server and client implementations for the MCP protocol,
 enabling agentOSX agents to expose tools and consume external MCP services.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+this package does not load the server, client or transports until used.
 """
 
-from .protocol import (
-    MCPMessage,
-    MCPRequest,
-    MCPResponse,
-    MCPNotification,
-    MCPError,
-    MCPProtocol,
-    ErrorCode,
-)
-from .server import MCPServer
-from .client import MCPClient
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from .protocol import (
+        MCPMessage,
+        MCPRequest,
+        MCPResponse,
+        MCPNotification,
+        MCPError,
+        MCPProtocol,
+        ErrorCode,
+    )
+    from .server import MCPServer
+    from .client import MCPClient
+
+# Public name -> (submodule, attribute)
+_LAZY: Dict[str, Tuple[str, str]] = {
+    "MCPMessage": (".protocol", "MCPMessage"),
+    "MCPRequest": (".protocol", "MCPRequest"),
+    "MCPResponse": (".protocol", "MCPResponse"),
+    "MCPNotification": (".protocol", "MCPNotification"),
+    "MCPError": (".protocol", "MCPError"),
+    "MCPProtocol": (".protocol", "MCPProtocol"),
+    "ErrorCode": (".protocol", "ErrorCode"),
+    "MCPServer": (".server", "MCPServer"),
+    "MCPClient": (".client", "MCPClient"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "MCPMessage",
@@ -7,8 +7,11 @@ Connects to external MCP servers and dynamically discovers/registers tools.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
-from typing import Any, Callable, Dict, List, Optional
+import operator
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from .protocol import (
     MCPRequest,
@@ -21,9 +24,22 @@ from .protocol import (
     ErrorCode,
 )
 from .transport.base import Transport
+from ..serialization import dumps_str, loads
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a response to a request
+REQUEST_TIMEOUT = 30.0
+
+# Low bits of a request ID hold its pending-request slot; the high bits hold
+# a sequence number so recycled slots never reuse an ID
+SLOT_BITS = 20
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+# Required fields of discovered definitions, extracted in one C-level call
+_TOOL_FIELDS = operator.itemgetter("name", "description", "inputSchema")
+_RESOURCE_FIELDS = operator.itemgetter("uri", "name")
+
 
 class MCPClient:
     """
@@ -33,15 +49,27 @@ class MCPClient:
     and provides methods to call them.
     """
     
+    # Request bodies for frequent RPCs; only the id (and params) vary
+    _TOOLS_LIST = {"jsonrpc": "2.0", "method": "tools/list"}
+    _RESOURCES_LIST = {"jsonrpc": "2.0", "method": "resources/list"}
+    _PROMPTS_LIST = {"jsonrpc": "2.0", "method": "prompts/list"}
+    _TOOLS_CALL = {"jsonrpc": "2.0", "method": "tools/call"}
+    _RESOURCES_READ = {"jsonrpc": "2.0", "method": "resources/read"}
+    _PROMPTS_GET = {"jsonrpc": "2.0", "method": "prompts/get"}
+    
     def __init__(
         self,
         capabilities: Optional[MCPCapabilities] = None,
+        batch: bool = False,
     ):
         """
         Initialize MCP client.
         
         Args:
             capabilities: Client capabilities
+            batch: Coalesce requests issued in the same event loop iteration
+                   (e.g. via asyncio.gather) into one JSON-RPC batch write.
+                   The server must support batches.
         """
         self.capabilities = capabilities or MCPCapabilities(
             tools=True,
@@ -61,15 +89,37 @@ class MCPClient:
         self._resources: Dict[str, ResourceDefinition] = {}
         self._prompts: Dict[str, PromptDefinition] = {}
         
-        # Pending requests
-        self._pending_requests: Dict[str, asyncio.Future] = {}
+        # Pending requests, stored in recycled list slots indexed by the low
+        # bits of the request ID (see _next_id)
+        self._pending: List[Optional[asyncio.Future]] = []
+        self._pending_ids: List[int] = []
+        self._free_slots: List[int] = []
         self._request_counter = 0
         
+        # (deadline, request ID) heap watched by one sweeper task, instead
+        # of a wait_for timer per request
+        self._timeout_heap: List[Tuple[float, int]] = []
+        self._timeout_task: Optional[asyncio.Task] = None
+        self._timeout_wakeup: Optional[asyncio.Event] = None
+        
+        # Requests waiting for the next batch write, as (request ID, JSON)
+        self.batch = batch
+        self._batch_buffer: List[Tuple[int, str]] = []
+        self._batch_scheduled = False
+        
         # Connection state
         self._connected = False
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 5
         self._reconnect_delay = 1.0  # exponential backoff
+        self._max_reconnect_delay = 60.0
+        
+        # Reconnection runs in one supervisor task, woken by the event;
+        # callers wait on the shared result of the current cycle
+        self._supervisor: Optional[asyncio.Task] = None
+        self._reconnect_event: Optional[asyncio.Event] = None
+        self._reconnect_result: Optional[asyncio.Future] = None
+        self._reconnect_discover = True
     
     async def connect(self, transport: Transport, auto_discover: bool = True):
         """
@@ -81,28 +131,31 @@ class MCPClient:
         """
         self.transport = transport
         
-        logger.info("Connecting to MCP server...")
-        
         try:
-            # Start transport
-            await transport.start(self._handle_message)
-            
-            # Initialize handshake
-            await self._initialize()
-            
-            # Auto-discover if enabled
-            if auto_discover:
-                await self.discover_all()
-            
-            self._connected = True
-            self._reconnect_attempts = 0
-            
-            logger.info("Connected to MCP server successfully")
-            
+            await self._connect_once(transport, auto_discover)
         except Exception as e:
             logger.error(f"Connection error: {e}", exc_info=True)
-            await self._handle_reconnect()
-            raise
+            if not await self._handle_reconnect(auto_discover):
+                raise
+    
+    async def _connect_once(self, transport: Transport, auto_discover: bool):
+        """Start the transport, initialize and (optionally) discover."""
+        logger.info("Connecting to MCP server...")
+        
+        # Start transport
+        await transport.start(self._handle_message)
+        
+        # Initialize handshake
+        await self._initialize()
+        
+        # Auto-discover if enabled
+        if auto_discover:
+            await self.discover_all()
+        
+        self._connected = True
+        self._reconnect_attempts = 0
+        
+        logger.info("Connected to MCP server successfully")
     
     async def disconnect(self):
         """Disconnect from MCP server."""
@@ -111,34 +164,106 @@ class MCPClient:
         if self.transport:
             await self.transport.stop()
         
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._reconnect_result is not None and not self._reconnect_result.done():
+            self._reconnect_result.set_result(False)
+        
+        if self._timeout_task is not None:
+            self._timeout_task.cancel()
+            self._timeout_task = None
+        self._timeout_heap.clear()
+        self._batch_buffer.clear()
+        
         # Cancel pending requests
-        for future in self._pending_requests.values():
-            if not future.done():
+        for future in self._pending:
+            if future is not None and not future.done():
                 future.cancel()
         
-        self._pending_requests.clear()
+        self._pending.clear()
+        self._pending_ids.clear()
+        self._free_slots.clear()
         
         logger.info("Disconnected from MCP server")
     
-    async def _handle_reconnect(self):
-        """Handle reconnection with exponential backoff."""
-        if self._reconnect_attempts >= self._max_reconnect_attempts:
-            logger.error("Max reconnection attempts reached")
-            return
+    async def _handle_reconnect(self, auto_discover: bool = True) -> bool:
+        """
+        Ask the reconnect supervisor to reconnect and wait for the outcome.
         
-        self._reconnect_attempts += 1
-        delay = self._reconnect_delay * (2 ** (self._reconnect_attempts - 1))
+        Concurrent callers share one reconnection cycle. The wait is
+        shielded, so cancelling a caller does not abort the reconnection.
         
-        logger.info(f"Reconnecting in {delay}s (attempt {self._reconnect_attempts}/{self._max_reconnect_attempts})")
+        Args:
+            auto_discover: Rediscover tools/resources/prompts on reconnect
+            
+        Returns:
+            True if a reconnection attempt succeeded
+        """
+        loop = asyncio.get_running_loop()
+        if self._supervisor is None or self._supervisor.done():
+            self._reconnect_event = asyncio.Event()
+            self._supervisor = loop.create_task(self._supervise())
+        
+        if self._reconnect_result is None or self._reconnect_result.done():
+            self._reconnect_result = loop.create_future()
+            self._reconnect_discover = auto_discover
+        result = self._reconnect_result
+        self._reconnect_event.set()
+        return await asyncio.shield(result)
+    
+    async def _supervise(self):
+        """Run a reconnection cycle each time one is requested."""
+        while True:
+            await self._reconnect_event.wait()
+            self._reconnect_event.clear()
+            
+            try:
+                reconnected = await self._reconnect(self._reconnect_discover)
+            except Exception as e:
+                logger.error(f"Reconnection failed: {e}", exc_info=True)
+                reconnected = False
+            
+            result = self._reconnect_result
+            if result is not None and not result.done():
+                result.set_result(reconnected)
+    
+    async def _reconnect(self, auto_discover: bool) -> bool:
+        """
+        Retry connecting with capped exponential backoff.
         
-        await asyncio.sleep(delay)
+        Delays use full jitter (uniform between zero and the backoff), so
+        clients dropped together by a server restart do not all reconnect
+        at the same moments.
         
-        try:
-            if self.transport:
-                await self.connect(self.transport)
-        except Exception as e:
-            logger.error(f"Reconnection failed: {e}")
-            await self._handle_reconnect()
+        Args:
+            auto_discover: Rediscover tools/resources/prompts on reconnect
+            
+        Returns:
+            True if a reconnection attempt succeeded
+        """
+        while self._reconnect_attempts < self._max_reconnect_attempts:
+            self._reconnect_attempts += 1
+            backoff = min(
+                self._max_reconnect_delay,
+                self._reconnect_delay * (2 ** (self._reconnect_attempts - 1)),
+            )
+            delay = random.uniform(0, backoff)
+            
+            logger.info(f"Reconnecting in {delay:.2f}s (attempt {self._reconnect_attempts}/{self._max_reconnect_attempts})")
+            
+            await asyncio.sleep(delay)
+            
+            if not self.transport:
+                return False
+            try:
+                await self._connect_once(self.transport, auto_discover)
+                return True
+            except Exception as e:
+                logger.error(f"Reconnection failed: {e}")
+        
+        logger.error("Max reconnection attempts reached")
+        return False
     
     async def _initialize(self):
         """Perform initialization handshake."""
@@ -151,7 +276,8 @@ class MCPClient:
                     "name": "agentOSX",
                     "version": "0.1.0",
                 }
-            }
+            },
+            id=self._next_id(),
         )
         
         response = await self._send_request(request)
@@ -177,14 +303,14 @@ class MCPClient:
             logger.warning("Server does not support tools")
             return []
         
-        request = MCPRequest(method="tools/list")
-        response = await self._send_request(request)
-        
+        return self._store_tools(await self._send_raw(self._TOOLS_LIST))
+    
+    def _store_tools(self, response: Dict[str, Any]) -> List[ToolDefinition]:
+        """Store the tools from a tools/list result."""
         tools_data = response.get("tools", [])
-        self._tools = {
-            tool_data["name"]: ToolDefinition.from_dict(tool_data)
-            for tool_data in tools_data
-        }
+        make, fields = ToolDefinition, _TOOL_FIELDS
+        tools = [make(*fields(tool_data)) for tool_data in tools_data]
+        self._tools = {tool.name: tool for tool in tools}
         
         logger.info(f"Discovered {len(self._tools)} tools")
         return list(self._tools.values())
@@ -195,14 +321,17 @@ class MCPClient:
             logger.warning("Server does not support resources")
             return []
         
-        request = MCPRequest(method="resources/list")
-        response = await self._send_request(request)
-        
+        return self._store_resources(await self._send_raw(self._RESOURCES_LIST))
+    
+    def _store_resources(self, response: Dict[str, Any]) -> List[ResourceDefinition]:
+        """Store the resources from a resources/list result."""
         resources_data = response.get("resources", [])
-        self._resources = {
-            resource_data["uri"]: ResourceDefinition.from_dict(resource_data)
-            for resource_data in resources_data
-        }
+        make, fields = ResourceDefinition, _RESOURCE_FIELDS
+        resources = [
+            make(*fields(data), data.get("description"), data.get("mimeType"))
+            for data in resources_data
+        ]
+        self._resources = {resource.uri: resource for resource in resources}
         
         logger.info(f"Discovered {len(self._resources)} resources")
         return list(self._resources.values())
@@ -213,26 +342,59 @@ class MCPClient:
             logger.warning("Server does not support prompts")
             return []
         
-        request = MCPRequest(method="prompts/list")
-        response = await self._send_request(request)
-        
+        return self._store_prompts(await self._send_raw(self._PROMPTS_LIST))
+    
+    def _store_prompts(self, response: Dict[str, Any]) -> List[PromptDefinition]:
+        """Store the prompts from a prompts/list result."""
         prompts_data = response.get("prompts", [])
-        self._prompts = {
-            prompt_data["name"]: PromptDefinition.from_dict(prompt_data)
-            for prompt_data in prompts_data
-        }
+        make = PromptDefinition
+        prompts = [
+            make(data["name"], data.get("description"), data.get("arguments"))
+            for data in prompts_data
+        ]
+        self._prompts = {prompt.name: prompt for prompt in prompts}
         
         logger.info(f"Discovered {len(self._prompts)} prompts")
         return list(self._prompts.values())
     
     async def discover_all(self):
-        """Discover all capabilities from the server."""
-        await asyncio.gather(
-            self.discover_tools(),
-            self.discover_resources(),
-            self.discover_prompts(),
-            return_exceptions=True
+        """
+        Discover all capabilities from the server.
+        
+        The list requests for every supported capability are sent together;
+        in batch mode they share one JSON-RPC batch, otherwise they go out
+        as individual requests. Failures are logged and leave that kind
+        undiscovered.
+        """
+        caps = self.server_capabilities
+        kinds = [
+            ("tools", caps.tools if caps else False, self._TOOLS_LIST, self._store_tools),
+            ("resources", caps.resources if caps else False, self._RESOURCES_LIST, self._store_resources),
+            ("prompts", caps.prompts if caps else False, self._PROMPTS_LIST, self._store_prompts),
+        ]
+        
+        templates = []
+        stores = []
+        for kind, supported, template, store in kinds:
+            if not supported:
+                logger.warning(f"Server does not support {kind}")
+                continue
+            templates.append(template)
+            stores.append(store)
+        
+        if not templates:
+            return
+        
+        results = await asyncio.gather(
+            *(self._send_raw(template) for template in templates),
+            return_exceptions=True,
         )
+        
+        for template, store, result in zip(templates, stores, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Discovery failed for {template['method']}: {result}")
+            else:
+                store(result)
     
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """
@@ -248,16 +410,14 @@ class MCPClient:
         if name not in self._tools:
             raise ValueError(f"Tool not found: {name}")
         
-        request = MCPRequest(
-            method="tools/call",
-            params={
+        response = await self._send_raw(
+            self._TOOLS_CALL,
+            {
                 "name": name,
                 "arguments": arguments
-            }
+            },
         )
         
-        response = await self._send_request(request)
-        
         # Extract text from content
         content = response.get("content", [])
         if content and len(content) > 0:
@@ -278,12 +438,7 @@ class MCPClient:
         if uri not in self._resources:
             raise ValueError(f"Resource not found: {uri}")
         
-        request = MCPRequest(
-            method="resources/read",
-            params={"uri": uri}
-        )
-        
-        response = await self._send_request(request)
+        response = await self._send_raw(self._RESOURCES_READ, {"uri": uri})
         
         contents = response.get("contents", [])
         if contents and len(contents) > 0:
@@ -305,16 +460,14 @@ class MCPClient:
         if name not in self._prompts:
             raise ValueError(f"Prompt not found: {name}")
         
-        request = MCPRequest(
-            method="prompts/get",
-            params={
+        response = await self._send_raw(
+            self._PROMPTS_GET,
+            {
                 "name": name,
                 "arguments": arguments or {}
-            }
+            },
         )
         
-        response = await self._send_request(request)
-        
         messages = response.get("messages", [])
         if messages and len(messages) > 0:
             content = messages[0].get("content", {})
@@ -334,12 +487,96 @@ class MCPClient:
         """Get list of discovered prompts."""
         return list(self._prompts.values())
     
+    def _next_id(self) -> int:
+        """
+        Allocate a pending-request slot and get the JSON-RPC request ID for it.
+        
+        IDs are integers of the form ``sequence << SLOT_BITS | slot``: unique
+        per client like a plain counter, but resolving to their future with
+        a list index instead of a dict lookup. The slot is reserved until the
+        request is released.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._pending)
+            if slot > SLOT_MASK:
+                raise RuntimeError("Too many pending requests")
+            self._pending.append(None)
+            self._pending_ids.append(0)
+        
+        self._request_counter += 1
+        request_id = (self._request_counter << SLOT_BITS) | slot
+        self._pending_ids[slot] = request_id
+        return request_id
+    
+    def _pending_future(self, request_id: Any) -> Optional[asyncio.Future]:
+        """Get the future waiting on a request ID, if it is still pending."""
+        if type(request_id) is not int:
+            return None
+        slot = request_id & SLOT_MASK
+        if slot < len(self._pending_ids) and self._pending_ids[slot] == request_id:
+            return self._pending[slot]
+        return None
+    
+    def _release_request(self, request_id: int):
+        """Drop a request's future and recycle its slot."""
+        slot = request_id & SLOT_MASK
+        if slot < len(self._pending_ids) and self._pending_ids[slot] == request_id:
+            self._pending[slot] = None
+            self._pending_ids[slot] = 0
+            self._free_slots.append(slot)
+    
+    def _register_request(self, request_id: int) -> asyncio.Future:
+        """Create the response future for a request and schedule its timeout."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[request_id & SLOT_MASK] = future
+        
+        if self._timeout_task is None or self._timeout_task.done():
+            self._timeout_wakeup = asyncio.Event()
+            self._timeout_task = loop.create_task(self._sweep_timeouts())
+        if not self._timeout_heap:
+            self._timeout_wakeup.set()
+        heapq.heappush(self._timeout_heap, (loop.time() + REQUEST_TIMEOUT, request_id))
+        return future
+    
+    async def _sweep_timeouts(self):
+        """Fail requests whose deadline has passed without a response."""
+        loop = asyncio.get_running_loop()
+        heap = self._timeout_heap
+        while True:
+            if not heap:
+                self._timeout_wakeup.clear()
+                await self._timeout_wakeup.wait()
+                continue
+            
+            deadline, request_id = heap[0]
+            future = self._pending_future(request_id)
+            if future is None or future.done():
+                # Answered (or failed) already: drop the entry without
+                # sleeping until its deadline
+                heapq.heappop(heap)
+                continue
+            
+            delay = deadline - loop.time()
+            if delay > 0:
+                # Deadlines are pushed in order, so nothing new is due sooner
+                await asyncio.sleep(delay)
+                continue
+            
+            heapq.heappop(heap)
+            if not future.done():
+                future.set_exception(
+                    asyncio.TimeoutError(f"No response within {REQUEST_TIMEOUT}s")
+                )
+    
     async def _send_request(self, request: MCPRequest) -> Any:
         """
         Send request and wait for response.
         
         Args:
-            request: MCP request
+            request: MCP request (its id must come from _next_id)
             
         Returns:
             Response result
@@ -347,32 +584,84 @@ class MCPClient:
         Raises:
             Exception: If request fails
         """
+        return await self._send_payload(request.id, request.to_dict())
+    
+    async def _send_raw(
+        self,
+        template: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Send a request built from a prebuilt body and wait for the response.
+        
+        Args:
+            template: Request body without id/params (e.g. _TOOLS_LIST)
+            params: Request params
+            
+        Returns:
+            Response result
+        """
+        payload = dict(template, id=self._next_id())
+        if params is not None:
+            payload["params"] = params
+        return await self._send_payload(payload["id"], payload)
+    
+    async def _send_payload(self, request_id: int, payload: Dict[str, Any]) -> Any:
+        """Send a JSON-RPC request body and wait for its result."""
         if not self.transport:
+            # The ID's slot was reserved by _next_id; give it back
+            self._release_request(request_id)
             raise RuntimeError("Not connected to server")
         
-        # Create future for response
-        future = asyncio.Future()
-        self._pending_requests[request.id] = future
+        # Create future for response (failed by the sweeper on timeout)
+        future = self._register_request(request_id)
         
         try:
-            # Send request
-            message = MCPProtocol.serialize_message(request)
-            await self.transport.send(message)
-            
-            # Wait for response with timeout
-            response = await asyncio.wait_for(future, timeout=30.0)
+            # Send request (or queue it for the next batch write)
+            if self.batch:
+                self._batch_buffer.append((request_id, dumps_str(payload)))
+                if not self._batch_scheduled:
+                    self._batch_scheduled = True
+                    asyncio.get_running_loop().create_task(self._flush_batch())
+            else:
+                await self.transport.send(dumps_str(payload))
             
-            return response
+            return await future
             
         except asyncio.TimeoutError:
-            logger.error(f"Request timeout: {request.method}")
+            logger.error(f"Request timeout: {payload['method']}")
             raise
         finally:
             # Clean up
-            if request.id in self._pending_requests:
-                del self._pending_requests[request.id]
+            self._release_request(request_id)
     
-    async def _handle_message(self, raw_message: str):
+    async def _flush_batch(self):
+        """
+        Write all queued requests in a single transport send.
+        
+        Runs as a task created by the first queued request, so requests
+        issued before it starts (in the same loop iteration) share the write.
+        A single queued request is sent on its own, not as a batch.
+        """
+        self._batch_scheduled = False
+        queued, self._batch_buffer = self._batch_buffer, []
+        if not queued:
+            return
+        
+        if len(queued) == 1:
+            message = queued[0][1]
+        else:
+            message = "[" + ",".join(json for _, json in queued) + "]"
+        
+        try:
+            await self.transport.send(message)
+        except Exception as e:
+            for request_id, _ in queued:
+                future = self._pending_future(request_id)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+    
+    async def _handle_message(self, raw_message: Union[str, bytes, memoryview]):
         """
         Handle incoming MCP message.
         
@@ -380,10 +669,25 @@ class MCPClient:
             raw_message: Raw JSON-RPC message
         """
         try:
-            message = MCPProtocol.parse_message(raw_message)
+            data = loads(raw_message)
+            if isinstance(data, list):
+                if not data:
+                    raise ValueError("Batch must be a non-empty array")
+                items = data
+            else:
+                items = (data,)
             
-            if isinstance(message, MCPResponse):
-                await self._handle_response(message)
+            for item in items:
+                # Drop responses nobody is waiting for (e.g. stale replies
+                # after a reconnect) before building message objects
+                if isinstance(item, dict) and "method" not in item:
+                    if self._pending_future(item.get("id")) is None:
+                        logger.warning(f"Received response for unknown request: {item.get('id')}")
+                        continue
+                
+                message = MCPProtocol.parse_message(item)
+                if isinstance(message, MCPResponse):
+                    await self._handle_response(message)
             
         except Exception as e:
             logger.error(f"Error handling message: {e}", exc_info=True)
@@ -392,11 +696,12 @@ class MCPClient:
         """Handle response message."""
         request_id = response.id
         
-        if request_id not in self._pending_requests:
+        future = self._pending_future(request_id)
+        if future is None:
             logger.warning(f"Received response for unknown request: {request_id}")
             return
-        
-        future = self._pending_requests[request_id]
+        if future.done():
+            return
         
         if response.error:
             error_message = f"{response.error.message} (code: {response.error.code})"
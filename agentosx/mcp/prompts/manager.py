@@ -4,14 +4,72 @@ MCP Prompt Manager.
 Manages prompt templates with dynamic variable substitution.
 """
 
+import functools
 import logging
-from typing import Any, Dict, List, Optional
 import re
+from typing import Any, Callable, Dict, List, Optional
 
 from ..protocol import PromptDefinition
 
 logger = logging.getLogger(__name__)
 
+# {{variable}} placeholder in prompt templates
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+# Distinct ad-hoc templates whose compiled renderers are kept
+TEMPLATE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compile a template into a renderer function.
+    
+    The template is split once into alternating literal and placeholder
+    segments; rendering fills the placeholder slots and joins, without
+    rescanning the template.
+    
+    Args:
+        template: Template string with {{variable}} placeholders
+        
+    Returns:
+        Function taking variable values and returning the rendered text
+    """
+    segments = PLACEHOLDER_PATTERN.split(template)
+    if len(segments) == 1:
+        return lambda variables: template
+    
+    # (segment index, variable name, placeholder text kept when unset)
+    slots = [
+        (index, segments[index], "{{" + segments[index] + "}}")
+        for index in range(1, len(segments), 2)
+    ]
+    
+    def render(variables: Dict[str, Any]) -> str:
+        parts = segments.copy()
+        for index, name, placeholder in slots:
+            parts[index] = str(variables[name]) if name in variables else placeholder
+        return "".join(parts)
+    
+    return render
+
+
+def render_template(template: str, variables: Dict[str, Any]) -> str:
+    """
+    Substitute {{variable}} placeholders in a single pass.
+    
+    Placeholders without a value are left as they are, and substituted
+    values are never themselves re-substituted.
+    
+    Args:
+        template: Template string
+        variables: Variable values
+        
+    Returns:
+        Rendered text
+    """
+    return compile_template(template)(variables)
+
 
 class PromptManager:
     """
@@ -23,6 +81,8 @@ class PromptManager:
     def __init__(self):
         """Initialize prompt manager."""
         self._prompts: Dict[str, Dict[str, Any]] = {}
+        # serialized_prompts() result, rebuilt after (un)registration
+        self._serialized: Optional[List[Dict[str, Any]]] = None
     
     def register_prompt(
         self,
@@ -40,12 +100,22 @@ class PromptManager:
             template: Prompt template string with {{variable}} placeholders
             arguments: List of argument definitions
         """
+        template = template or ""
         self._prompts[name] = {
             "name": name,
             "description": description,
-            "template": template or "",
+            "template": template,
             "arguments": arguments or [],
+            # Placeholders and renderer, prepared once per registration
+            "variables": frozenset(PLACEHOLDER_PATTERN.findall(template)),
+            "render": compile_template(template),
+            "definition": PromptDefinition(
+                name=name,
+                description=description,
+                arguments=arguments or [],
+            ),
         }
+        self._serialized = None
         
         logger.debug(f"Registered prompt: {name}")
     
@@ -53,6 +123,7 @@ class PromptManager:
         """Unregister a prompt template."""
         if name in self._prompts:
             del self._prompts[name]
+            self._serialized = None
             logger.debug(f"Unregistered prompt: {name}")
     
     def list_prompts(self) -> List[PromptDefinition]:
@@ -62,14 +133,23 @@ class PromptManager:
         Returns:
             List of prompt definitions
         """
-        return [
-            PromptDefinition(
-                name=prompt["name"],
-                description=prompt["description"],
-                arguments=prompt["arguments"],
-            )
-            for prompt in self._prompts.values()
-        ]
+        return [prompt["definition"] for prompt in self._prompts.values()]
+    
+    def serialized_prompts(self) -> List[Dict[str, Any]]:
+        """
+        Get all registered prompts as protocol dicts (for prompts/list).
+        
+        The list is cached until the next (un)registration and shared
+        between calls, so callers must not modify it.
+        
+        Returns:
+            List of prompt definition dicts
+        """
+        if self._serialized is None:
+            self._serialized = [
+                prompt["definition"].to_dict() for prompt in self._prompts.values()
+            ]
+        return self._serialized
     
     async def get_prompt(self, name: str, arguments: Dict[str, Any]) -> str:
         """
@@ -89,17 +169,14 @@ class PromptManager:
             raise ValueError(f"Prompt not found: {name}")
         
         prompt = self._prompts[name]
-        template = prompt["template"]
-        
-        # Simple variable substitution
-        rendered = template
-        for key, value in arguments.items():
-            placeholder = f"{{{{{key}}}}}"
-            rendered = rendered.replace(placeholder, str(value))
+        variables = prompt["variables"]
+        if not variables:
+            return prompt["template"]
         
-        # Check for any remaining unsubstituted variables
-        remaining = re.findall(r"\{\{(\w+)\}\}", rendered)
-        if remaining:
-            logger.warning(f"Unsubstituted variables in prompt '{name}': {remaining}")
+        missing = variables - arguments.keys()
+        if missing:
+            logger.warning(
+                f"Unsubstituted variables in prompt '{name}': {sorted(missing)}"
+            )
         
-        return rendered
+        return prompt["render"](arguments)
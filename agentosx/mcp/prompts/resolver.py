@@ -7,6 +7,8 @@ Resolves and composes complex prompt templates.
 import logging
 from typing import Dict, Any, List
 
+from .manager import render_template
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,11 +48,4 @@ class PromptResolver:
         Returns:
             Resolved template
         """
-        result = template
-        
-        # Replace variables
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            result = result.replace(placeholder, str(value))
-        
-        return result
+        return render_template(template, variables)
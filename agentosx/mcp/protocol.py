@@ -7,13 +7,14 @@ tool and resource sharing between agents and MCP servers.
 
 from __future__ import annotations
 
-import json
 import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union, Literal
 
+from ..serialization import dumps, dumps_str, loads
+
 
 class ErrorCode(Enum):
     """Standard JSON-RPC 2.0 and MCP-specific error codes."""
@@ -35,23 +36,84 @@ class ErrorCode(Enum):
     RATE_LIMIT_EXCEEDED = -32008
 
 
-@dataclass
+# Capability flags packed into MCPCapabilities._mask
+CAP_TOOLS = 1
+CAP_RESOURCES = 2
+CAP_PROMPTS = 4
+CAP_STREAMING = 8
+
+
+@dataclass(frozen=True)
 class MCPCapabilities:
-    """MCP server/client capabilities."""
+    """MCP server/client capabilities (immutable; its dict is built once)."""
     tools: bool = False
     resources: bool = False
     prompts: bool = False
     streaming: bool = False
     version: str = "1.0.0"
     
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "_mask",
+            (CAP_TOOLS if self.tools else 0)
+            | (CAP_RESOURCES if self.resources else 0)
+            | (CAP_PROMPTS if self.prompts else 0)
+            | (CAP_STREAMING if self.streaming else 0),
+        )
+        object.__setattr__(self, "_dict", {
+            "tools": self.tools,
+            "resources": self.resources,
+            "prompts": self.prompts,
+            "streaming": self.streaming,
+            "version": self.version,
+        })
+    
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Copy, so callers cannot change the instance's cached dict
+        return dict(self._dict)
+    
+    @classmethod
+    def from_mask(cls, mask: int, version: str = "1.0.0") -> MCPCapabilities:
+        """Create capabilities from a CAP_* bitmask."""
+        return cls(
+            tools=bool(mask & CAP_TOOLS),
+            resources=bool(mask & CAP_RESOURCES),
+            prompts=bool(mask & CAP_PROMPTS),
+            streaming=bool(mask & CAP_STREAMING),
+            version=version,
+        )
 
 
-@dataclass
 class MCPMessage(ABC):
-    """Base class for all MCP messages."""
-    jsonrpc: str = "2.0"
+    """
+    Base class for all MCP messages.
+    
+    Messages are plain ``__slots__`` classes: they are created for every
+    message sent or received, so they carry no per-instance ``__dict__``.
+    Subclasses list their fields in ``__slots__`` and implement
+    ``to_dict``/``from_dict``.
+    """
+    __slots__ = ("jsonrpc",)
+    
+    def _fields(self) -> List[str]:
+        """Field names, base class first."""
+        return [
+            name
+            for cls in reversed(type(self).__mro__)
+            for name in getattr(cls, "__slots__", ())
+        ]
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+    
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields())
+    
+    __hash__ = None  # mutable, like the dataclasses these replaced
     
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
@@ -65,113 +127,119 @@ class MCPMessage(ABC):
         pass
 
 
-@dataclass
 class MCPRequest(MCPMessage):
     """MCP request message (expects a response)."""
-    method: str = ""
-    params: Optional[Dict[str, Any]] = None
-    id: Optional[Union[str, int]] = None
+    __slots__ = ("method", "params", "id")
     
-    def __post_init__(self):
-        if self.id is None:
-            self.id = str(uuid.uuid4())
+    def __init__(
+        self,
+        method: str = "",
+        params: Optional[Dict[str, Any]] = None,
+        id: Optional[Union[str, int]] = None,
+        jsonrpc: str = "2.0",
+    ):
+        self.jsonrpc = jsonrpc
+        self.method = method
+        self.params = params
+        self.id = str(uuid.uuid4()) if id is None else id
     
     def to_dict(self) -> Dict[str, Any]:
-        data = {
+        if self.params is None:
+            return {"jsonrpc": self.jsonrpc, "method": self.method, "id": self.id}
+        return {
             "jsonrpc": self.jsonrpc,
             "method": self.method,
             "id": self.id,
+            "params": self.params,
         }
-        if self.params is not None:
-            data["params"] = self.params
-        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> MCPRequest:
-        return cls(
-            method=data["method"],
-            params=data.get("params"),
-            id=data.get("id"),
-        )
+        return cls(data["method"], data.get("params"), data.get("id"))
 
 
-@dataclass
 class MCPResponse(MCPMessage):
     """MCP response message."""
-    id: Union[str, int] = ""
-    result: Optional[Any] = None
-    error: Optional[MCPError] = None
+    __slots__ = ("id", "result", "error")
+    
+    def __init__(
+        self,
+        id: Union[str, int] = "",
+        result: Optional[Any] = None,
+        error: Optional[MCPError] = None,
+        jsonrpc: str = "2.0",
+    ):
+        self.jsonrpc = jsonrpc
+        self.id = id
+        self.result = result
+        self.error = error
     
     def to_dict(self) -> Dict[str, Any]:
-        data = {
-            "jsonrpc": self.jsonrpc,
-            "id": self.id,
-        }
         if self.error:
-            data["error"] = self.error.to_dict()
-        else:
-            data["result"] = self.result
-        return data
+            return {"jsonrpc": self.jsonrpc, "id": self.id, "error": self.error.to_dict()}
+        return {"jsonrpc": self.jsonrpc, "id": self.id, "result": self.result}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> MCPResponse:
-        error = None
-        if "error" in data:
-            error = MCPError.from_dict(data["error"])
-        
+        error = data.get("error")
         return cls(
-            id=data["id"],
-            result=data.get("result"),
-            error=error,
+            data.get("id"),
+            data.get("result"),
+            MCPError.from_dict(error) if error is not None else None,
         )
 
 
-@dataclass
 class MCPNotification(MCPMessage):
     """MCP notification message (no response expected)."""
-    method: str = ""
-    params: Optional[Dict[str, Any]] = None
+    __slots__ = ("method", "params")
+    
+    def __init__(
+        self,
+        method: str = "",
+        params: Optional[Dict[str, Any]] = None,
+        jsonrpc: str = "2.0",
+    ):
+        self.jsonrpc = jsonrpc
+        self.method = method
+        self.params = params
     
     def to_dict(self) -> Dict[str, Any]:
-        data = {
-            "jsonrpc": self.jsonrpc,
-            "method": self.method,
-        }
-        if self.params is not None:
-            data["params"] = self.params
-        return data
+        if self.params is None:
+            return {"jsonrpc": self.jsonrpc, "method": self.method}
+        return {"jsonrpc": self.jsonrpc, "method": self.method, "params": self.params}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> MCPNotification:
-        return cls(
-            method=data["method"],
-            params=data.get("params"),
-        )
+        return cls(data["method"], data.get("params"))
 
 
-@dataclass
 class MCPError:
     """MCP error object."""
-    code: int
-    message: str
-    data: Optional[Any] = None
+    __slots__ = ("code", "message", "data")
+    
+    def __init__(self, code: int, message: str, data: Optional[Any] = None):
+        self.code = code
+        self.message = message
+        self.data = data
+    
+    def __repr__(self) -> str:
+        return f"MCPError(code={self.code!r}, message={self.message!r}, data={self.data!r})"
+    
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not MCPError:
+            return NotImplemented
+        return (self.code, self.message, self.data) == (other.code, other.message, other.data)
+    
+    __hash__ = None
     
     def to_dict(self) -> Dict[str, Any]:
-        error_dict = {
-            "code": self.code,
-            "message": self.message,
-        }
-        if self.data is not None:
-            error_dict["data"] = self.data
-        return error_dict
+        if self.data is None:
+            return {"code": self.code, "message": self.message}
+        return {"code": self.code, "message": self.message, "data": self.data}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> MCPError:
-        return cls(
-            code=data["code"],
-            message=data["message"],
-            data=data.get("data"),
-        )
+        return cls(data["code"], data["message"], data.get("data"))
     
     @classmethod
     def from_error_code(cls, error_code: ErrorCode, message: Optional[str] = None, data: Optional[Any] = None) -> MCPError:
@@ -183,19 +251,23 @@ class MCPError:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolDefinition:
-    """MCP tool definition."""
+    """MCP tool definition (immutable; its dict is built once)."""
     name: str
     description: str
     inputSchema: Dict[str, Any]  # JSON Schema
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def __post_init__(self):
+        object.__setattr__(self, "_dict", {
             "name": self.name,
             "description": self.description,
             "inputSchema": self.inputSchema,
-        }
+        })
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Copy, so callers cannot change the instance's cached dict
+        return dict(self._dict)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> ToolDefinition:
@@ -206,15 +278,15 @@ class ToolDefinition:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class ResourceDefinition:
-    """MCP resource definition."""
+    """MCP resource definition (immutable; its dict is built once)."""
     uri: str
     name: str
     description: Optional[str] = None
     mimeType: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
+    def __post_init__(self):
         data = {
             "uri": self.uri,
             "name": self.name,
@@ -223,7 +295,11 @@ class ResourceDefinition:
             data["description"] = self.description
         if self.mimeType:
             data["mimeType"] = self.mimeType
-        return data
+        object.__setattr__(self, "_dict", data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Copy, so callers cannot change the instance's cached dict
+        return dict(self._dict)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> ResourceDefinition:
@@ -235,20 +311,24 @@ class ResourceDefinition:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class PromptDefinition:
-    """MCP prompt template definition."""
+    """MCP prompt template definition (immutable; its dict is built once)."""
     name: str
     description: Optional[str] = None
     arguments: Optional[List[Dict[str, Any]]] = None
     
-    def to_dict(self) -> Dict[str, Any]:
+    def __post_init__(self):
         data = {"name": self.name}
         if self.description:
             data["description"] = self.description
         if self.arguments:
             data["arguments"] = self.arguments
-        return data
+        object.__setattr__(self, "_dict", data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Copy, so callers cannot change the instance's cached dict
+        return dict(self._dict)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> PromptDefinition:
@@ -259,6 +339,19 @@ class PromptDefinition:
         )
 
 
+# (has "method", has "id", has "result" or "error") -> message constructor.
+# Requests and notifications are identified by method/id alone; responses
+# are messages without a method that carry a result or an error
+_DISPATCH = {
+    (True, True, False): MCPRequest.from_dict,
+    (True, True, True): MCPRequest.from_dict,
+    (True, False, False): MCPNotification.from_dict,
+    (True, False, True): MCPNotification.from_dict,
+    (False, True, True): MCPResponse.from_dict,
+    (False, False, True): MCPResponse.from_dict,
+}
+
+
 class MCPProtocol:
     """
     MCP Protocol handler for message parsing and validation.
@@ -269,10 +362,12 @@ class MCPProtocol:
     VERSION = "1.0.0"
     
     @staticmethod
-    def parse_message(raw_message: Union[str, bytes, Dict[str, Any]]) -> Union[MCPRequest, MCPResponse, MCPNotification]:
+    def parse_message(raw_message: Union[str, bytes, bytearray, memoryview, Dict[str, Any]]) -> Union[MCPRequest, MCPResponse, MCPNotification]:
         """
         Parse raw message into appropriate MCP message type.
         
+        JSON is decoded with orjson when it is installed.
+        
         Args:
             raw_message: Raw JSON string, bytes, or dict
             
@@ -282,33 +377,91 @@ class MCPProtocol:
         Raises:
             ValueError: If message is invalid
         """
-        if isinstance(raw_message, (str, bytes)):
+        if isinstance(raw_message, (str, bytes, bytearray, memoryview)):
             try:
-                data = json.loads(raw_message)
-            except json.JSONDecodeError as e:
+                data = loads(raw_message)
+            except ValueError as e:
                 raise ValueError(f"Invalid JSON: {e}")
         else:
             data = raw_message
         
+        if not isinstance(data, dict):
+            raise ValueError("Message must be a JSON object")
+        
         # Validate JSON-RPC version
         if data.get("jsonrpc") != "2.0":
             raise ValueError("Invalid JSON-RPC version")
         
         # Determine message type
-        if "method" in data:
-            if "id" in data:
-                return MCPRequest.from_dict(data)
-            else:
-                return MCPNotification.from_dict(data)
-        elif "result" in data or "error" in data:
-            return MCPResponse.from_dict(data)
-        else:
+        parse = _DISPATCH.get(
+            ("method" in data, "id" in data, "result" in data or "error" in data)
+        )
+        if parse is None:
             raise ValueError("Unknown message type")
+        return parse(data)
+    
+    @staticmethod
+    def is_batch(raw_message: Union[str, bytes, bytearray, memoryview, List[Any]]) -> bool:
+        """Check whether a raw message is a JSON-RPC batch (a JSON array)."""
+        if isinstance(raw_message, list):
+            return True
+        if isinstance(raw_message, str):
+            return raw_message.lstrip()[:1] == "["
+        if isinstance(raw_message, (bytes, bytearray, memoryview)):
+            # Scan in place rather than copying/stripping the whole buffer
+            for byte in raw_message:
+                if byte not in b" \t\r\n":
+                    return byte == 0x5B  # "["
+        return False
+    
+    @staticmethod
+    def parse_batch(
+        raw_message: Union[str, bytes, bytearray, memoryview, List[Any]],
+    ) -> List[Union[MCPRequest, MCPResponse, MCPNotification]]:
+        """
+        Parse a JSON-RPC batch into MCP messages.
+        
+        Args:
+            raw_message: Raw JSON array, or an already decoded list
+            
+        Returns:
+            Parsed MCP messages, in batch order
+            
+        Raises:
+            ValueError: If the batch or any message in it is invalid
+        """
+        if isinstance(raw_message, list):
+            data = raw_message
+        else:
+            try:
+                data = loads(raw_message)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+        
+        if not isinstance(data, list) or not data:
+            raise ValueError("Batch must be a non-empty array")
+        
+        return [MCPProtocol.parse_message(item) for item in data]
     
     @staticmethod
     def serialize_message(message: MCPMessage) -> str:
-        """Serialize MCP message to JSON string."""
-        return json.dumps(message.to_dict())
+        """Serialize MCP message to a compact JSON string (orjson when installed)."""
+        return dumps_str(message.to_dict())
+    
+    @staticmethod
+    def serialize_batch(messages: List[MCPMessage]) -> str:
+        """Serialize MCP messages as one JSON-RPC batch (a JSON array)."""
+        return dumps_str([message.to_dict() for message in messages])
+    
+    @staticmethod
+    def encode_message(message: MCPMessage) -> bytes:
+        """Serialize MCP message to compact UTF-8 JSON bytes (no str round trip)."""
+        return dumps(message.to_dict())
+    
+    @staticmethod
+    def encode_batch(messages: List[MCPMessage]) -> bytes:
+        """Serialize MCP messages as one JSON-RPC batch, to UTF-8 JSON bytes."""
+        return dumps([message.to_dict() for message in messages])
     
     @staticmethod
     def create_success_response(request_id: Union[str, int], result: Any) -> MCPResponse:
@@ -332,15 +485,7 @@ class MCPProtocol:
         available: MCPCapabilities
     ) -> bool:
         """Check if required capabilities are available."""
-        if required.tools and not available.tools:
-            return False
-        if required.resources and not available.resources:
-            return False
-        if required.prompts and not available.prompts:
-            return False
-        if required.streaming and not available.streaming:
-            return False
-        return True
+        return required._mask & available._mask == required._mask
     
     @staticmethod
     def negotiate_capabilities(
@@ -348,10 +493,7 @@ class MCPProtocol:
         server_caps: MCPCapabilities
     ) -> MCPCapabilities:
         """Negotiate capabilities between client and server."""
-        return MCPCapabilities(
-            tools=client_caps.tools and server_caps.tools,
-            resources=client_caps.resources and server_caps.resources,
-            prompts=client_caps.prompts and server_caps.prompts,
-            streaming=client_caps.streaming and server_caps.streaming,
+        return MCPCapabilities.from_mask(
+            client_caps._mask & server_caps._mask,
             version=min(client_caps.version, server_caps.version),
         )
@@ -9,10 +9,28 @@ from typing import Any, Callable, Dict, List, Optional, Awaitable
 import asyncio
 
 from ..protocol import ResourceDefinition
+from ..tools.executor import get_sync_executor
 
 logger = logging.getLogger(__name__)
 
 
+class _ResourceEntry:
+    """A registered resource: its reader plus the prebuilt definition."""
+    __slots__ = ("mime_type", "reader", "is_async", "definition")
+    
+    def __init__(
+        self,
+        mime_type: str,
+        reader: Optional[Callable],
+        is_async: bool,
+        definition: ResourceDefinition,
+    ):
+        self.mime_type = mime_type
+        self.reader = reader
+        self.is_async = is_async
+        self.definition = definition
+
+
 class ResourceManager:
     """
     Manager for MCP resources.
@@ -23,7 +41,11 @@ class ResourceManager:
     
     def __init__(self):
         """Initialize resource manager."""
-        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._resources: Dict[str, _ResourceEntry] = {}
+        # list_resources()/serialized_resources() results, rebuilt after
+        # (un)registration
+        self._definitions: Optional[List[ResourceDefinition]] = None
+        self._serialized: Optional[List[Dict[str, Any]]] = None
     
     def register_resource(
         self,
@@ -41,15 +63,23 @@ class ResourceManager:
             name: Resource name
             description: Resource description
             mime_type: MIME type of resource content
-            reader: Function to read resource content (sync or async)
+            reader: Function to read resource content (sync or async). Sync
+                readers run on a shared thread pool and must be thread-safe
         """
-        self._resources[uri] = {
-            "uri": uri,
-            "name": name,
-            "description": description,
-            "mimeType": mime_type or "text/plain",
-            "reader": reader,
-        }
+        mime_type = mime_type or "text/plain"
+        self._resources[uri] = _ResourceEntry(
+            mime_type,
+            reader,
+            asyncio.iscoroutinefunction(reader) if reader else False,
+            ResourceDefinition(
+                uri=uri,
+                name=name,
+                description=description,
+                mimeType=mime_type,
+            ),
+        )
+        self._definitions = None
+        self._serialized = None
         
         logger.debug(f"Registered resource: {uri}")
     
@@ -57,6 +87,8 @@ class ResourceManager:
         """Unregister a resource."""
         if uri in self._resources:
             del self._resources[uri]
+            self._definitions = None
+            self._serialized = None
             logger.debug(f"Unregistered resource: {uri}")
     
     def list_resources(self) -> List[ResourceDefinition]:
@@ -66,15 +98,23 @@ class ResourceManager:
         Returns:
             List of resource definitions
         """
-        return [
-            ResourceDefinition(
-                uri=res["uri"],
-                name=res["name"],
-                description=res["description"],
-                mimeType=res["mimeType"],
-            )
-            for res in self._resources.values()
-        ]
+        if self._definitions is None:
+            self._definitions = [res.definition for res in self._resources.values()]
+        return list(self._definitions)
+    
+    def serialized_resources(self) -> List[Dict[str, Any]]:
+        """
+        Get all registered resources as protocol dicts (for resources/list).
+        
+        The list is cached until the next (un)registration and shared
+        between calls, so callers must not modify it.
+        
+        Returns:
+            List of resource definition dicts
+        """
+        if self._serialized is None:
+            self._serialized = [res.definition.to_dict() for res in self._resources.values()]
+        return self._serialized
     
     async def read_resource(self, uri: str) -> Dict[str, Any]:
         """
@@ -93,21 +133,21 @@ class ResourceManager:
             raise ValueError(f"Resource not found: {uri}")
         
         resource = self._resources[uri]
-        reader = resource["reader"]
+        reader = resource.reader
         
         if not reader:
             raise ValueError(f"No reader configured for resource: {uri}")
         
         try:
             # Execute reader
-            if asyncio.iscoroutinefunction(reader):
+            if resource.is_async:
                 content = await reader(uri)
             else:
-                loop = asyncio.get_event_loop()
-                content = await loop.run_in_executor(None, lambda: reader(uri))
+                loop = asyncio.get_running_loop()
+                content = await loop.run_in_executor(get_sync_executor(), reader, uri)
             
             return {
-                "mimeType": resource["mimeType"],
+                "mimeType": resource.mime_type,
                 "text": str(content),
             }
         
@@ -4,11 +4,25 @@ MCP Resource Resolver.
 Resolves resource URIs to content.
 """
 
+import functools
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Distinct URIs whose parse results are kept
+URI_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=URI_CACHE_SIZE)
+def _parse_uri(uri: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """Split a resource URI into (scheme, path, path parts), once per URI."""
+    scheme, separator, rest = uri.partition("://")
+    if not separator:
+        scheme, rest = "agent", uri
+    
+    return scheme, rest, tuple(rest.split("/"))
+
 
 class ResourceResolver:
     """
@@ -31,18 +45,11 @@ class ResourceResolver:
         Returns:
             Dictionary with scheme, path, and other components
         """
-        if "://" in uri:
-            scheme, rest = uri.split("://", 1)
-        else:
-            scheme = "agent"
-            rest = uri
-        
-        parts = rest.split("/")
-        
+        scheme, rest, parts = _parse_uri(uri)
         return {
             "scheme": scheme,
             "path": rest,
-            "parts": parts,
+            "parts": list(parts),
         }
     
     def build_uri(self, scheme: str, *path_parts: str) -> str:
@@ -56,5 +63,6 @@ class ResourceResolver:
         Returns:
             Complete URI string
         """
-        path = "/".join(path_parts)
-        return f"{scheme}://{path}"
+        if len(path_parts) == 1:
+            return f"{scheme}://{path_parts[0]}"
+        return f"{scheme}://{'/'.join(path_parts)}"
@@ -9,7 +9,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Awaitable
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Awaitable, Union
 
 from .protocol import (
     MCPRequest,
@@ -29,6 +30,42 @@ from .prompts.manager import PromptManager
 
 logger = logging.getLogger(__name__)
 
+# Tool calls allowed to run at once; further tools/call requests wait
+TOOL_CONCURRENCY = int(os.environ.get("AGENTOSX_TOOL_CONCURRENCY", "32"))
+
+# Distinct client capability sets whose negotiated result is kept (client
+# versions are free-form strings, so the cache is bounded)
+NEGOTIATION_CACHE_SIZE = 64
+
+# (method, handler attribute, required capability)
+_CAPABILITY_METHODS = (
+    ("tools/list", "_handle_tools_list", "tools"),
+    ("tools/call", "_handle_tools_call", "tools"),
+    ("resources/list", "_handle_resources_list", "resources"),
+    ("resources/read", "_handle_resources_read", "resources"),
+    ("prompts/list", "_handle_prompts_list", "prompts"),
+    ("prompts/get", "_handle_prompts_get", "prompts"),
+)
+
+
+def _text(value: Any) -> str:
+    """Render a tool result as text content, passing strings through."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+def _disabled(capability: str) -> Callable[[MCPRequest], Awaitable[Any]]:
+    """Create a handler for methods of a capability the server lacks."""
+    message = f"{capability.capitalize()} capability not enabled"
+    
+    async def handler(request: MCPRequest) -> Any:
+        raise ValueError(message)
+    
+    return handler
+
 
 class MCPServer:
     """
@@ -38,6 +75,25 @@ class MCPServer:
     Supports tools, resources, and prompts.
     """
     
+    # Fixed attribute set: per-message lookups use slots, not an instance dict
+    __slots__ = (
+        "name",
+        "version",
+        "capabilities",
+        "_server_info",
+        "_negotiated",
+        "tool_adapter",
+        "resource_manager",
+        "prompt_manager",
+        "initialized",
+        "client_capabilities",
+        "transport",
+        "_handlers",
+        "_running",
+        "_tasks",
+        "_tool_slots",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -61,6 +117,10 @@ class MCPServer:
             streaming=True,
         )
         
+        # Constant parts of the initialize response
+        self._server_info = {"name": name, "version": version}
+        self._negotiated: Dict[Tuple[MCPCapabilities, MCPCapabilities], Dict[str, Any]] = {}
+        
         # Components
         self.tool_adapter = ToolAdapter()
         self.resource_manager = ResourceManager()
@@ -71,20 +131,30 @@ class MCPServer:
         self.client_capabilities: Optional[MCPCapabilities] = None
         self.transport: Optional[Transport] = None
         
-        # Request handlers
-        self._handlers: Dict[str, Callable] = {
-            "initialize": self._handle_initialize,
-            "tools/list": self._handle_tools_list,
-            "tools/call": self._handle_tools_call,
-            "resources/list": self._handle_resources_list,
-            "resources/read": self._handle_resources_read,
-            "prompts/list": self._handle_prompts_list,
-            "prompts/get": self._handle_prompts_get,
-        }
+        # Request handlers, with capability checks resolved up front
+        self._handlers: Dict[str, Callable] = self._build_handlers()
         
         # Running state
         self._running = False
         self._tasks: Set[asyncio.Task] = set()
+        self._tool_slots: Optional[asyncio.Semaphore] = None
+    
+    def _build_handlers(self) -> Dict[str, Callable]:
+        """
+        Build the method dispatch table for the current capabilities.
+        
+        Methods of disabled capabilities map to a handler that rejects them,
+        so handlers never check capabilities per request. Rebuilt at
+        initialize, which freezes the capabilities for the session.
+        """
+        capabilities = self.capabilities
+        handlers: Dict[str, Callable] = {"initialize": self._handle_initialize}
+        for method, attribute, capability in _CAPABILITY_METHODS:
+            if getattr(capabilities, capability):
+                handlers[method] = getattr(self, attribute)
+            else:
+                handlers[method] = _disabled(capability)
+        return handlers
     
     def register_tool(
         self,
@@ -170,6 +240,9 @@ class MCPServer:
         
         try:
             await transport.start(self._handle_message)
+            # Input ended; let requests already received finish answering
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
         except Exception as e:
             logger.error(f"Server error: {e}", exc_info=True)
         finally:
@@ -191,40 +264,129 @@ class MCPServer:
         
         logger.info("MCP server stopped")
     
-    async def _handle_message(self, raw_message: str):
+    async def _handle_message(self, raw_message: Union[str, bytes, memoryview]):
         """
         Handle incoming MCP message.
         
         Args:
             raw_message: Raw JSON-RPC message
         """
+        if MCPProtocol.is_batch(raw_message):
+            await self._handle_batch(raw_message)
+            return
+        
         try:
             message = MCPProtocol.parse_message(raw_message)
             
             if isinstance(message, MCPRequest):
-                response = await self._handle_request(message)
-                if response and self.transport:
-                    await self.transport.send(MCPProtocol.serialize_message(response))
+                # Answer in a task, so the transport can deliver the next
+                # message while this one (e.g. a slow tool call) runs
+                self._spawn(self._respond(message))
             
             elif isinstance(message, MCPNotification):
                 await self._handle_notification(message)
             
         except Exception as e:
             logger.error(f"Error handling message: {e}", exc_info=True)
-            # Send error response if we can extract request ID
+    
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        """Run a response coroutine in a task tracked for start()/stop()."""
+        tasks = self._tasks
+        task = asyncio.get_running_loop().create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    def _encode(self, message: Union[MCPResponse, MCPNotification]) -> Union[str, bytes]:
+        """Serialize a message in the form the transport takes (bytes if it can)."""
+        transport = self.transport
+        if transport is not None and transport.accepts_bytes:
+            return MCPProtocol.encode_message(message)
+        return MCPProtocol.serialize_message(message)
+    
+    def _encode_batch(self, messages: List[MCPResponse]) -> Union[str, bytes]:
+        """Serialize a batch in the form the transport takes (bytes if it can)."""
+        transport = self.transport
+        if transport is not None and transport.accepts_bytes:
+            return MCPProtocol.encode_batch(messages)
+        return MCPProtocol.serialize_batch(messages)
+    
+    async def _respond(self, request: MCPRequest):
+        """
+        Handle a request and send its response.
+        
+        Args:
+            request: MCP request message
+        """
+        transport = self.transport
+        if not transport:
+            await self._handle_request(request)
+            return
+        
+        try:
+            response = await self._handle_request(request)
+            if response:
+                await transport.send(self._encode(response))
+        except Exception as e:
+            logger.error(f"Error handling message: {e}", exc_info=True)
+            error_response = MCPProtocol.create_error_response(
+                request.id,
+                ErrorCode.INTERNAL_ERROR,
+                str(e)
+            )
             try:
-                data = MCPProtocol.parse_message(raw_message)
-                if hasattr(data, 'id'):
-                    error_response = MCPProtocol.create_error_response(
-                        data.id,
-                        ErrorCode.INTERNAL_ERROR,
-                        str(e)
-                    )
-                    if self.transport:
-                        await self.transport.send(MCPProtocol.serialize_message(error_response))
-            except:
+                await transport.send(self._encode(error_response))
+            except Exception:
                 pass
     
+    async def _handle_batch(self, raw_message: Union[str, bytes, memoryview]):
+        """
+        Handle a JSON-RPC batch.
+        
+        The batch is parsed here; its requests are then handled concurrently
+        in a tracked task, like single requests, and answered with one batch
+        of responses in request order.
+        
+        Args:
+            raw_message: Raw JSON-RPC batch (a JSON array)
+        """
+        try:
+            messages = MCPProtocol.parse_batch(raw_message)
+        except ValueError as e:
+            logger.error(f"Error handling batch: {e}")
+            if self.transport:
+                error_response = MCPProtocol.create_error_response(
+                    None,
+                    ErrorCode.INVALID_REQUEST,
+                    str(e)
+                )
+                await self.transport.send(self._encode(error_response))
+            return
+        
+        for message in messages:
+            if isinstance(message, MCPNotification):
+                await self._handle_notification(message)
+        
+        requests = [message for message in messages if isinstance(message, MCPRequest)]
+        if requests:
+            self._spawn(self._respond_batch(requests))
+    
+    async def _respond_batch(self, requests: List[MCPRequest]):
+        """
+        Handle a batch's requests and send their responses as one batch.
+        
+        Args:
+            requests: MCP request messages, in batch order
+        """
+        try:
+            responses = await asyncio.gather(*(
+                self._handle_request(request) for request in requests
+            ))
+            responses = [response for response in responses if response]
+            if responses and self.transport:
+                await self.transport.send(self._encode_batch(responses))
+        except Exception as e:
+            logger.error(f"Error handling batch: {e}", exc_info=True)
+    
     async def _handle_request(self, request: MCPRequest) -> Optional[MCPResponse]:
         """
         Handle MCP request.
@@ -235,22 +397,24 @@ class MCPServer:
         Returns:
             MCP response or None
         """
-        handler = self._handlers.get(request.method)
+        method = request.method
+        request_id = request.id
+        handler = self._handlers.get(method)
         
         if not handler:
             return MCPProtocol.create_error_response(
-                request.id,
+                request_id,
                 ErrorCode.METHOD_NOT_FOUND,
-                f"Method not found: {request.method}"
+                f"Method not found: {method}"
             )
         
         try:
             result = await handler(request)
-            return MCPProtocol.create_success_response(request.id, result)
+            return MCPProtocol.create_success_response(request_id, result)
         except Exception as e:
-            logger.error(f"Error handling {request.method}: {e}", exc_info=True)
+            logger.error(f"Error handling {method}: {e}", exc_info=True)
             return MCPProtocol.create_error_response(
-                request.id,
+                request_id,
                 ErrorCode.INTERNAL_ERROR,
                 str(e)
             )
@@ -273,38 +437,33 @@ class MCPServer:
             version=params.get("protocolVersion", "1.0.0"),
         )
         
-        # Negotiate capabilities
-        negotiated = MCPProtocol.negotiate_capabilities(
-            self.client_capabilities,
-            self.capabilities
-        )
-        
+        # Negotiate capabilities (once per distinct client/server pair)
+        key = (self.client_capabilities, self.capabilities)
+        negotiated = self._negotiated.get(key)
+        if negotiated is None:
+            negotiated = MCPProtocol.negotiate_capabilities(
+                self.client_capabilities,
+                self.capabilities
+            ).to_dict()
+            if len(self._negotiated) >= NEGOTIATION_CACHE_SIZE:
+                self._negotiated.clear()
+            self._negotiated[key] = negotiated
+        
+        self._handlers = self._build_handlers()
         self.initialized = True
         
         return {
             "protocolVersion": MCPProtocol.VERSION,
-            "capabilities": negotiated.to_dict(),
-            "serverInfo": {
-                "name": self.name,
-                "version": self.version,
-            }
+            "capabilities": negotiated,
+            "serverInfo": self._server_info,
         }
     
     async def _handle_tools_list(self, request: MCPRequest) -> Dict[str, Any]:
         """List available tools."""
-        if not self.capabilities.tools:
-            raise ValueError("Tools capability not enabled")
-        
-        tools = self.tool_adapter.list_tools()
-        return {
-            "tools": [tool.to_dict() for tool in tools]
-        }
+        return {"tools": self.tool_adapter.serialized_tools()}
     
     async def _handle_tools_call(self, request: MCPRequest) -> Dict[str, Any]:
         """Execute a tool."""
-        if not self.capabilities.tools:
-            raise ValueError("Tools capability not enabled")
-        
         params = request.params or {}
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
@@ -312,32 +471,56 @@ class MCPServer:
         if not tool_name:
             raise ValueError("Tool name is required")
         
-        result = await self.tool_adapter.execute_tool(tool_name, arguments)
+        if self._tool_slots is None:
+            self._tool_slots = asyncio.Semaphore(TOOL_CONCURRENCY)
+        
+        # Async generator tools: forward each chunk as a progress
+        # notification when the client asked for progress, so it sees
+        # output before the tool finishes
+        meta = params.get("_meta") or {}
+        progress_token = meta.get("progressToken")
+        transport = self.transport
+        if (
+            progress_token is not None
+            and transport is not None
+            and self.tool_adapter.is_streaming(tool_name)
+        ):
+            content = []
+            async with self._tool_slots:
+                async for chunk in self.tool_adapter.execute_streaming(tool_name, arguments):
+                    item = {"type": "text", "text": _text(chunk)}
+                    content.append(item)
+                    await transport.send(self._encode(MCPNotification(
+                        "notifications/progress",
+                        {
+                            "progressToken": progress_token,
+                            "progress": len(content),
+                            "content": [item],
+                        },
+                    )))
+            return {"content": content}
+        
+        async with self._tool_slots:
+            result = await self.tool_adapter.execute_tool(tool_name, arguments)
+        
+        if self.tool_adapter.is_streaming(tool_name):
+            return {"content": [{"type": "text", "text": _text(chunk)} for chunk in result]}
         
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": str(result)
+                    "text": _text(result)
                 }
             ]
         }
     
     async def _handle_resources_list(self, request: MCPRequest) -> Dict[str, Any]:
         """List available resources."""
-        if not self.capabilities.resources:
-            raise ValueError("Resources capability not enabled")
-        
-        resources = self.resource_manager.list_resources()
-        return {
-            "resources": [resource.to_dict() for resource in resources]
-        }
+        return {"resources": self.resource_manager.serialized_resources()}
     
     async def _handle_resources_read(self, request: MCPRequest) -> Dict[str, Any]:
         """Read a resource."""
-        if not self.capabilities.resources:
-            raise ValueError("Resources capability not enabled")
-        
         params = request.params or {}
         uri = params.get("uri")
         
@@ -358,19 +541,10 @@ class MCPServer:
     
     async def _handle_prompts_list(self, request: MCPRequest) -> Dict[str, Any]:
         """List available prompts."""
-        if not self.capabilities.prompts:
-            raise ValueError("Prompts capability not enabled")
-        
-        prompts = self.prompt_manager.list_prompts()
-        return {
-            "prompts": [prompt.to_dict() for prompt in prompts]
-        }
+        return {"prompts": self.prompt_manager.serialized_prompts()}
     
     async def _handle_prompts_get(self, request: MCPRequest) -> Dict[str, Any]:
         """Get a prompt template."""
-        if not self.capabilities.prompts:
-            raise ValueError("Prompts capability not enabled")
-        
         params = request.params or {}
         name = params.get("name")
         arguments = params.get("arguments", {})
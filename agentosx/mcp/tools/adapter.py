@@ -7,14 +7,120 @@ Converts agentOSX tools to MCP format and handles execution.
 from __future__ import annotations
 
 import asyncio
+import copy
+import functools
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union, get_args, get_origin
+from weakref import WeakKeyDictionary
 
 from ..protocol import ToolDefinition, ErrorCode
+from .executor import get_sync_executor
+
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+    fastjsonschema = None
 
 logger = logging.getLogger(__name__)
 
+# Exact annotation -> JSON Schema type, for the common cases
+_TYPE_TABLE = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+# Annotation -> JSON Schema type for subclasses, checked in order (bool
+# before its base int)
+_ANNOTATION_TYPES = (
+    (bool, "boolean"),
+    (str, "string"),
+    (int, "integer"),
+    (float, "number"),
+    (list, "array"),
+    (dict, "object"),
+)
+
+# Docstring argument line: "name: description" or "name (type): description"
+_DOC_PARAM = re.compile(r"^\s*(\w+)(?:\s*\([^)]*\))?\s*:[ \t]*(.*)$", re.MULTILINE)
+
+# Inferred input schemas by function, shared by every adapter the function
+# is registered with
+_SCHEMA_CACHE: "WeakKeyDictionary[Callable, Dict[str, Any]]" = WeakKeyDictionary()
+
+# Python type name -> JSON Schema type, for the built-in argument validator
+_JSON_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object",
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _param_descriptions(doc: str) -> Dict[str, str]:
+    """Map argument names to descriptions in one pass over a docstring."""
+    descriptions: Dict[str, str] = {}
+    for name, description in _DOC_PARAM.findall(doc):
+        descriptions.setdefault(name, description.strip())
+    return descriptions
+
+
+@functools.lru_cache(maxsize=512)
+def _annotation_json_type(python_type: Any) -> str:
+    """Convert a parameter annotation to a JSON Schema type."""
+    json_type = _TYPE_TABLE.get(python_type)
+    if json_type is not None:
+        return json_type
+    
+    # Generic aliases such as List[str] / dict[str, Any], and Optional[T]
+    origin = get_origin(python_type)
+    if origin is Union:
+        args = [arg for arg in get_args(python_type) if arg is not type(None)]
+        if len(args) == 1:
+            return _annotation_json_type(args[0])
+        return "string"
+    if origin is not None:
+        python_type = origin
+    
+    # Get base type
+    if isinstance(python_type, type):
+        for base_type, json_type in _ANNOTATION_TYPES:
+            if issubclass(python_type, base_type):
+                return json_type
+    
+    return "string"  # Default fallback
+
+
+class _ToolEntry:
+    """A registered tool: its function, schema and validator plus the prebuilt definition."""
+    __slots__ = ("func", "input_schema", "validator", "is_async", "is_async_gen", "definition")
+    
+    def __init__(
+        self,
+        func: Callable,
+        input_schema: Dict[str, Any],
+        validator: Optional[Callable[[Dict[str, Any]], Any]],
+        is_async: bool,
+        is_async_gen: bool,
+        definition: ToolDefinition,
+    ):
+        self.func = func
+        self.input_schema = input_schema
+        self.validator = validator
+        self.is_async = is_async
+        self.is_async_gen = is_async_gen
+        self.definition = definition
+
 
 class ToolAdapter:
     """
@@ -25,7 +131,10 @@ class ToolAdapter:
     
     def __init__(self):
         """Initialize tool adapter."""
-        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._tools: Dict[str, _ToolEntry] = {}
+        # list_tools()/serialized_tools() results, rebuilt after (un)registration
+        self._definitions: Optional[List[ToolDefinition]] = None
+        self._serialized: Optional[List[Dict[str, Any]]] = None
     
     def register_tool(
         self,
@@ -40,20 +149,28 @@ class ToolAdapter:
         Args:
             name: Tool name
             description: Tool description
-            func: Tool function (sync or async)
+            func: Tool function (sync, async, or async generator). Sync
+                functions run on a shared thread pool and must be thread-safe
             input_schema: Optional JSON Schema for inputs (auto-inferred if not provided)
         """
         # Auto-generate schema if not provided
         if input_schema is None:
             input_schema = self._infer_schema(func)
         
-        self._tools[name] = {
-            "name": name,
-            "description": description,
-            "func": func,
-            "inputSchema": input_schema,
-            "is_async": asyncio.iscoroutinefunction(func),
-        }
+        self._tools[name] = _ToolEntry(
+            func,
+            input_schema,
+            self._compile_validator(name, input_schema),
+            asyncio.iscoroutinefunction(func),
+            inspect.isasyncgenfunction(func),
+            ToolDefinition(
+                name=name,
+                description=description,
+                inputSchema=input_schema,
+            ),
+        )
+        self._definitions = None
+        self._serialized = None
         
         logger.debug(f"Registered tool: {name}")
     
@@ -61,6 +178,8 @@ class ToolAdapter:
         """Unregister a tool."""
         if name in self._tools:
             del self._tools[name]
+            self._definitions = None
+            self._serialized = None
             logger.debug(f"Unregistered tool: {name}")
     
     def list_tools(self) -> List[ToolDefinition]:
@@ -70,14 +189,28 @@ class ToolAdapter:
         Returns:
             List of tool definitions
         """
-        return [
-            ToolDefinition(
-                name=tool["name"],
-                description=tool["description"],
-                inputSchema=tool["inputSchema"],
-            )
-            for tool in self._tools.values()
-        ]
+        if self._definitions is None:
+            self._definitions = [tool.definition for tool in self._tools.values()]
+        return list(self._definitions)
+    
+    def serialized_tools(self) -> List[Dict[str, Any]]:
+        """
+        Get all registered tools as protocol dicts (for tools/list).
+        
+        The list is cached until the next (un)registration and shared
+        between calls, so callers must not modify it.
+        
+        Returns:
+            List of tool definition dicts
+        """
+        if self._serialized is None:
+            self._serialized = [tool.definition.to_dict() for tool in self._tools.values()]
+        return self._serialized
+    
+    def is_streaming(self, name: str) -> bool:
+        """Check whether a tool is an async generator whose chunks can be streamed."""
+        tool = self._tools.get(name)
+        return tool is not None and tool.is_async_gen
     
     async def execute_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """
@@ -88,7 +221,7 @@ class ToolAdapter:
             arguments: Tool arguments
             
         Returns:
-            Tool execution result
+            Tool execution result (the list of chunks for async generator tools)
             
         Raises:
             ValueError: If tool not found
@@ -98,20 +231,27 @@ class ToolAdapter:
             raise ValueError(f"Tool not found: {name}")
         
         tool = self._tools[name]
-        func = tool["func"]
-        is_async = tool["is_async"]
+        func = tool.func
+        is_async = tool.is_async
         
         try:
-            # Validate arguments against schema
-            self._validate_arguments(tool["inputSchema"], arguments)
+            # Validate arguments against schema (compiled at registration)
+            if tool.validator is not None:
+                tool.validator(arguments)
             
             # Execute tool
-            if is_async:
+            if tool.is_async_gen:
+                result = [chunk async for chunk in func(**arguments)]
+            elif is_async:
                 result = await func(**arguments)
             else:
-                # Run sync function in executor
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, lambda: func(**arguments))
+                # Run sync function in the shared tool pool
+                loop = asyncio.get_running_loop()
+                if arguments:
+                    call = functools.partial(func, **arguments)
+                else:
+                    call = func
+                result = await loop.run_in_executor(get_sync_executor(), call)
             
             logger.debug(f"Tool {name} executed successfully")
             return result
@@ -120,17 +260,70 @@ class ToolAdapter:
             logger.error(f"Tool execution error ({name}): {e}", exc_info=True)
             raise
     
+    async def execute_streaming(self, name: str, arguments: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Execute an async generator tool, yielding its chunks as produced.
+        
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            
+        Yields:
+            Tool output chunks
+            
+        Raises:
+            ValueError: If tool not found or is not an async generator
+            Exception: If tool execution fails
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(f"Tool not found: {name}")
+        if not tool.is_async_gen:
+            raise ValueError(f"Tool does not stream: {name}")
+        
+        try:
+            if tool.validator is not None:
+                tool.validator(arguments)
+            
+            async for chunk in tool.func(**arguments):
+                yield chunk
+            
+            logger.debug(f"Tool {name} streamed successfully")
+        
+        except Exception as e:
+            logger.error(f"Tool execution error ({name}): {e}", exc_info=True)
+            raise
+    
     def _infer_schema(self, func: Callable) -> Dict[str, Any]:
         """
         Infer JSON Schema from function signature.
         
+        Schemas are cached per function (per underlying function for bound
+        methods); each call returns a private copy.
+        
         Args:
             func: Function to analyze
             
         Returns:
             JSON Schema for function parameters
         """
+        key = getattr(func, "__func__", func)
+        try:
+            schema = _SCHEMA_CACHE.get(key)
+        except TypeError:
+            # Not weak-referenceable (e.g. a builtin)
+            return self._build_schema(func)
+        
+        if schema is None:
+            schema = self._build_schema(func)
+            _SCHEMA_CACHE[key] = schema
+        return copy.deepcopy(schema)
+    
+    def _build_schema(self, func: Callable) -> Dict[str, Any]:
+        """Build the JSON Schema for a function's parameters."""
         sig = inspect.signature(func)
+        doc = inspect.getdoc(func)
+        descriptions = _param_descriptions(doc) if doc else {}
         
         properties = {}
         required = []
@@ -149,14 +342,8 @@ class ToolAdapter:
                 param_schema["type"] = "string"  # Default to string
             
             # Add description from docstring if available
-            doc = inspect.getdoc(func)
-            if doc:
-                # Simple extraction - look for "param_name: description" pattern
-                for line in doc.split("\n"):
-                    if f"{param_name}:" in line:
-                        desc = line.split(":", 1)[1].strip()
-                        param_schema["description"] = desc
-                        break
+            if param_name in descriptions:
+                param_schema["description"] = descriptions[param_name]
             
             properties[param_name] = param_schema
             
@@ -176,66 +363,81 @@ class ToolAdapter:
     
     def _python_type_to_json_type(self, python_type: type) -> str:
         """Convert Python type to JSON Schema type."""
-        type_map = {
-            str: "string",
-            int: "integer",
-            float: "number",
-            bool: "boolean",
-            list: "array",
-            dict: "object",
-        }
+        try:
+            return _annotation_json_type(python_type)
+        except TypeError:
+            # Unhashable annotation object
+            return _annotation_json_type.__wrapped__(python_type)
+    
+    def _compile_validator(
+        self,
+        name: str,
+        schema: Dict[str, Any],
+    ) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        """
+        Build the argument validator for a tool schema.
         
-        # Handle Optional/Union types
-        if hasattr(python_type, "__origin__"):
-            origin = python_type.__origin__
-            if origin is list:
-                return "array"
-            elif origin is dict:
-                return "object"
+        Uses ``fastjsonschema`` when it is installed, which generates a
+        validator function for the schema once; its validation errors are
+        ValueErrors. Falls back to the built-in required/type checks.
         
-        # Get base type
-        if hasattr(python_type, "__mro__"):
-            for base_type, json_type in type_map.items():
-                if issubclass(python_type, base_type):
-                    return json_type
+        Args:
+            name: Tool name (for logging)
+            schema: JSON Schema for tool inputs
+            
+        Returns:
+            Validator raising ValueError on invalid arguments, or None if the
+            schema constrains nothing
+        """
+        if not schema.get("required") and not schema.get("properties"):
+            return None
+        
+        if FASTJSONSCHEMA_AVAILABLE:
+            try:
+                return fastjsonschema.compile(schema)
+            except fastjsonschema.JsonSchemaDefinitionException as e:
+                logger.warning(f"Using basic argument checks for tool {name}: {e}")
         
-        return "string"  # Default fallback
+        # Required names and declared types, extracted once per schema
+        required = frozenset(schema.get("required", ()))
+        types = {
+            key: prop.get("type")
+            for key, prop in schema.get("properties", {}).items()
+            if isinstance(prop, dict)
+        }
+        return functools.partial(self._validate_arguments, required, types)
     
-    def _validate_arguments(self, schema: Dict[str, Any], arguments: Dict[str, Any]):
+    def _validate_arguments(
+        self,
+        required: frozenset,
+        types: Dict[str, Optional[str]],
+        arguments: Dict[str, Any],
+    ):
         """
-        Validate arguments against JSON Schema.
+        Validate arguments against a schema's required names and types.
         
         Args:
-            schema: JSON Schema
+            required: Required argument names
+            types: JSON Schema type per declared argument
             arguments: Arguments to validate
             
         Raises:
             ValueError: If validation fails
         """
         # Check required fields
-        required = schema.get("required", [])
-        for field in required:
-            if field not in arguments:
-                raise ValueError(f"Missing required argument: {field}")
+        missing = required.difference(arguments)
+        if missing:
+            if len(missing) == 1:
+                raise ValueError(f"Missing required argument: {next(iter(missing))}")
+            raise ValueError(f"Missing required arguments: {', '.join(sorted(missing))}")
         
         # Basic type checking
-        properties = schema.get("properties", {})
         for key, value in arguments.items():
-            if key in properties:
-                expected_type = properties[key].get("type")
+            if key in types:
+                expected_type = types[key]
                 actual_type = type(value).__name__
                 
-                # Map Python types to JSON types for comparison
-                type_map = {
-                    "str": "string",
-                    "int": "integer",
-                    "float": "number",
-                    "bool": "boolean",
-                    "list": "array",
-                    "dict": "object",
-                }
-                
-                actual_json_type = type_map.get(actual_type, actual_type)
+                actual_json_type = _JSON_TYPES.get(actual_type, actual_type)
                 
                 if expected_type and actual_json_type != expected_type:
                     # Allow number for integer
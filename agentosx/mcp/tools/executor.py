@@ -6,10 +6,43 @@ Handles tool execution with streaming support and error handling.
 
 import asyncio
 import logging
-from typing import Any, Dict, AsyncIterator, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, AsyncIterator, Optional, Tuple, Type
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for synchronous tool functions and resource readers. The
+# asyncio default pool is capped at min(32, cpu_count + 4), which IO-bound
+# sync tools exhaust quickly
+SYNC_POOL_WORKERS = int(os.environ.get("AGENTOSX_TOOL_POOL", "64"))
+
+_sync_executor: Optional[ThreadPoolExecutor] = None
+
+# asyncio.timeout() (Python 3.11+) avoids the wrapper task of wait_for
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+# Errors worth retrying by default: slow or unreachable backends
+RETRY_ON: Tuple[Type[BaseException], ...] = (TimeoutError, asyncio.TimeoutError, ConnectionError)
+
+
+def get_sync_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool for synchronous tools and resource readers.
+    
+    The pool is created on first use and sized by ``AGENTOSX_TOOL_POOL``.
+    
+    Returns:
+        Shared thread pool executor
+    """
+    global _sync_executor
+    if _sync_executor is None:
+        _sync_executor = ThreadPoolExecutor(
+            max_workers=SYNC_POOL_WORKERS,
+            thread_name_prefix="mcp-tool",
+        )
+    return _sync_executor
+
 
 class ToolExecutor:
     """
@@ -23,6 +56,7 @@ class ToolExecutor:
         self,
         default_timeout: float = 30.0,
         max_retries: int = 3,
+        retry_on: Tuple[Type[BaseException], ...] = RETRY_ON,
     ):
         """
         Initialize tool executor.
@@ -30,9 +64,11 @@ class ToolExecutor:
         Args:
             default_timeout: Default execution timeout in seconds
             max_retries: Maximum number of retry attempts
+            retry_on: Exception types that are retried; others fail at once
         """
         self.default_timeout = default_timeout
         self.max_retries = max_retries
+        self.retry_on = retry_on
     
     async def execute(
         self,
@@ -66,10 +102,7 @@ class ToolExecutor:
             
             try:
                 # Execute with timeout
-                result = await asyncio.wait_for(
-                    tool_func(**arguments),
-                    timeout=timeout
-                )
+                result = await self._call(tool_func, arguments, timeout)
                 
                 logger.debug(f"Tool executed successfully (attempt {attempts})")
                 return result
@@ -85,16 +118,24 @@ class ToolExecutor:
                 logger.error(f"Tool execution error (attempt {attempts}): {e}")
                 last_error = e
                 
-                if not retry or attempts >= self.max_retries:
+                if not retry or attempts >= self.max_retries or not isinstance(e, self.retry_on):
                     raise
             
-            # Exponential backoff before retry
-            if attempts < self.max_retries:
-                await asyncio.sleep(2 ** (attempts - 1))
+            # Retry the first failure at once, then back off exponentially
+            if attempts > 1:
+                await asyncio.sleep(2 ** (attempts - 2))
         
         # Should not reach here, but just in case
         raise last_error or Exception("Tool execution failed")
     
+    @staticmethod
+    async def _call(tool_func: Any, arguments: Dict[str, Any], timeout: float) -> Any:
+        """Await a tool call, raising asyncio.TimeoutError after timeout seconds."""
+        if _asyncio_timeout is not None:
+            async with _asyncio_timeout(timeout):
+                return await tool_func(**arguments)
+        return await asyncio.wait_for(tool_func(**arguments), timeout=timeout)
+    
     async def execute_streaming(
         self,
         tool_func: Any,
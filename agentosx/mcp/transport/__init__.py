@@ -1,11 +1,42 @@
 """
 Transport layer implementations for MCP.
+
+Transports are imported on first attribute access (PEP 562), so using one
+does not load the others' dependencies (e.g. websockets).
 """
 
-from .base import Transport
-from .stdio import StdioTransport
-from .sse import SSETransport
-from .websocket import WebSocketTransport
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from .base import Transport
+    from .stdio import StdioTransport
+    from .sse import SSETransport
+    from .websocket import WebSocketTransport
+
+# Public name -> (submodule, attribute)
+_LAZY: Dict[str, Tuple[str, str]] = {
+    "Transport": (".base", "Transport"),
+    "StdioTransport": (".stdio", "StdioTransport"),
+    "SSETransport": (".sse", "SSETransport"),
+    "WebSocketTransport": (".websocket", "WebSocketTransport"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "Transport",
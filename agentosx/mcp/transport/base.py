@@ -3,29 +3,42 @@ Transport layer base class for MCP.
 """
 
 from abc import ABC, abstractmethod
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Union
 
 
 class Transport(ABC):
-    """Abstract base class for MCP transport layers."""
+    """
+    Abstract base class for MCP transport layers.
+    
+    Transports that can write UTF-8 JSON bytes without decoding them set
+    ``accepts_bytes``; senders then pass bytes instead of str.
+    """
+    
+    accepts_bytes = False
     
     @abstractmethod
-    async def start(self, message_handler: Callable[[str], Awaitable[None]]):
+    async def start(
+        self,
+        message_handler: Callable[[Union[str, bytes, memoryview]], Awaitable[None]],
+    ):
         """
         Start the transport and begin receiving messages.
         
         Args:
-            message_handler: Async function to handle incoming messages
+            message_handler: Async function to handle incoming messages.
+                Messages may be passed as str, bytes or a memoryview into a
+                reused receive buffer, valid only until the handler returns.
         """
         pass
     
     @abstractmethod
-    async def send(self, message: str):
+    async def send(self, message: Union[str, bytes]):
         """
         Send a message through the transport.
         
         Args:
-            message: JSON-RPC message string
+            message: JSON-RPC message string (or UTF-8 bytes, if the
+                transport accepts_bytes)
         """
         pass
     
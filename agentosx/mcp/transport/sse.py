@@ -6,8 +6,7 @@ Provides HTTP-based SSE transport for real-time communication.
 
 import asyncio
 import logging
-from typing import Callable, Awaitable, Optional, Dict, Any
-from collections import deque
+from typing import Callable, Awaitable, Optional, Dict, Any, List
 
 from .base import Transport
 
@@ -34,7 +33,9 @@ class SSETransport(Transport):
         self.client_id = client_id
         self._running = False
         self._message_handler: Optional[Callable[[str], Awaitable[None]]] = None
-        self._outgoing_queue: deque = deque()
+        # Messages awaiting delivery; event_stream takes the whole list at
+        # once and leaves a fresh one, so no per-message pops are needed
+        self._outgoing_queue: List[str] = []
         self._event_available = asyncio.Event()
     
     async def start(self, message_handler: Callable[[str], Awaitable[None]]):
@@ -85,6 +86,9 @@ class SSETransport(Transport):
         """
         Generate SSE event stream.
         
+        Messages queued since the last write are joined into one chunk, so
+        a burst of responses costs one write instead of one per message.
+        
         Yields:
             SSE-formatted events
         """
@@ -98,15 +102,16 @@ class SSETransport(Transport):
                     yield ": keepalive\n\n"
                     continue
                 
-                # Send all queued messages
-                while self._outgoing_queue:
-                    message = self._outgoing_queue.popleft()
-                    # Format as SSE event
-                    yield f"data: {message}\n\n"
+                # Let producers woken in the same loop iteration enqueue too
+                await asyncio.sleep(0)
                 
-                # Clear event if queue is empty
-                if not self._outgoing_queue:
-                    self._event_available.clear()
+                # Send all queued messages as one chunk of SSE events
+                queue = self._outgoing_queue
+                self._outgoing_queue = []
+                events = "".join([f"data: {message}\n\n" for message in queue])
+                self._event_available.clear()
+                if events:
+                    yield events
         
         except Exception as e:
             logger.error(f"Error in SSE stream: {e}", exc_info=True)
@@ -8,12 +8,18 @@ used by Language Server Protocol and MCP reference implementations.
 import asyncio
 import sys
 import logging
-from typing import Callable, Awaitable, Optional
+from typing import Callable, Awaitable, Optional, Union
 
 from .base import Transport
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested from stdin per read
+READ_CHUNK_SIZE = 65536
+
+# Whitespace trimmed from both ends of a received line
+_LINE_WHITESPACE = b" \t\r"
+
 
 class StdioTransport(Transport):
     """
@@ -21,16 +27,27 @@ class StdioTransport(Transport):
     
     Reads JSON-RPC messages from stdin and writes to stdout.
     Each message is newline-delimited.
+    
+    Messages are read as raw bytes into one reusable receive buffer and
+    handed to the message handler as ``memoryview`` slices of it, so they are
+    parsed without being decoded to ``str`` or copied first. A slice is only
+    valid until the handler returns. Outgoing messages may be passed as
+    UTF-8 bytes, which are written to stdout's binary buffer as they are.
     """
     
+    accepts_bytes = True
+    
     def __init__(self):
         """Initialize STDIO transport."""
         self._running = False
-        self._message_handler: Optional[Callable[[str], Awaitable[None]]] = None
+        self._message_handler: Optional[
+            Callable[[Union[str, memoryview]], Awaitable[None]]
+        ] = None
         self._reader_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
+        self._rx_buf = bytearray()
     
-    async def start(self, message_handler: Callable[[str], Awaitable[None]]):
+    async def start(self, message_handler: Callable[[Union[str, memoryview]], Awaitable[None]]):
         """
         Start reading from stdin.
         
@@ -48,18 +65,26 @@ class StdioTransport(Transport):
         # Wait for reader task to complete
         await self._reader_task
     
-    async def send(self, message: str):
+    async def send(self, message: Union[str, bytes]):
         """
         Send message to stdout.
         
         Args:
-            message: JSON-RPC message string
+            message: JSON-RPC message string or UTF-8 bytes
         """
         async with self._lock:
             try:
                 # Write message with newline delimiter
-                sys.stdout.write(message + "\n")
-                sys.stdout.flush()
+                stdout = getattr(sys.stdout, "buffer", None)
+                if isinstance(message, bytes) and stdout is not None:
+                    sys.stdout.flush()  # keep ordering with any buffered text
+                    stdout.write(message + b"\n")
+                    stdout.flush()
+                else:
+                    if isinstance(message, bytes):
+                        message = message.decode()
+                    sys.stdout.write(message + "\n")
+                    sys.stdout.flush()
                 
                 logger.debug(f"Sent message: {message[:100]}...")
                 
@@ -82,31 +107,97 @@ class StdioTransport(Transport):
     
     async def _read_loop(self):
         """Read messages from stdin in a loop."""
+        stdin = getattr(sys.stdin, "buffer", None)
+        if stdin is None:
+            # stdin replaced by a text-only stream
+            await self._read_text_loop()
+            return
+        
         loop = asyncio.get_event_loop()
+        buf = self._rx_buf
         
         try:
             while self._running:
-                # Read line from stdin in executor to avoid blocking
-                line = await loop.run_in_executor(None, sys.stdin.readline)
+                # Read from stdin in executor to avoid blocking
+                chunk = await loop.run_in_executor(None, stdin.read1, READ_CHUNK_SIZE)
                 
-                if not line:
-                    # EOF reached
+                if not chunk:
+                    # EOF reached; a final message may lack its newline
+                    if buf:
+                        buf += b"\n"
+                        await self._dispatch_lines(buf)
                     logger.info("EOF reached on stdin")
                     break
                 
-                line = line.strip()
+                buf += chunk
+                consumed = await self._dispatch_lines(buf)
+                # Keep the partial line; the buffer's capacity is retained
+                del buf[:consumed]
+        
+        except Exception as e:
+            logger.error(f"Error in read loop: {e}", exc_info=True)
+        
+        finally:
+            self._running = False
+            self._rx_buf.clear()
+    
+    async def _dispatch_lines(self, buf: bytearray) -> int:
+        """
+        Hand each complete line in the buffer to the message handler.
+        
+        Args:
+            buf: Receive buffer
+            
+        Returns:
+            Number of bytes consumed (up to and including the last newline)
+        """
+        start = 0
+        with memoryview(buf) as view:
+            while True:
+                newline = buf.find(b"\n", start)
+                if newline < 0:
+                    return start
                 
-                if not line:
-                    continue
+                end = newline
+                while start < end and buf[start] in _LINE_WHITESPACE:
+                    start += 1
+                while end > start and buf[end - 1] in _LINE_WHITESPACE:
+                    end -= 1
                 
-                logger.debug(f"Received message: {line[:100]}...")
+                if end > start:
+                    with view[start:end] as line:
+                        await self._handle_line(line)
+                start = newline + 1
+    
+    async def _handle_line(self, line: Union[str, memoryview]):
+        """Pass one received message to the message handler."""
+        if logger.isEnabledFor(logging.DEBUG):
+            preview = line[:100]
+            if isinstance(preview, memoryview):
+                preview = preview.tobytes().decode(errors="replace")
+            logger.debug(f"Received message: {preview}...")
+        
+        if self._message_handler:
+            try:
+                await self._message_handler(line)
+            except Exception as e:
+                logger.error(f"Error handling message: {e}", exc_info=True)
+    
+    async def _read_text_loop(self):
+        """Read newline-delimited messages from a text stdin."""
+        loop = asyncio.get_event_loop()
+        
+        try:
+            while self._running:
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                
+                if not line:
+                    logger.info("EOF reached on stdin")
+                    break
                 
-                # Handle message
-                if self._message_handler:
-                    try:
-                        await self._message_handler(line)
-                    except Exception as e:
-                        logger.error(f"Error handling message: {e}", exc_info=True)
+                line = line.strip()
+                if line:
+                    await self._handle_line(line)
         
         except Exception as e:
             logger.error(f"Error in read loop: {e}", exc_info=True)
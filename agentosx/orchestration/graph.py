@@ -9,7 +9,7 @@ import asyncio
 import logging
 import yaml
 from typing import Dict, Any, List, Optional, Callable, Union
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import json
@@ -78,9 +78,16 @@ class WorkflowState:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
-        data["created_at"] = self.created_at.isoformat()
-        return data
+        # Literal dict instead of asdict(), which deep-copies every value
+        return {
+            "workflow_id": self.workflow_id,
+            "current_node": self.current_node,
+            "variables": dict(self.variables),
+            "history": list(self.history),
+            "checkpoints": dict(self.checkpoints),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+        }
 
 
 @dataclass
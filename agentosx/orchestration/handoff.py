@@ -9,7 +9,7 @@ import asyncio
 import logging
 import json
 from typing import Dict, Any, Optional, List, Callable
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -56,9 +56,18 @@ class HandoffContext:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        data = asdict(self)
-        data["created_at"] = self.created_at.isoformat()
-        return data
+        # Literal dict instead of asdict(), which deep-copies every value
+        # (including arbitrary shared_memory objects)
+        return {
+            "handoff_id": self.handoff_id,
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "input": self.input,
+            "conversation_history": list(self.conversation_history),
+            "shared_memory": dict(self.shared_memory),
+            "metadata": dict(self.metadata),
+            "created_at": self.created_at.isoformat(),
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "HandoffContext":
@@ -0,0 +1,83 @@
+"""
+JSON Serialization Helpers.
+
+Thin wrappers that use ``orjson`` when it is installed and fall back to the
+standard library ``json`` module otherwise. Both paths produce compact output
+unless indentation is requested.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+if ORJSON_AVAILABLE:
+    # Option sets resolved once rather than OR-ed together on every call
+    _OPT_COMPACT = orjson.OPT_NON_STR_KEYS
+    _OPT_SORTED = _OPT_COMPACT | orjson.OPT_SORT_KEYS
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """
+    Serialize object to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Emit object keys in sorted order (canonical output)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = _OPT_SORTED if sort_keys else _OPT_COMPACT
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, indent=2).encode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":")).encode()
+
+
+def dumps_str(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize object to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Emit object keys in sorted order (canonical output)
+
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        # Hot path for MCP messages: skip the dumps() indirection
+        return orjson.dumps(obj, option=_OPT_SORTED if sort_keys else _OPT_COMPACT).decode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Deserialize JSON from bytes or str.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Deserialized object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
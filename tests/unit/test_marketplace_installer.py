@@ -0,0 +1,232 @@
+"""
+Unit tests for the marketplace agent installer.
+"""
+
+import asyncio
+import hashlib
+import io
+import tarfile
+import threading
+
+import httpx
+import pytest
+from agentosx.marketplace.installer import AgentInstaller, InstallError
+
+REGISTRY_URL = "https://registry.test"
+
+
+def build_package(files):
+    """Build an in-memory tar.gz agent package."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def make_installer(tmp_path, package, checksum):
+    """Create an installer whose HTTP traffic is served by a mock transport."""
+    def handler(request):
+        path = request.url.path
+        if path == "/api/agents/demo":
+            return httpx.Response(200, json={"name": "demo", "version": "1.0.0", "checksum": checksum})
+        if path == "/api/agents/demo/download":
+            return httpx.Response(200, json={"download_url": f"{REGISTRY_URL}/packages/demo.tar.gz"})
+        if path == "/packages/demo.tar.gz":
+            return httpx.Response(200, content=package)
+        return httpx.Response(404)
+
+    installer = AgentInstaller(tmp_path / "agents", registry_url=REGISTRY_URL)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    installer.http_client = client
+    installer.registry.http_client = client
+    return installer
+
+
+@pytest.mark.unit
+async def test_install_agent_streams_and_verifies(tmp_path):
+    """Test that a package is downloaded, verified and extracted."""
+    package = build_package({
+        "demo/agent.py": b"print('hi')\n",
+        "demo/agent.yaml": b"name: demo\n",
+    })
+    installer = make_installer(tmp_path, package, hashlib.sha256(package).hexdigest())
+
+    result = await installer.install_agent("demo", install_dependencies=False)
+
+    assert result["status"] == "success"
+    assert (tmp_path / "agents" / "demo" / "agent.py").read_bytes() == b"print('hi')\n"
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_install_agent_rejects_checksum_mismatch(tmp_path):
+    """Test that a corrupted package is not installed."""
+    package = build_package({"demo/agent.py": b"print('hi')\n"})
+    installer = make_installer(tmp_path, package, "0" * 64)
+
+    with pytest.raises(InstallError):
+        await installer.install_agent("demo", install_dependencies=False)
+
+    assert not (tmp_path / "agents" / "demo").exists()
+    assert not list((tmp_path / "agents").glob(".staging_*"))
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_install_agent_rejects_corrupt_archive(tmp_path):
+    """Test that a stream that is not a tar.gz fails cleanly."""
+    package = b"not a tarball" * 100000
+    installer = make_installer(tmp_path, package, hashlib.sha256(package).hexdigest())
+
+    with pytest.raises(InstallError):
+        await installer.install_agent("demo", install_dependencies=False)
+
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_extract_package_rejects_path_traversal(tmp_path):
+    """Test that members escaping the extraction directory are rejected."""
+    package_path = tmp_path / "evil.tar.gz"
+    package_path.write_bytes(build_package({"../evil.py": b"x"}))
+    installer = AgentInstaller(tmp_path / "agents")
+
+    with pytest.raises(InstallError):
+        await installer.extract_package(package_path, tmp_path / "out")
+
+    assert not (tmp_path / "evil.py").exists()
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_install_many_installs_dependencies_first(tmp_path):
+    """Test that agent dependencies are installed before their dependents."""
+    packages = {
+        name: build_package({f"{name}/agent.py": name.encode()})
+        for name in ("app", "lib", "base")
+    }
+    dependencies = {"app": ["lib", "base"], "lib": [{"agent_id": "base"}], "base": []}
+
+    def handler(request):
+        parts = request.url.path.strip("/").split("/")
+        if parts[:2] == ["api", "agents"] and len(parts) == 3:
+            name = parts[2]
+            return httpx.Response(200, json={
+                "name": name,
+                "version": "1.0.0",
+                "checksum": hashlib.sha256(packages[name]).hexdigest(),
+                "download_url": f"{REGISTRY_URL}/packages/{name}.tar.gz",
+                "dependencies": dependencies[name],
+            })
+        if parts[0] == "packages":
+            return httpx.Response(200, content=packages[parts[1].split(".")[0]])
+        return httpx.Response(404)
+
+    installer = AgentInstaller(tmp_path / "agents", registry_url=REGISTRY_URL)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    installer.http_client = client
+    installer.registry.http_client = client
+
+    results = await installer.install_many(["app"], install_dependencies=False)
+
+    assert [r["agent_id"] for r in results] == ["base", "lib", "app"]
+    assert all(r["status"] == "success" for r in results)
+    reloaded = AgentInstaller(tmp_path / "agents", registry_url=REGISTRY_URL)
+    assert set(reloaded._installed) == {"app", "lib", "base"}
+    await reloaded.close()
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_install_agent_verifies_blake3_checksum(tmp_path):
+    """Test that registries can publish BLAKE3 checksums."""
+    blake3 = pytest.importorskip("blake3")
+    package = build_package({"demo/agent.py": b"print('hi')\n"})
+    installer = make_installer(
+        tmp_path, package, {"algo": "blake3", "hex": blake3.blake3(package).hexdigest()}
+    )
+
+    result = await installer.install_agent("demo", install_dependencies=False)
+
+    assert result["status"] == "success"
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_update_agent_skips_unchanged_version(tmp_path):
+    """Test that updating to the installed version does not reinstall."""
+    package = build_package({"demo/agent.py": b"print('hi')\n"})
+    installer = make_installer(tmp_path, package, hashlib.sha256(package).hexdigest())
+    await installer.install_agent("demo", install_dependencies=False)
+    (tmp_path / "agents" / "demo" / "marker").write_text("kept")
+
+    result = await installer.update_agent("demo")
+
+    assert result["status"] == "up-to-date"
+    assert (tmp_path / "agents" / "demo" / "marker").exists()
+    await installer.close()
+
+
+@pytest.mark.unit
+async def test_cancelled_download_releases_extractor(tmp_path):
+    """Test that cancelling a stalled download stops the extraction thread."""
+    async def stalled_body():
+        yield build_package({"agent.yaml": b"name: demo\n"})[:10]
+        await asyncio.Event().wait()
+
+    def handler(request):
+        return httpx.Response(200, content=stalled_body())
+
+    installer = AgentInstaller(tmp_path / "agents", registry_url=REGISTRY_URL)
+    installer.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    extractor_done = threading.Event()
+    extract_stream = installer._extract_stream
+
+    def tracked_extract(pipe, extract_dir):
+        try:
+            extract_stream(pipe, extract_dir)
+        finally:
+            extractor_done.set()
+
+    installer._extract_stream = tracked_extract
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            installer.download_and_extract(
+                "demo", "1.0.0", tmp_path / "extract",
+                download_url=f"{REGISTRY_URL}/packages/demo.tar.gz",
+            ),
+            timeout=0.2,
+        )
+
+    assert await asyncio.get_running_loop().run_in_executor(None, extractor_done.wait, 2.0)
+
+
+@pytest.mark.unit
+async def test_install_survives_tail_after_archive_end(tmp_path, monkeypatch):
+    """Test that bytes arriving after the tar end are still hashed, not rejected."""
+    package = build_package({"agent.yaml": b"name: demo\n"})
+    tail = 8  # gzip trailer, after the last tar block
+
+    async def delayed_tail():
+        yield package[:-tail]
+        await asyncio.sleep(0.3)
+        yield package[-tail:]
+
+    def handler(request):
+        return httpx.Response(200, content=delayed_tail())
+
+    monkeypatch.setattr("agentosx.marketplace.installer.STREAM_CHUNK_SIZE", None)
+    installer = AgentInstaller(tmp_path / "agents", registry_url=REGISTRY_URL)
+    installer.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    agent_dir = await installer.download_and_extract(
+        "demo", "1.0.0", tmp_path / "extract",
+        expected_checksum=hashlib.sha256(package).hexdigest(),
+        download_url=f"{REGISTRY_URL}/packages/demo.tar.gz",
+    )
+
+    assert (agent_dir / "agent.yaml").read_bytes() == b"name: demo\n"
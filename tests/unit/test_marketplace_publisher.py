@@ -0,0 +1,115 @@
+"""
+Unit tests for the marketplace agent publisher.
+"""
+
+import asyncio
+import hashlib
+import io
+import tarfile
+import threading
+
+import httpx
+import pytest
+from agentosx.marketplace.publisher import AgentPublisher
+from agentosx.marketplace.streams import ChunkSink
+
+REGISTRY_URL = "https://registry.test"
+
+
+@pytest.mark.unit
+async def test_publish_agent_streams_package_with_checksum(tmp_path):
+    """Test that the package is streamed with a trailing SHA256 checksum."""
+    agent_dir = tmp_path / "demo"
+    agent_dir.mkdir()
+    (agent_dir / "agent.py").write_text("print('hi')\n")
+    (agent_dir / "agent.yaml").write_text(
+        "name: demo\n"
+        "version: 1.0.0\n"
+        "description: A demo agent for tests\n"
+        "author: tests\n"
+        "license: MIT\n"
+    )
+    uploads = []
+
+    async def handler(request):
+        uploads.append((request.headers["content-type"], await request.aread()))
+        return httpx.Response(200, json={"status": "published"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    publisher = AgentPublisher(registry_url=REGISTRY_URL, api_key="key", client=client)
+
+    result = await publisher.publish_agent(agent_dir)
+
+    assert result == {"status": "published"}
+    content_type, body = uploads[0]
+    boundary = content_type.split("boundary=")[1].encode()
+    parts = {}
+    for part in body.split(b"--" + boundary)[1:-1]:
+        headers, _, value = part[2:-2].partition(b"\r\n\r\n")
+        parts[headers.split(b'name="')[1].split(b'"')[0]] = value
+
+    package = parts[b"package"]
+    assert parts[b"checksum"].decode() == hashlib.sha256(package).hexdigest()
+    with tarfile.open(fileobj=io.BytesIO(package), mode="r:gz") as tar:
+        assert tar.extractfile("demo/agent.py").read() == b"print('hi')\n"
+    await client.aclose()
+
+
+@pytest.mark.unit
+async def test_security_checks_ignore_comments_and_strings(tmp_path):
+    """Test that only real code triggers security findings."""
+    (tmp_path / "agent.py").write_text(
+        '"""Never call eval() or use subprocess here."""\n'
+        "# password = 'hunter2'\n"
+        "import subprocess\n"
+        "client = Client(api_key='abcdefghijklmnopqrstuvwxyz')\n"
+        "PASSWORD = 'hunter2'\n"
+    )
+    publisher = AgentPublisher(registry_url=REGISTRY_URL)
+
+    result = await publisher.run_security_checks(tmp_path)
+
+    assert result["is_secure"] is False
+    assert len(result["issues"]) == 2
+    assert "line 4" in result["issues"][0]
+    assert "line 5" in result["issues"][1]
+    assert result["warnings"] == [
+        "Subprocess usage detected. Ensure proper input validation."
+    ]
+    await publisher.close()
+
+
+@pytest.mark.unit
+def test_sink_abort_releases_cancelled_reader():
+    """Test that aborting a sink frees the reader thread of a cancelled consumer."""
+    async def scenario():
+        sink = ChunkSink(chunk_size=1)
+        stop = threading.Event()
+
+        def slow_writer():
+            sink.write(b"x")
+            stop.wait(5)
+            try:
+                sink.write(b"y")
+            except BrokenPipeError:
+                pass
+            sink.close()
+
+        loop = asyncio.get_running_loop()
+        producer = loop.run_in_executor(None, slow_writer)
+
+        async def consume():
+            async for _ in sink:
+                pass
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)  # consumer now waits for the second chunk
+        consumer.cancel()
+        sink.abort()
+        stop.set()
+        await producer
+
+    runner = threading.Thread(target=asyncio.run, args=(scenario(),), daemon=True)
+    runner.start()
+    runner.join(5)
+    assert not runner.is_alive()
@@ -0,0 +1,165 @@
+"""
+Unit tests for the marketplace registry client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from agentosx.marketplace.registry import RegistryClient, get_default_registry
+
+REGISTRY_URL = "https://registry.test"
+
+
+def make_registry(handler):
+    """Create a registry client whose traffic is served by a mock transport."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return RegistryClient(REGISTRY_URL, client=client)
+
+
+@pytest.mark.unit
+async def test_concurrent_misses_share_one_request():
+    """Test that concurrent lookups of the same agent hit the registry once."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"name": "demo", "version": "1.0.0"})
+
+    registry = make_registry(handler)
+
+    results = await asyncio.gather(*(registry.get_agent("demo") for _ in range(5)))
+    await registry.get_agent("demo")
+
+    assert all(result["version"] == "1.0.0" for result in results)
+    assert calls == ["/api/agents/demo"]
+
+
+@pytest.mark.unit
+async def test_cache_honors_server_max_age_and_invalidate():
+    """Test that Cache-Control max-age=0 disables caching and invalidate drops entries."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/categories":
+            return httpx.Response(
+                200, json={"categories": []}, headers={"Cache-Control": "max-age=0"}
+            )
+        return httpx.Response(200, json={"name": "demo"})
+
+    registry = make_registry(handler)
+
+    await registry.get_categories()
+    await registry.get_categories()
+    await registry.get_agent("demo")
+    registry.invalidate("demo")
+    await registry.get_agent("demo")
+
+    assert calls == ["/api/categories"] * 2 + ["/api/agents/demo"] * 2
+
+
+@pytest.mark.unit
+def test_get_default_registry_is_shared():
+    """Test that the default registry client is reused per registry URL."""
+    assert get_default_registry(REGISTRY_URL) is get_default_registry(REGISTRY_URL + "/")
+    assert get_default_registry(REGISTRY_URL) is not get_default_registry()
+
+
+@pytest.mark.unit
+async def test_get_agents_preserves_order():
+    """Test that bulk lookups return results in input order."""
+    def handler(request):
+        agent_id = request.url.path.rsplit("/", 1)[1]
+        if agent_id == "missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"name": agent_id})
+
+    registry = make_registry(handler)
+
+    results = await registry.get_agents(["b", "missing", "a", "b"], max_concurrency=2)
+
+    assert results == [{"name": "b"}, None, {"name": "a"}, {"name": "b"}]
+
+
+@pytest.mark.unit
+async def test_retries_rate_limited_requests():
+    """Test that 429/5xx responses are retried, honoring Retry-After."""
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"name": "demo"}),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    registry = make_registry(handler)
+
+    assert await registry.get_agent("demo") == {"name": "demo"}
+    assert responses == []
+
+
+@pytest.mark.unit
+async def test_disk_cache_revalidates_across_clients(tmp_path):
+    """Test that persisted responses are revalidated with ETags by later clients."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=0"})
+        return httpx.Response(
+            200,
+            json={"name": "demo", "version": "1.0.0"},
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=0"},
+        )
+
+    for _ in range(2):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry = RegistryClient(REGISTRY_URL, client=client, cache_dir=tmp_path)
+        assert await registry.get_agent("demo") == {"name": "demo", "version": "1.0.0"}
+        await registry.close()
+
+    registry.invalidate("demo")
+    registry = RegistryClient(REGISTRY_URL, client=client, cache_dir=tmp_path)
+    await registry.get_agent("demo")
+
+    assert seen == [None, '"v1"', None]
+
+
+@pytest.mark.unit
+async def test_unusable_disk_cache_falls_back_to_network(tmp_path):
+    """Test that a cache directory that cannot be created disables the disk cache."""
+    (tmp_path / "file").write_text("")
+
+    def handler(request):
+        return httpx.Response(200, json={"name": "demo"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    registry = RegistryClient(REGISTRY_URL, client=client, cache_dir=tmp_path / "file" / "cache")
+
+    assert await registry.get_agent("demo") == {"name": "demo"}
+    registry.invalidate("demo")
+    await registry.close()
+
+
+@pytest.mark.unit
+async def test_search_iter_walks_all_pages():
+    """Test that search_iter yields every result across prefetched pages."""
+    offsets = []
+
+    def handler(request):
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        offsets.append(offset)
+        agents = [{"name": f"agent{i}"} for i in range(offset, min(offset + limit, 25))]
+        return httpx.Response(200, json={"agents": agents})
+
+    registry = make_registry(handler)
+
+    names = [agent["name"] async for agent in registry.search_iter(query="x", page_size=10)]
+
+    assert names == [f"agent{i}" for i in range(25)]
+    assert sorted(offsets)[:3] == [0, 10, 20]
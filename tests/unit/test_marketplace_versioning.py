@@ -0,0 +1,59 @@
+"""
+Unit tests for marketplace version management.
+"""
+
+import pytest
+from agentosx.marketplace.versioning import Version, VersionManager
+
+
+@pytest.mark.unit
+def test_version_get_returns_shared_instance():
+    """Test that Version.get caches instances per string."""
+    assert Version.get("1.2.3") is Version.get("1.2.3")
+    assert Version("1.2.3") == Version.get("1.2.3")
+    with pytest.raises(AttributeError):
+        Version("1.2.3").extra = True
+
+
+@pytest.mark.unit
+def test_version_ordering():
+    """Test semver precedence, including pre-releases."""
+    assert Version("1.2.3") < Version("1.2.4") < Version("1.10.0")
+    assert Version("2.0.0-beta.1") < Version("2.0.0")
+    assert Version("2.0.0-rc.2") < Version("2.0.0-rc.10") < Version("2.0.0-rc.10.1")
+    assert Version("2.0.0-rc.10.1") < Version("2.0.0-rc.beta")
+    assert Version("1.2.3") == "v1.2.3"
+    assert Version("1.2.3") > "1.2.3-rc.1"
+    assert Version("1.2.3") != None  # noqa: E711
+    assert Version("1.2.3") != "latest"
+    with pytest.raises(TypeError):
+        Version("1.2.3") < 1
+
+
+@pytest.mark.unit
+def test_version_parse():
+    """Test parsing of pre-release and build metadata."""
+    version = Version("v2.0.0-rc.1-hotfix+build.5")
+    assert (version.major, version.minor, version.patch) == (2, 0, 0)
+    assert version.pre_release == "rc.1-hotfix"
+    assert version.build == "build.5"
+    for invalid in ("1.2", "1.2.x", "1.2.3-", "1.2.3 "):
+        with pytest.raises(ValueError):
+            Version(invalid)
+
+
+@pytest.mark.unit
+def test_version_manager_resolution():
+    """Test latest, compatible and upgrade path resolution."""
+    versions = ["1.0.0", "1.10.0", "1.2.0", "2.0.0-rc.1", "2.0.0"]
+
+    assert VersionManager.find_latest(versions) == "2.0.0"
+    assert VersionManager.find_latest_compatible("1.0.0", versions) == "1.10.0"
+    assert VersionManager.find_latest_compatible("0.2.0", ["0.2.1", "v0.2.5", "0.3.0"]) == "0.2.5"
+    assert VersionManager.find_latest_compatible("3.0.0", versions) is None
+    assert VersionManager.sort_versions(versions) == [
+        "1.0.0", "1.2.0", "1.10.0", "2.0.0-rc.1", "2.0.0"
+    ]
+    assert VersionManager.get_upgrade_path("1.0.0", "2.0.0", versions) == [
+        "1.2.0", "1.10.0", "2.0.0-rc.1", "2.0.0"
+    ]
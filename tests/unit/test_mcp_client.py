@@ -0,0 +1,128 @@
+"""
+Unit tests for the MCP client.
+"""
+
+import asyncio
+
+import pytest
+from agentosx.mcp.client import MCPClient
+from agentosx.mcp.protocol import MCPRequest
+from agentosx.mcp.server import MCPServer
+from agentosx.mcp.transport.base import Transport
+
+
+class LoopbackTransport(Transport):
+    """In-memory transport that delivers sent messages to a peer."""
+
+    def __init__(self):
+        self.peer = None
+        self.sent = []
+        self._handler = None
+
+    async def start(self, message_handler):
+        self._handler = message_handler
+
+    async def send(self, message):
+        self.sent.append(message)
+        asyncio.get_running_loop().create_task(self.peer._handler(message))
+
+    async def stop(self):
+        pass
+
+
+@pytest.mark.unit
+async def test_discover_all_sends_individual_requests():
+    """Test that discovery does not rely on batches unless batch mode is on."""
+    server = MCPServer("demo")
+    server.register_tool("echo", "Echo input", lambda text: text)
+
+    client_transport, server_transport = LoopbackTransport(), LoopbackTransport()
+    client_transport.peer, server_transport.peer = server_transport, client_transport
+    await server_transport.start(server._handle_message)
+    server.transport = server_transport
+
+    client = MCPClient()
+    await client.connect(client_transport)
+
+    assert [tool.name for tool in client.get_tools()] == ["echo"]
+    assert len(client_transport.sent) == 4  # initialize + three list requests
+    assert not any(message.startswith("[") for message in client_transport.sent)
+    await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_discover_all_sends_one_batch():
+    """Test that discovery is a single batch answered by the server in batch mode."""
+    server = MCPServer("demo")
+    server.register_tool("echo", "Echo input", lambda text: text)
+    server.register_prompt("greet", "Greeting", "Hi {{name}}")
+
+    client_transport, server_transport = LoopbackTransport(), LoopbackTransport()
+    client_transport.peer, server_transport.peer = server_transport, client_transport
+    await server_transport.start(server._handle_message)
+    server.transport = server_transport
+
+    client = MCPClient(batch=True)
+    await client.connect(client_transport)
+
+    assert [tool.name for tool in client.get_tools()] == ["echo"]
+    assert [prompt.name for prompt in client.get_prompts()] == ["greet"]
+    assert len(client_transport.sent) == 2  # initialize + one discovery batch
+    assert client_transport.sent[1].startswith("[")
+    await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_request_times_out_without_response(monkeypatch):
+    """Test that the timeout sweeper fails requests nobody answers."""
+    monkeypatch.setattr("agentosx.mcp.client.REQUEST_TIMEOUT", 0.01)
+    silent_peer = LoopbackTransport()
+    await silent_peer.start(lambda message: asyncio.sleep(0))
+    transport = LoopbackTransport()
+    transport.peer = silent_peer
+
+    client = MCPClient()
+    client.transport = transport
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client._send_request(MCPRequest(method="ping", id=client._next_id()))
+
+    assert client._pending == [None]
+    await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_batch_mode_coalesces_concurrent_calls():
+    """Test that concurrent tool calls share one batch write in batch mode."""
+    server = MCPServer("demo")
+    server.register_tool("echo", "Echo input", lambda text: text)
+
+    client_transport, server_transport = LoopbackTransport(), LoopbackTransport()
+    client_transport.peer, server_transport.peer = server_transport, client_transport
+    await server_transport.start(server._handle_message)
+    server.transport = server_transport
+
+    client = MCPClient(batch=True)
+    await client.connect(client_transport)
+    client_transport.sent.clear()
+
+    results = await asyncio.gather(*(
+        client.call_tool("echo", {"text": str(i)}) for i in range(5)
+    ))
+
+    assert len(client_transport.sent) == 1
+    assert results == ["0", "1", "2", "3", "4"]
+    await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_request_without_transport_frees_its_slot():
+    """Test that requests failing for lack of a transport do not leak ID slots."""
+    client = MCPClient()
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await client._send_raw(client._TOOLS_LIST)
+
+    assert client._pending_ids == [0]
+    assert client._free_slots == [0]
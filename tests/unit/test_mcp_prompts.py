@@ -0,0 +1,23 @@
+"""
+Unit tests for MCP prompt templates.
+"""
+
+import pytest
+from agentosx.mcp.prompts import PromptManager, PromptResolver
+
+
+@pytest.mark.unit
+async def test_get_prompt_substitutes_in_one_pass():
+    """Test that placeholders are filled once and missing ones are kept."""
+    manager = PromptManager()
+    manager.register_prompt("greet", template="Hi {{name}}, {{name}}! {{missing}}")
+
+    rendered = await manager.get_prompt("greet", {"name": "{{missing}}", "extra": 1})
+
+    assert rendered == "Hi {{missing}}, {{missing}}! {{missing}}"
+
+
+@pytest.mark.unit
+def test_resolver_resolves_variables():
+    """Test that the resolver shares the manager's substitution."""
+    assert PromptResolver().resolve_variables("{{a}}-{{b}}", {"a": 1}) == "1-{{b}}"
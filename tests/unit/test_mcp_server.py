@@ -0,0 +1,92 @@
+"""
+Unit tests for the MCP server.
+"""
+
+import asyncio
+
+import pytest
+from agentosx.mcp.protocol import MCPRequest
+from agentosx.mcp.server import MCPServer
+from agentosx.mcp.transport.base import Transport
+from agentosx.serialization import loads
+
+
+class RecordingTransport(Transport):
+    """Transport that records sent messages."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def start(self, message_handler):
+        pass
+
+    async def send(self, message):
+        self.sent.append(loads(message))
+
+    async def stop(self):
+        pass
+
+
+async def count(limit: int):
+    """Yield numbers up to limit."""
+    for number in range(limit):
+        yield number
+
+
+@pytest.mark.unit
+async def test_streaming_tool_sends_progress_per_chunk():
+    """Test that async generator tools stream chunks as progress notifications."""
+    server = MCPServer("demo")
+    server.register_tool("count", "Count up", count)
+    server.transport = RecordingTransport()
+
+    result = await server._handle_tools_call(MCPRequest(
+        method="tools/call",
+        params={"name": "count", "arguments": {"limit": 3}, "_meta": {"progressToken": "t"}},
+        id=1,
+    ))
+
+    assert [item["text"] for item in result["content"]] == ["0", "1", "2"]
+    assert [message["params"]["progress"] for message in server.transport.sent] == [1, 2, 3]
+    assert all(message["method"] == "notifications/progress" for message in server.transport.sent)
+
+
+@pytest.mark.unit
+async def test_streaming_tool_without_progress_token_buffers():
+    """Test that async generator tools return all chunks when not streamed."""
+    server = MCPServer("demo")
+    server.register_tool("count", "Count up", count)
+    server.transport = RecordingTransport()
+
+    result = await server._handle_tools_call(MCPRequest(
+        method="tools/call",
+        params={"name": "count", "arguments": {"limit": 2}},
+        id=1,
+    ))
+
+    assert [item["text"] for item in result["content"]] == ["0", "1"]
+    assert server.transport.sent == []
+
+
+@pytest.mark.unit
+async def test_batch_runs_in_task_without_blocking_reader():
+    """Test that a slow request in a batch does not hold up later messages."""
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "slow"
+
+    server = MCPServer("demo")
+    server.register_tool("slow", "Wait for release", slow)
+    server.transport = RecordingTransport()
+
+    batch = '[{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":"slow","arguments":{}}}]'
+    await asyncio.wait_for(server._handle_message(batch), timeout=1)
+    await server._handle_message('{"jsonrpc":"2.0","id":2,"method":"tools/list"}')
+    await asyncio.sleep(0)
+    assert [message["id"] for message in server.transport.sent] == [2]
+
+    release.set()
+    await asyncio.gather(*server._tasks)
+    assert server.transport.sent[1][0]["result"]["content"][0]["text"] == "slow"
@@ -0,0 +1,52 @@
+"""
+Unit tests for JSON serialization helpers.
+"""
+
+import json
+
+import pytest
+from agentosx import serialization
+from agentosx.serialization import dumps, dumps_str, loads
+
+
+@pytest.mark.unit
+def test_dumps_returns_compact_bytes():
+    """Test that dumps produces compact UTF-8 bytes."""
+    data = dumps({"a": 1, "b": [1, 2]})
+    assert isinstance(data, bytes)
+    assert json.loads(data) == {"a": 1, "b": [1, 2]}
+    assert b" " not in data
+
+
+@pytest.mark.unit
+def test_dumps_sort_keys_is_canonical():
+    """Test that sorted output does not depend on insertion order."""
+    assert dumps({"b": 1, "a": 2}, sort_keys=True) == dumps({"a": 2, "b": 1}, sort_keys=True)
+
+
+@pytest.mark.unit
+def test_roundtrip_without_orjson(monkeypatch):
+    """Test the stdlib fallback path."""
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+    payload = {"name": "agent", "values": [1, 2.5, None, True]}
+    assert dumps_str(payload, sort_keys=True) == '{"name":"agent","values":[1,2.5,null,true]}'
+    assert loads(dumps(payload)) == payload
+    assert loads(memoryview(dumps(payload))) == payload
+
+
+@pytest.mark.unit
+def test_loads_invalid_raises_value_error():
+    """Test that invalid documents raise ValueError on both paths."""
+    with pytest.raises(ValueError):
+        loads(b"{not json")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_indent(monkeypatch, use_orjson):
+    """Test that indented output matches json.dumps(indent=2) on both paths."""
+    if use_orjson and not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", use_orjson)
+    payload = {"agent": {"version": "1.0.0", "tags": ["a"]}}
+    assert dumps(payload, indent=True).decode() == json.dumps(payload, indent=2)